@@ -0,0 +1,159 @@
+# -*- coding=utf-8 -*-
+
+"""
+Run the benchmark suite.
+
+    python -m benchmarks run -o results.json
+    python -m benchmarks run -k Itr.map -k Itr.where --sizes 1000
+    python -m benchmarks run --baseline results.json
+    python -m benchmarks compare baseline.json results.json
+    python -m benchmarks missing
+    python -m benchmarks memory -o memory.json
+    python -m benchmarks scaling -k Itr.nth
+    python -m benchmarks importtime --budget 40
+
+`run` and `compare` exit with status 1 if a case got significantly slower,
+`memory` if the peak memory of a streaming case grows with the input size,
+`scaling` if a case scales worse than its documented complexity and
+`importtime` if ``import iterage`` exceeds its budget.
+"""
+
+import argparse
+import sys
+
+from benchmarks import harness, importtime, memory, scaling, suite
+
+
+def _list(value):
+    return [v for v in value.split(",") if v]
+
+
+def _report(rows, show_all):
+    table = harness.format_comparison(rows, show_all)
+    if table:
+        print(table)
+    slower = [r for r in rows if r["status"] == "slower"]
+    print(f"{len(rows)} compared, {len(slower)} slower, "
+          f"{sum(r['status'] == 'faster' for r in rows)} faster")
+    return 1 if slower else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="time the benchmark cases")
+    run.add_argument("-k", dest="patterns", action="append", default=[],
+                     help="only cases containing this substring")
+    run.add_argument("--sizes", type=lambda v: [int(s) for s in _list(v)],
+                     default=list(harness.SIZES))
+    run.add_argument("--kinds", type=_list, default=list(harness.KINDS))
+    run.add_argument("--repeat", type=int, default=7)
+    run.add_argument("--min-time", type=float, default=0.02)
+    run.add_argument("-o", "--output", help="write results as JSON")
+    run.add_argument("--baseline", help="compare with results in JSON")
+    run.add_argument("-q", "--quiet", action="store_true")
+
+    compare = commands.add_parser("compare", help="compare two result files")
+    compare.add_argument("baseline")
+    compare.add_argument("current")
+
+    for command in (run, compare):
+        command.add_argument("--alpha", type=float, default=0.01,
+                             help="significance level")
+        command.add_argument("--threshold", type=float, default=0.1,
+                             help="ignore changes of the median below this")
+        command.add_argument("--all", action="store_true",
+                             help="show unchanged cases too")
+
+    commands.add_parser("missing", help="list public functions without case")
+
+    mem = commands.add_parser("memory", help="measure peak memory")
+    mem.add_argument("-k", dest="patterns", action="append", default=[],
+                     help="only cases containing this substring")
+    mem.add_argument("--sizes", type=lambda v: [int(s) for s in _list(v)],
+                     default=list(memory.SIZES))
+    mem.add_argument("--growth", type=float, default=2.0,
+                     help="allowed growth factor of streaming peaks")
+    mem.add_argument("--slack", type=int, default=16384,
+                     help="allowed growth of streaming peaks in bytes")
+    mem.add_argument("-o", "--output", help="write results as JSON")
+    mem.add_argument("-q", "--quiet", action="store_true")
+
+    scale = commands.add_parser("scaling", help="fit complexity classes")
+    scale.add_argument("-k", dest="patterns", action="append", default=[],
+                       help="only cases containing this substring")
+    scale.add_argument("--sizes", type=lambda v: [int(s) for s in _list(v)],
+                       default=list(scaling.SIZES))
+    scale.add_argument("--repeat", type=int, default=5)
+    scale.add_argument("--min-time", type=float, default=0.01)
+    scale.add_argument("-o", "--output", help="write results as JSON")
+    scale.add_argument("-q", "--quiet", action="store_true")
+
+    imp = commands.add_parser("importtime", help="check the import time")
+    imp.add_argument("--budget", type=float, default=importtime.BUDGET,
+                     help="maximum import time in ms")
+    imp.add_argument("--runs", type=int, default=10)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "missing":
+        names = suite.missing()
+        print("\n".join(names))
+        return 1 if names else 0
+
+    if args.command == "memory":
+        results = memory.run(
+            memory.select(args.patterns), args.sizes,
+            None if args.quiet else harness.progress)
+        if args.output:
+            harness.save(results, args.output)
+        else:
+            print(memory.format_results(results))
+        failed = memory.check(results, args.growth, args.slack)
+        if failed:
+            print(memory.format_failures(failed))
+        return 1 if failed else 0
+
+    if args.command == "importtime":
+        result = importtime.run("iterage", args.runs, args.budget)
+        print(importtime.format_result(result))
+        return 1 if result["failed"] else 0
+
+    if args.command == "scaling":
+        results = scaling.run(
+            scaling.select(args.patterns), args.sizes, args.repeat,
+            args.min_time, None if args.quiet else harness.progress)
+        if args.output:
+            harness.save(results, args.output)
+        print(scaling.format_results(results))
+        return 1 if any(r["worse"] for r in results["results"]) else 0
+
+    if args.command == "compare":
+        rows = harness.compare(
+            harness.load(args.baseline), harness.load(args.current),
+            args.alpha, args.threshold)
+        return _report(rows, args.all)
+
+    missing = suite.missing()
+    if missing:
+        print(f"no benchmark case for: {', '.join(missing)}", file=sys.stderr)
+
+    cases, case_kinds = suite.select(args.patterns)
+    results = harness.run(
+        cases, args.sizes, args.kinds, args.repeat, args.min_time, case_kinds,
+        None if args.quiet else harness.progress)
+    if args.output:
+        harness.save(results, args.output)
+    else:
+        print(harness.format_results(results))
+
+    if args.baseline:
+        rows = harness.compare(
+            harness.load(args.baseline), results, args.alpha, args.threshold)
+        return _report(rows, args.all)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
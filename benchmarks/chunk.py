@@ -106,8 +106,8 @@ class ChunkBenchmark(bench.BenchmarkBase):
 
       self.registerTests([
         ('baseline', (
-            'import iterage.benchmarks.chunk',
-            'list(iterage.benchmarks.chunk.baseline({iterable}, {n}))'
+            'import benchmarks.chunk',
+            'list(benchmarks.chunk.baseline({iterable}, {n}))'
           )),
 
           ('iterage', (
@@ -116,28 +116,28 @@ class ChunkBenchmark(bench.BenchmarkBase):
           )),
 
           ('iterage v1', (
-            'import iterage.benchmarks.chunk',
-            'list(iterage.benchmarks.chunk.chunk_v1({iterable}, {n}))'
+            'import benchmarks.chunk',
+            'list(benchmarks.chunk.chunk_v1({iterable}, {n}))'
           )),
 
           ('iterage v2', (
-            'import iterage.benchmarks.chunk',
-            'list(iterage.benchmarks.chunk.chunk_v2({iterable}, {n}))'
+            'import benchmarks.chunk',
+            'list(benchmarks.chunk.chunk_v2({iterable}, {n}))'
           )),
 
           ('iterage v3', (
-            'import iterage.benchmarks.chunk',
-            'list(iterage.benchmarks.chunk.chunk_v3({iterable}, {n}))'
+            'import benchmarks.chunk',
+            'list(benchmarks.chunk.chunk_v3({iterable}, {n}))'
           )),
 
           ('iterage v4', (
-            'import iterage.benchmarks.chunk',
-            'list(iterage.benchmarks.chunk.chunk_v4({iterable}, {n}))'
+            'import benchmarks.chunk',
+            'list(benchmarks.chunk.chunk_v4({iterable}, {n}))'
           )),
                           
           ('iterage v5', (
-            'import iterage.benchmarks.chunk',
-            'list(iterage.benchmarks.chunk.chunk_v5({iterable}, {n}))'
+            'import benchmarks.chunk',
+            'list(benchmarks.chunk.chunk_v5({iterable}, {n}))'
           )),                          
 #
 #           ('chunk_filled', (
@@ -152,14 +152,14 @@ class ChunkBenchmark(bench.BenchmarkBase):
       ])
 
     def run(self):
-      self._run(args={'iterable': '(str(x) for x in xrange(1, 8))', 'n': 4}, number=10000);
-      self._run(args={'iterable': '(str(x) for x in xrange(1, 64))', 'n': 4}, number=1000);
-      self._run(args={'iterable': '(str(x) for x in xrange(1, 128))', 'n': 4}, number=100);
-
-      self._run(args={'iterable': 'xrange(1, 7)', 'n': 8}, number=100000);
-      self._run(args={'iterable': 'xrange(1, 63)', 'n': 8}, number=10000);
-      self._run(args={'iterable': 'xrange(1, 511)', 'n': 8}, number=1000);
-      self._run(args={'iterable': 'xrange(1, 4095)', 'n': 8}, number=100);
+      self._run(args={'iterable': '(str(x) for x in range(1, 8))', 'n': 4}, number=10000);
+      self._run(args={'iterable': '(str(x) for x in range(1, 64))', 'n': 4}, number=1000);
+      self._run(args={'iterable': '(str(x) for x in range(1, 128))', 'n': 4}, number=100);
+
+      self._run(args={'iterable': 'range(1, 7)', 'n': 8}, number=100000);
+      self._run(args={'iterable': 'range(1, 63)', 'n': 8}, number=10000);
+      self._run(args={'iterable': 'range(1, 511)', 'n': 8}, number=1000);
+      self._run(args={'iterable': 'range(1, 4095)', 'n': 8}, number=100);
 
 
 if __name__ == "__main__":
@@ -0,0 +1,107 @@
+# -*- coding=utf-8 -*-
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2016 R1tschY
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import operator
+
+import benchmarks as bench
+from iterage.fn import λ, _, _1, _2
+
+
+class Point(object):
+  __slots__ = ('x', 'y')
+
+  def __init__(self, x, y):
+    self.x = x
+    self.y = y
+
+points = [Point(i, i % 7) for i in range(1000)]
+pairs = [(i, i % 7) for i in range(1000)]
+
+
+def closures(x):
+  # expression as a tree of nested closures, one call per node
+  getx = operator.attrgetter('x')
+  gety = operator.attrgetter('y')
+  mul = lambda a: getx(a) * gety(a)
+  return lambda a: mul(a) + x
+
+closure_expr = closures(1)
+compiled_expr = λ(_.x * _.y + 1)
+lambda_expr = lambda a: a.x * a.y + 1
+
+compiled_pred = λ(_1 * _2 > 10)
+lambda_pred = lambda a, b: a * b > 10
+
+compiled_attr = λ(_.x)
+lambda_attr = lambda a: a.x
+
+
+class ExprFnBenchmark(bench.BenchmarkBase):
+  def __init__(self):
+    super(ExprFnBenchmark, self).__init__()
+
+    self.registerTests([
+      ("closures", (
+        'from benchmarks.exprfn import closure_expr, points',
+        'list(map(closure_expr, points))'
+      )),
+
+      ("λ", (
+        'from benchmarks.exprfn import compiled_expr, points',
+        'list(map(compiled_expr, points))'
+      )),
+
+      ("lambda", (
+        'from benchmarks.exprfn import lambda_expr, points',
+        'list(map(lambda_expr, points))'
+      )),
+
+      ("λ pred", (
+        'from benchmarks.exprfn import compiled_pred, pairs',
+        'list(filter(None, map(compiled_pred, *zip(*pairs))))'
+      )),
+
+      ("lambda pred", (
+        'from benchmarks.exprfn import lambda_pred, pairs',
+        'list(filter(None, map(lambda_pred, *zip(*pairs))))'
+      )),
+
+      ("λ attr", (
+        'from benchmarks.exprfn import compiled_attr, points',
+        'list(map(compiled_attr, points))'
+      )),
+
+      ("lambda attr", (
+        'from benchmarks.exprfn import lambda_attr, points',
+        'list(map(lambda_attr, points))'
+      )),
+    ])
+
+  def run(self):
+    self._run(args={}, number=1000)
+
+
+if __name__ == "__main__":
+  benchmark = ExprFnBenchmark()
+  benchmark.run()
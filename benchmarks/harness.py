@@ -0,0 +1,246 @@
+# -*- coding=utf-8 -*-
+
+"""
+Benchmark runner with JSON results and regression comparison.
+
+A case is a function ``fn(source, n)`` that runs one operation over
+`source`, an input of `n` elements of one kind (list, generator or range).
+Every case is timed for every size and input kind: the number of calls per
+sample is calibrated to take at least `min_time` seconds and `repeat`
+samples of the time per call are kept.
+
+Two runs are compared case by case with a Mann-Whitney U test on the
+samples. A case is a regression if it is significantly slower and its
+median time grew by more than `threshold`.
+"""
+
+import datetime
+import json
+import math
+import platform
+import statistics
+import sys
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import iterage
+
+KINDS: Dict[str, Callable[[List[int]], Callable[[], Iterable[int]]]] = {
+    "list": lambda data: lambda: data,
+    "generator": lambda data: lambda: (x for x in data),
+    "range": lambda data: lambda: range(len(data)),
+}
+
+SIZES = (10, 1_000, 100_000)
+
+Case = Callable[[Iterable[int], int], Any]
+Key = Tuple[str, str, int]
+
+
+def _sample(
+    case: Case, source: Callable[[], Iterable[int]], n: int, number: int
+) -> float:
+    timer = time.perf_counter
+    total = 0.0
+    for _ in range(number):
+        src = source()
+        start = timer()
+        case(src, n)
+        total += timer() - start
+    return total / number
+
+
+def _calibrate(
+    case: Case, source: Callable[[], Iterable[int]], n: int, min_time: float
+) -> int:
+    # number of calls for a sample of at least min_time seconds
+    number = 1
+    while True:
+        elapsed = _sample(case, source, n, number) * number
+        if elapsed >= min_time:
+            return number
+        number *= max(2, min(10, int(min_time / max(elapsed, 1e-9))))
+
+
+def time_case(
+    case: Case,
+    source: Callable[[], Iterable[int]],
+    n: int,
+    repeat: int = 7,
+    min_time: float = 0.02,
+) -> List[float]:
+    """Samples of the time per call of `case` in seconds."""
+    number = _calibrate(case, source, n, min_time)
+    return [_sample(case, source, n, number) for _ in range(repeat)]
+
+
+def run(
+    cases: Dict[str, Case],
+    sizes: Iterable[int] = SIZES,
+    kinds: Iterable[str] = tuple(KINDS),
+    repeat: int = 7,
+    min_time: float = 0.02,
+    case_kinds: Optional[Dict[str, Iterable[str]]] = None,
+    progress: Optional[Callable[[str], None]] = None,
+) -> Dict[str, Any]:
+    """
+    Time all cases and return JSON-serializable results.
+
+    `case_kinds` restricts cases to some input kinds. The samples are taken
+    in `repeat` rounds over all cases, so slow drifts of the machine's
+    speed show up as noise of every case instead of biasing a few.
+    """
+    jobs = []
+    for size in sizes:
+        data = list(range(size))
+        for kind in kinds:
+            source = KINDS[kind](data)
+            for name, case in cases.items():
+                if case_kinds and name in case_kinds and kind not in case_kinds[name]:
+                    continue
+                if progress:
+                    progress(f"{name} [{kind}, n={size}]")
+                number = _calibrate(case, source, size, min_time)
+                jobs.append((name, kind, size, case, source, number, []))
+
+    for i in range(repeat):
+        if progress:
+            progress(f"round {i + 1}/{repeat}")
+        for _, _, size, case, source, number, samples in jobs:
+            samples.append(_sample(case, source, size, number))
+
+    results = [
+        {
+            "name": name,
+            "kind": kind,
+            "size": size,
+            "samples": samples,
+            "median": statistics.median(samples),
+            "min": min(samples),
+        }
+        for name, kind, size, _, _, _, samples in jobs
+    ]
+    return {"meta": metadata(), "results": results}
+
+
+def metadata() -> Dict[str, Any]:
+    return {
+        "iterage": iterage.__version__,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "date": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+    }
+
+
+def save(results: Dict[str, Any], path: str) -> None:
+    with open(path, "w") as f:
+        json.dump(results, f, indent=1)
+
+
+def load(path: str) -> Dict[str, Any]:
+    with open(path) as f:
+        return json.load(f)
+
+
+def mann_whitney(a: List[float], b: List[float]) -> float:
+    """
+    Two-sided p-value of the Mann-Whitney U test.
+
+    Uses the normal approximation with tie correction.
+    """
+    n1, n2 = len(a), len(b)
+    ranked = sorted([(v, 0) for v in a] + [(v, 1) for v in b])
+    ranks = [0.0] * len(ranked)
+    ties = 0.0
+    i = 0
+    while i < len(ranked):
+        j = i
+        while j + 1 < len(ranked) and ranked[j + 1][0] == ranked[i][0]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[k] = (i + j) / 2 + 1
+        t = j - i + 1
+        ties += t ** 3 - t
+        i = j + 1
+
+    r1 = sum(r for r, (_, group) in zip(ranks, ranked) if group == 0)
+    u = r1 - n1 * (n1 + 1) / 2
+    n = n1 + n2
+    sigma = math.sqrt(n1 * n2 / 12 * ((n + 1) - ties / (n * (n - 1))))
+    if sigma == 0:
+        return 1.0
+    z = (abs(u - n1 * n2 / 2) - 0.5) / sigma
+    return max(0.0, min(1.0, math.erfc(max(z, 0.0) / math.sqrt(2))))
+
+
+def compare(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    alpha: float = 0.01,
+    threshold: float = 0.1,
+) -> List[Dict[str, Any]]:
+    """
+    Compare two runs case by case.
+
+    Every row has the ratio of the medians, the p-value and a `status` of
+    ``"slower"``, ``"faster"`` or ``"same"``.
+    """
+    def index(results: Dict[str, Any]) -> Dict[Key, Dict[str, Any]]:
+        return {(r["name"], r["kind"], r["size"]): r for r in results["results"]}
+
+    base = index(baseline)
+    rows = []
+    for key, result in index(current).items():
+        if key not in base:
+            continue
+        before = base[key]
+        ratio = result["median"] / before["median"]
+        p = mann_whitney(before["samples"], result["samples"])
+        if p < alpha and ratio > 1 + threshold:
+            status = "slower"
+        elif p < alpha and ratio < 1 - threshold:
+            status = "faster"
+        else:
+            status = "same"
+        rows.append({
+            "name": key[0],
+            "kind": key[1],
+            "size": key[2],
+            "ratio": ratio,
+            "p": p,
+            "status": status,
+        })
+    return rows
+
+
+def format_time(seconds: float) -> str:
+    for unit, factor in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= factor:
+            return f"{seconds / factor:7.2f}{unit}"
+    return f"{seconds / 1e-9:7.2f}ns"
+
+
+def format_results(results: Dict[str, Any]) -> str:
+    lines = []
+    for r in results["results"]:
+        lines.append(
+            f"{r['name']:<40} {r['kind']:<10} {r['size']:>8} "
+            f"{format_time(r['median'])}"
+        )
+    return "\n".join(lines)
+
+
+def format_comparison(rows: List[Dict[str, Any]], all_rows: bool = False) -> str:
+    lines = []
+    for r in rows:
+        if all_rows or r["status"] != "same":
+            lines.append(
+                f"{r['name']:<40} {r['kind']:<10} {r['size']:>8} "
+                f"{r['ratio']:6.2f}x  p={r['p']:.4f}  {r['status']}"
+            )
+    return "\n".join(lines)
+
+
+def progress(message: str) -> None:
+    print(message, file=sys.stderr)
@@ -63,8 +63,8 @@ class IAllBenchmark(bench.BenchmarkBase):
 
     def baseline(self, args):
       return timeit.Timer(\
-        setup='import iterage.benchmarks.iall',
-        stmt='iterage.benchmarks.iall.baseline({iterable}, pred={pred})'.format(**args))
+        setup='import benchmarks.iall',
+        stmt='benchmarks.iall.baseline({iterable}, pred={pred})'.format(**args))
 
     def testiterage(self, args):
       return timeit.Timer(
@@ -73,24 +73,24 @@ class IAllBenchmark(bench.BenchmarkBase):
 
     def testiteragev2(self, args):
       return timeit.Timer(\
-        setup='import iterage.benchmarks.iall',
-        stmt='iterage.benchmarks.iall.iall_v2({iterable}, pred={pred})'.format(**args))
+        setup='import benchmarks.iall',
+        stmt='benchmarks.iall.iall_v2({iterable}, pred={pred})'.format(**args))
 
     def testiteragev3(self, args):
       return timeit.Timer(\
-        setup='import iterage.benchmarks.iall',
-        stmt='iterage.benchmarks.iall.iall_v2({iterable}, pred={pred})'.format(**args))
+        setup='import benchmarks.iall',
+        stmt='benchmarks.iall.iall_v2({iterable}, pred={pred})'.format(**args))
 
     def run(self):
-      self.__base().run(args={'iterable': 'xrange(1, 8)', 'pred': 'bool'}, number=100000); self.pnt(); print('')
-      self.__base().run(args={'iterable': 'xrange(1, 64)', 'pred': 'bool'}, number=10000); self.pnt(); print('')
-      self.__base().run(args={'iterable': 'xrange(1, 512)', 'pred': 'bool'}, number=1000); self.pnt(); print('')
-      self.__base().run(args={'iterable': 'xrange(1, 4096)', 'pred': 'bool'}, number=100); self.pnt(); print('')
-
-      self.__base().run(args={'iterable': 'xrange(-8, 1)', 'pred': 'lambda x: x != 0'}, number=100000); self.pnt(); print('')
-      self.__base().run(args={'iterable': 'xrange(-64, 1)', 'pred': 'lambda x: x != 0'}, number=10000); self.pnt(); print('')
-      self.__base().run(args={'iterable': 'xrange(-512, 1)', 'pred': 'lambda x: x != 0'}, number=1000); self.pnt(); print('')
-      self.__base().run(args={'iterable': 'xrange(-4096, 1)', 'pred': 'lambda x: x != 0'}, number=100); self.pnt(); print('')
+      self.__base().run(args={'iterable': 'range(1, 8)', 'pred': 'bool'}, number=100000); self.pnt(); print('')
+      self.__base().run(args={'iterable': 'range(1, 64)', 'pred': 'bool'}, number=10000); self.pnt(); print('')
+      self.__base().run(args={'iterable': 'range(1, 512)', 'pred': 'bool'}, number=1000); self.pnt(); print('')
+      self.__base().run(args={'iterable': 'range(1, 4096)', 'pred': 'bool'}, number=100); self.pnt(); print('')
+
+      self.__base().run(args={'iterable': 'range(-8, 1)', 'pred': 'lambda x: x != 0'}, number=100000); self.pnt(); print('')
+      self.__base().run(args={'iterable': 'range(-64, 1)', 'pred': 'lambda x: x != 0'}, number=10000); self.pnt(); print('')
+      self.__base().run(args={'iterable': 'range(-512, 1)', 'pred': 'lambda x: x != 0'}, number=1000); self.pnt(); print('')
+      self.__base().run(args={'iterable': 'range(-4096, 1)', 'pred': 'lambda x: x != 0'}, number=100); self.pnt(); print('')
 
 
 if __name__ == "__main__":
@@ -79,31 +79,31 @@ class ICountBenchmark(bench.BenchmarkBase):
 
     self.registerTests([
       ("baseline", (
-        'import iterage.benchmarks.icount',
-        'iterage.benchmarks.icount.baseline({iterable})'
+        'import benchmarks.icount',
+        'benchmarks.icount.baseline({iterable})'
       )),
 
       ("v1", (
-        'import iterage.benchmarks.icount',
-        'iterage.benchmarks.icount.icount_v1({iterable})'
+        'import benchmarks.icount',
+        'benchmarks.icount.icount_v1({iterable})'
       )),
 
       ("cardinality", (
-        'import iterage.benchmarks.icount',
-        'iterage.benchmarks.icount.icount_v2({iterable})'
+        'import benchmarks.icount',
+        'benchmarks.icount.icount_v2({iterable})'
       )),
     ])
 
   def run(self):
-    self._run(args={'iterable': 'xrange(1, 8)'}, number=100000)
-    self._run(args={'iterable': 'xrange(1, 64)'}, number=10000)
-    self._run(args={'iterable': 'xrange(1, 512)'}, number=1000)
-    self._run(args={'iterable': 'xrange(1, 4096)'}, number=100)
-
-    self._run(args={'iterable': '(x for x in xrange(8))'}, number=100000)
-    self._run(args={'iterable': '(x for x in xrange(64))'}, number=10000)
-    self._run(args={'iterable': '(x for x in xrange(8) if x > 4)'}, number=100000)
-    self._run(args={'iterable': '(x for x in xrange(64) if x > 100)'}, number=10000)
+    self._run(args={'iterable': 'range(1, 8)'}, number=100000)
+    self._run(args={'iterable': 'range(1, 64)'}, number=10000)
+    self._run(args={'iterable': 'range(1, 512)'}, number=1000)
+    self._run(args={'iterable': 'range(1, 4096)'}, number=100)
+
+    self._run(args={'iterable': '(x for x in range(8))'}, number=100000)
+    self._run(args={'iterable': '(x for x in range(64))'}, number=10000)
+    self._run(args={'iterable': '(x for x in range(8) if x > 4)'}, number=100000)
+    self._run(args={'iterable': '(x for x in range(64) if x > 100)'}, number=10000)
 
 
 if __name__ == "__main__":
@@ -49,41 +49,41 @@ class IEmptyBenchmark(bench.BenchmarkBase):
 
     self.registerTests([
       ("baseline", (
-        'import iterage.benchmarks.icount_if',
-        'iterage.benchmarks.icount_if.baseline({iterable})'
+        'import benchmarks.icount_if',
+        'benchmarks.icount_if.baseline({iterable})'
       )),
 
       ("v1", (
-        'import iterage.benchmarks.icount_if',
-        'iterage.benchmarks.icount_if.icount_if_v1({iterable})'
+        'import benchmarks.icount_if',
+        'benchmarks.icount_if.icount_if_v1({iterable})'
       )),
 
       ("v2", (
-        'import iterage.benchmarks.icount_if',
-        'iterage.benchmarks.icount_if.icount_if_v2({iterable})'
+        'import benchmarks.icount_if',
+        'benchmarks.icount_if.icount_if_v2({iterable})'
       )),
 
       ("v3", (
-        'import iterage.benchmarks.icount_if',
-        'iterage.benchmarks.icount_if.icount_if_v3({iterable})'
+        'import benchmarks.icount_if',
+        'benchmarks.icount_if.icount_if_v3({iterable})'
       )),
 
       ("v4", (
-        'import iterage.benchmarks.icount_if',
-        'iterage.benchmarks.icount_if.icount_if_v4({iterable})'
+        'import benchmarks.icount_if',
+        'benchmarks.icount_if.icount_if_v4({iterable})'
       )),
     ])
 
   def run(self):
-    self._run(args={'iterable': '(x for x in xrange(8))'}, number=100000)
-    self._run(args={'iterable': '(x for x in xrange(64))'}, number=10000)
-    self._run(args={'iterable': '(x > 4 for x in xrange(8))'}, number=100000)
-    self._run(args={'iterable': '(x > 32 for x in xrange(64))'}, number=10000)
-    self._run(args={'iterable': '(x > 100 for x in xrange(64))'}, number=10000)
-    self._run(args={'iterable': '(x % 2 for x in xrange(8))'}, number=10000)
-    self._run(args={'iterable': '(x % 2 for x in xrange(64))'}, number=10000)
-    self._run(args={'iterable': '(x % 2 for x in xrange(128))'}, number=1000)
-    self._run(args={'iterable': '(x % 2 for x in xrange(1024))'}, number=100)
+    self._run(args={'iterable': '(x for x in range(8))'}, number=100000)
+    self._run(args={'iterable': '(x for x in range(64))'}, number=10000)
+    self._run(args={'iterable': '(x > 4 for x in range(8))'}, number=100000)
+    self._run(args={'iterable': '(x > 32 for x in range(64))'}, number=10000)
+    self._run(args={'iterable': '(x > 100 for x in range(64))'}, number=10000)
+    self._run(args={'iterable': '(x % 2 for x in range(8))'}, number=10000)
+    self._run(args={'iterable': '(x % 2 for x in range(64))'}, number=10000)
+    self._run(args={'iterable': '(x % 2 for x in range(128))'}, number=1000)
+    self._run(args={'iterable': '(x % 2 for x in range(1024))'}, number=100)
 
 
 if __name__ == "__main__":
@@ -54,39 +54,39 @@ class ICountIfBenchmark(bench.BenchmarkBase):
 
     self.registerTests([
       ("baseline", (
-        'import iterage.benchmarks.iempty',
-        'iterage.benchmarks.iempty.baseline({iterable})'
+        'import benchmarks.iempty',
+        'benchmarks.iempty.baseline({iterable})'
       )),
 
       ("v1", (
-        'import iterage.benchmarks.iempty',
-        'iterage.benchmarks.iempty.v1({iterable})'
+        'import benchmarks.iempty',
+        'benchmarks.iempty.v1({iterable})'
       )),
 
       ("v2", (
-        'import iterage.benchmarks.iempty',
-        'iterage.benchmarks.iempty.v2({iterable})'
+        'import benchmarks.iempty',
+        'benchmarks.iempty.v2({iterable})'
       )),
 
                             ("v3", (
-        'import iterage.benchmarks.iempty',
-        'iterage.benchmarks.iempty.v3({iterable})'
+        'import benchmarks.iempty',
+        'benchmarks.iempty.v3({iterable})'
       )),
 
                               ("v4", (
-        'import iterage.benchmarks.iempty',
-        'iterage.benchmarks.iempty.v4({iterable})'
+        'import benchmarks.iempty',
+        'benchmarks.iempty.v4({iterable})'
       )),
     ])
 
   def run(self):
-    self._run(args={'iterable': '(x for x in xrange(8))'}, number=100000)
-    self._run(args={'iterable': '(x for x in xrange(64))'}, number=10000)
-    self._run(args={'iterable': '(x > 4 for x in xrange(8))'}, number=100000)
-    self._run(args={'iterable': '(x > 32 for x in xrange(64))'}, number=10000)
-    self._run(args={'iterable': '(x > 100 for x in xrange(64))'}, number=10000)
-    self._run(args={'iterable': 'xrange(0)'}, number=10000)
-    self._run(args={'iterable': 'xrange(5)'}, number=10000)
+    self._run(args={'iterable': '(x for x in range(8))'}, number=100000)
+    self._run(args={'iterable': '(x for x in range(64))'}, number=10000)
+    self._run(args={'iterable': '(x > 4 for x in range(8))'}, number=100000)
+    self._run(args={'iterable': '(x > 32 for x in range(64))'}, number=10000)
+    self._run(args={'iterable': '(x > 100 for x in range(64))'}, number=10000)
+    self._run(args={'iterable': 'range(0)'}, number=10000)
+    self._run(args={'iterable': 'range(5)'}, number=10000)
     self._run(args={'iterable': '[]'}, number=10000)
     self._run(args={'iterable': '[1,2,3,4]'}, number=10000)
 
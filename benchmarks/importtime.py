@@ -0,0 +1,81 @@
+# -*- coding=utf-8 -*-
+
+"""
+Import time of ``import iterage`` measured with ``python -X importtime``.
+
+Every run imports the package in a fresh interpreter. The cumulative import
+time of the package, including the modules it imports, is the minimum over
+all runs. A budget fails if this time is exceeded or if one of the modules
+in `LAZY` was imported, which are only to be loaded on first use.
+"""
+
+import os
+import subprocess
+import sys
+from typing import Any, Dict, List, Tuple
+
+# milliseconds
+BUDGET = 40.0
+
+LAZY = (
+    "iterage.aitr", "iterage.fn", "iterage.parallel", "iterage.external",
+    "iterage.files", "iterage.join", "iterage.profiling", "iterage.reducers",
+    "iterage._numpy", "numpy", "asyncio", "concurrent.futures",
+    "importlib.metadata",
+)
+
+
+def parse(output: str) -> List[Tuple[str, int, int]]:
+    """Module name, self and cumulative time in us of ``-X importtime``."""
+    modules = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        try:
+            own, cumulative = int(fields[0]), int(fields[1])
+        except ValueError:
+            continue  # header
+        modules.append((fields[2].strip(), own, cumulative))
+    return modules
+
+
+def measure(module: str = "iterage") -> Tuple[float, List[str]]:
+    """Import time of `module` in ms and all modules imported with it."""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(sys.path)
+    output = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        env=env, check=True, stderr=subprocess.PIPE, universal_newlines=True,
+    ).stderr
+    modules = parse(output)
+    cumulative = next(c for name, _, c in modules if name == module)
+    return cumulative / 1000, [name for name, _, _ in modules]
+
+
+def run(module: str = "iterage", runs: int = 10, budget: float = BUDGET) -> Dict[str, Any]:
+    """Measure `runs` imports and check them against `budget` ms."""
+    times = []
+    modules: List[str] = []
+    for _ in range(runs):
+        time, modules = measure(module)
+        times.append(time)
+    eager = [name for name in LAZY if name in modules]
+    return {
+        "module": module,
+        "times": times,
+        "min": min(times),
+        "budget": budget,
+        "eager": eager,
+        "failed": min(times) > budget or bool(eager),
+    }
+
+
+def format_result(result: Dict[str, Any]) -> str:
+    lines = [
+        f"import {result['module']}: {result['min']:.1f}ms "
+        f"(budget {result['budget']:.1f}ms)"
+    ]
+    if result["eager"]:
+        lines.append(f"imported eagerly: {', '.join(result['eager'])}")
+    return "\n".join(lines)
@@ -0,0 +1,182 @@
+# -*- coding=utf-8 -*-
+
+"""
+Peak memory of operations measured with :mod:`tracemalloc`.
+
+Every case runs once per input size over a generator of preallocated
+integers, so only memory allocated by the operation itself is traced. For
+every run the peak of traced memory and the memory still held after the run
+(by the result) are recorded, as bytes and per input element. Retained
+memory is also counted in allocated blocks.
+
+Allocations per element are not measured. CPython only reports the blocks
+allocated at a point in time (`tracemalloc`, `sys.getallocatedblocks`), so
+temporary objects freed while an element passes the pipeline can not be
+counted, and sampling deltas would report them as zero.
+
+Streaming cases must run in memory independent of the input size: a case
+fails if its peak at the largest size exceeds `growth` times the peak at
+the smallest size plus `slack` bytes.
+"""
+
+import gc
+import operator
+import tracemalloc
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from iterage.itr import itr
+from iterage.reducers import Count, Sum
+
+from benchmarks import harness
+from benchmarks.suite import inc, key, odd, pair
+
+SIZES = (1_000, 10_000, 100_000)
+
+# operations that must run in memory independent of the input size
+STREAMING: Dict[str, Any] = {
+    "Itr.map": lambda s, n: itr(s).map(inc).consume(),
+    "Itr.where": lambda s, n: itr(s).where(odd).consume(),
+    "Itr.take": lambda s, n: itr(s).take(n // 2).consume(),
+    "Itr.drop": lambda s, n: itr(s).drop(n // 2).consume(),
+    "Itr.take_last": lambda s, n: itr(s).take_last(10).consume(),
+    "Itr.top_k": lambda s, n: itr(s).top_k(10).consume(),
+    "Itr.sort+take": lambda s, n: itr(s).sort(key).take(10).consume(),
+    "Itr.uniq": lambda s, n: itr(s).map(odd).uniq().consume(),
+    "Itr.dedup[bloom]":
+        lambda s, n: itr(s).dedup(mode="bloom", capacity=1000).consume(),
+    "Itr.chunk": lambda s, n: itr(s).chunk(64).consume(),
+    "Itr.sliding": lambda s, n: itr(s).sliding(8).consume(),
+    "Itr.rolling_max": lambda s, n: itr(s).rolling_max(64).consume(),
+    "Itr.enumerate": lambda s, n: itr(s).enumerate().consume(),
+    "Itr.star_map": lambda s, n: itr(s).map(pair).star_map(operator.add).consume(),
+    "Itr.batched": lambda s, n: itr(s).batched(1024).map(inc).where(odd).consume(),
+    "Itr.sum": lambda s, n: itr(s).sum(),
+    "Itr.len": lambda s, n: itr(s).where(odd).len(),
+    "Itr.max": lambda s, n: itr(s).max(),
+    "Itr.count": lambda s, n: itr(s).count(1),
+    "Itr.aggregate": lambda s, n: itr(s).aggregate(n=Count(), total=Sum()),
+    "Itr.quantities[few]": lambda s, n: itr(s).map(odd).quantities(),
+}
+
+# operations that hold (parts of) the input, reported only
+MATERIALIZING: Dict[str, Any] = {
+    "Itr.sort": lambda s, n: itr(s).sort(key).consume(),
+    "Itr.reverse": lambda s, n: itr(s).reverse().consume(),
+    "Itr.group_by": lambda s, n: itr(s).group_by(odd),
+    "Itr.quantities": lambda s, n: itr(s).quantities(),
+    "Itr.dedup": lambda s, n: itr(s).dedup().consume(),
+    "Itr.dedup[hash]": lambda s, n: itr(s).dedup(mode="hash").consume(),
+    "Itr.to_list": lambda s, n: itr(s).to_list(),
+    "Itr.to_set": lambda s, n: itr(s).to_set(),
+}
+
+
+def measure(case: harness.Case, source: Iterable[int], n: int) -> Tuple[int, int, int]:
+    """
+    Run `case` once and return the peak of traced memory and the bytes and
+    number of blocks still allocated after the run.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = case(source, n)
+        current, peak = tracemalloc.get_traced_memory()
+        retained_blocks = sum(
+            stat.count for stat in tracemalloc.take_snapshot().statistics("filename"))
+    finally:
+        tracemalloc.stop()
+    del result
+    return peak, current, retained_blocks
+
+
+def select(patterns: Iterable[str] = ()) -> Dict[str, Tuple[Any, bool]]:
+    """Cases whose names contain one of `patterns` and if they stream."""
+    patterns = list(patterns)
+    cases = {name: (case, True) for name, case in STREAMING.items()}
+    cases.update((name, (case, False)) for name, case in MATERIALIZING.items())
+    return {
+        name: case for name, case in cases.items()
+        if not patterns or any(p in name for p in patterns)
+    }
+
+
+def run(
+    cases: Dict[str, Tuple[Any, bool]],
+    sizes: Iterable[int] = SIZES,
+    progress: Optional[Callable[[str], None]] = None,
+) -> Dict[str, Any]:
+    """Measure all cases and return JSON-serializable results."""
+    results = []
+    for size in sizes:
+        data = list(range(size))
+        source = harness.KINDS["generator"](data)
+        for name, (case, streaming) in cases.items():
+            if progress:
+                progress(f"{name} [n={size}]")
+            peak, retained, retained_blocks = measure(case, source(), size)
+            results.append({
+                "name": name,
+                "size": size,
+                "streaming": streaming,
+                "peak": peak,
+                "peak_per_element": peak / size,
+                "retained": retained,
+                "retained_blocks_per_element": retained_blocks / size,
+            })
+    return {"meta": harness.metadata(), "results": results}
+
+
+def check(
+    results: Dict[str, Any], growth: float = 2.0, slack: int = 16384
+) -> List[Dict[str, Any]]:
+    """
+    Streaming cases whose peak grows with the input size, with the peaks at
+    the smallest and largest size.
+    """
+    by_name: Dict[str, List[Dict[str, Any]]] = {}
+    for r in results["results"]:
+        if r["streaming"]:
+            by_name.setdefault(r["name"], []).append(r)
+
+    failed = []
+    for name, runs in by_name.items():
+        runs.sort(key=operator.itemgetter("size"))
+        smallest, largest = runs[0], runs[-1]
+        if len(runs) > 1 and largest["peak"] > smallest["peak"] * growth + slack:
+            failed.append({
+                "name": name,
+                "sizes": (smallest["size"], largest["size"]),
+                "peaks": (smallest["peak"], largest["peak"]),
+            })
+    return failed
+
+
+def format_bytes(size: float) -> str:
+    for unit, factor in (("MiB", 1 << 20), ("KiB", 1 << 10)):
+        if size >= factor:
+            return f"{size / factor:7.1f}{unit}"
+    return f"{size:7.0f}B  "
+
+
+def format_results(results: Dict[str, Any]) -> str:
+    lines = [
+        f"{'case':<24} {'kind':<13} {'n':>8} {'peak':>10} {'B/elem':>8} "
+        f"{'retained':>10} {'ret blocks/elem':>15}"
+    ]
+    for r in results["results"]:
+        lines.append(
+            f"{r['name']:<24} {'streaming' if r['streaming'] else 'materializing':<13} "
+            f"{r['size']:>8} {format_bytes(r['peak'])} "
+            f"{r['peak_per_element']:>8.2f} {format_bytes(r['retained'])} "
+            f"{r['retained_blocks_per_element']:>15.3f}"
+        )
+    return "\n".join(lines)
+
+
+def format_failures(failed: List[Dict[str, Any]]) -> str:
+    return "\n".join(
+        f"{f['name']}: peak grows from {format_bytes(f['peaks'][0]).strip()} "
+        f"(n={f['sizes'][0]}) to {format_bytes(f['peaks'][1]).strip()} "
+        f"(n={f['sizes'][1]})"
+        for f in failed
+    )
@@ -49,8 +49,8 @@ class RepeatBenchmark(bench.BenchmarkBase):
 
     def baseline(self, args):
       return timeit.Timer(\
-        setup='import iterage.benchmarks.repeat',
-        stmt='list(iterage.benchmarks.repeat.baselinerepeat({element}, {n}))'.format(**args))
+        setup='import benchmarks.repeat',
+        stmt='list(benchmarks.repeat.baselinerepeat({element}, {n}))'.format(**args))
 
     def testiterage(self, args):
       return timeit.Timer(
@@ -0,0 +1,178 @@
+# -*- coding=utf-8 -*-
+
+"""
+Asymptotic scaling of operations.
+
+Every case is timed for input sizes over several orders of magnitude and the
+times are fitted against ``t = a + b * f(n)`` for the complexity classes
+O(1), O(log n), O(n) and O(n log n). The fit minimizes the relative error,
+so small and large sizes weigh the same, and the constant `a` absorbs the
+overhead of short calls.
+
+A case has a documented complexity class. It is flagged if the best fitting
+class grows faster, for example when `Itr.nth` on a list starts to iterate
+instead of indexing.
+"""
+
+import math
+import random
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from iterage.itr import itr
+
+from benchmarks import harness
+from benchmarks.suite import inc, key, odd
+
+SIZES = (10, 100, 1_000, 10_000, 100_000)
+
+MODELS: Dict[str, Callable[[float], float]] = {
+    "O(1)": lambda n: 0.0,
+    "O(log n)": math.log,
+    "O(n)": lambda n: n,
+    "O(n log n)": lambda n: n * math.log(n),
+}
+
+ORDER = list(MODELS)
+
+KINDS = dict(harness.KINDS)
+KINDS["shuffled"] = lambda data: lambda: random.Random(len(data)).sample(data, len(data))
+
+
+class Case(NamedTuple):
+    fn: harness.Case
+    kind: str
+    complexity: str
+
+
+CASES: Dict[str, Case] = {
+    # indexable sources are sliced and measured without iterating
+    "Itr.nth[list]": Case(lambda s, n: itr(s).nth(n - 1), "list", "O(1)"),
+    "Itr.len[list]": Case(lambda s, n: itr(s).map(inc).drop(5).len(), "list", "O(1)"),
+    "Itr.len[range]": Case(lambda s, n: itr(s).take(n // 2).len(), "range", "O(1)"),
+    "Itr.take_last[list]": Case(lambda s, n: itr(s).take_last(10).consume(), "list", "O(1)"),
+    "Itr.reverse[list]": Case(lambda s, n: itr(s).reverse().first(), "list", "O(1)"),
+    "Itr.drop[list]": Case(lambda s, n: itr(s).drop(n - 5).consume(), "list", "O(1)"),
+    # short-circuiting
+    "Itr.first": Case(lambda s, n: itr(s).first(), "generator", "O(1)"),
+    "Itr.take": Case(lambda s, n: itr(s).take(10).consume(), "generator", "O(1)"),
+    "Itr.is_empty": Case(lambda s, n: itr(s).is_empty(), "generator", "O(1)"),
+    # streaming
+    "Itr.map": Case(lambda s, n: itr(s).map(inc).consume(), "generator", "O(n)"),
+    "Itr.where": Case(lambda s, n: itr(s).where(odd).consume(), "generator", "O(n)"),
+    "Itr.sum": Case(lambda s, n: itr(s).sum(), "generator", "O(n)"),
+    "Itr.len": Case(lambda s, n: itr(s).len(), "generator", "O(n)"),
+    "Itr.nth": Case(lambda s, n: itr(s).nth(n - 1), "generator", "O(n)"),
+    "Itr.take_last": Case(lambda s, n: itr(s).take_last(10).consume(), "generator", "O(n)"),
+    "Itr.chunk": Case(lambda s, n: itr(s).chunk(64).consume(), "generator", "O(n)"),
+    "Itr.rolling_max": Case(lambda s, n: itr(s).rolling_max(64).consume(), "shuffled", "O(n)"),
+    "Itr.uniq": Case(lambda s, n: itr(s).uniq().consume(), "generator", "O(n)"),
+    "Itr.dedup[hash]": Case(lambda s, n: itr(s).dedup(mode="hash").consume(), "generator", "O(n)"),
+    "Itr.top_k": Case(lambda s, n: itr(s).top_k(10).consume(), "shuffled", "O(n)"),
+    "Itr.sort+take": Case(lambda s, n: itr(s).sort(key).take(10).consume(), "shuffled", "O(n)"),
+    "Itr.reverse": Case(lambda s, n: itr(s).reverse().consume(), "generator", "O(n)"),
+    # sorting
+    "Itr.sort": Case(lambda s, n: itr(s).sort().consume(), "shuffled", "O(n log n)"),
+    "Itr.dedup": Case(lambda s, n: itr(s).dedup().consume(), "shuffled", "O(n log n)"),
+}
+
+
+def fit(sizes: List[int], times: List[float], model: Callable[[float], float]) -> Tuple[float, float, float]:
+    """
+    Fit ``t = a + b * model(n)`` with ``a, b >= 0`` by weighted least squares
+    on the relative error. Returns `a`, `b` and the RMS relative error.
+    """
+    fs = [model(n) for n in sizes]
+    ws = [1 / t ** 2 for t in times]
+    sw = sum(ws)
+    swf = sum(w * f for w, f in zip(ws, fs))
+    swff = sum(w * f * f for w, f in zip(ws, fs))
+    swt = sum(w * t for w, t in zip(ws, times))
+    swft = sum(w * f * t for w, f, t in zip(ws, fs, times))
+
+    det = sw * swff - swf * swf
+    a = b = -1.0
+    if det > 0:
+        a = (swt * swff - swf * swft) / det
+        b = (sw * swft - swf * swt) / det
+    if b < 0 or det <= 0:
+        a, b = swt / sw, 0.0
+    elif a < 0:
+        a, b = 0.0, swft / swff
+
+    error = math.sqrt(sum(
+        ((a + b * f - t) / t) ** 2 for f, t in zip(fs, times)) / len(times))
+    return a, b, error
+
+
+def classify(sizes: List[int], times: List[float], factor: float = 2.5) -> Tuple[str, Dict[str, float]]:
+    """
+    The complexity class best fitting the times and the errors of all fits.
+
+    The slowest growing class is chosen whose error is at most `factor`
+    times the error of the best fit, so a faster growing class has to
+    explain the times clearly better to be chosen. Timing noise and cache
+    effects do not promote a case to a higher class, but a missing log
+    factor is often not detected.
+    """
+    errors = {name: fit(sizes, times, model)[2] for name, model in MODELS.items()}
+    best = min(errors.values())
+    for name in ORDER:
+        if errors[name] <= best * factor + 0.02:
+            return name, errors
+    raise AssertionError("unreachable")
+
+
+def run(
+    cases: Dict[str, Case],
+    sizes: Iterable[int] = SIZES,
+    repeat: int = 5,
+    min_time: float = 0.01,
+    progress: Optional[Callable[[str], None]] = None,
+) -> Dict[str, Any]:
+    """Time and classify all cases and return JSON-serializable results."""
+    sizes = list(sizes)
+    data = {size: list(range(size)) for size in sizes}
+    results = []
+    for name, case in cases.items():
+        times = []
+        for size in sizes:
+            if progress:
+                progress(f"{name} [{case.kind}, n={size}]")
+            source = KINDS[case.kind](data[size])
+            times.append(min(harness.time_case(case.fn, source, size, repeat, min_time)))
+        complexity, errors = classify(sizes, times)
+        results.append({
+            "name": name,
+            "kind": case.kind,
+            "sizes": sizes,
+            "times": times,
+            "documented": case.complexity,
+            "fitted": complexity,
+            "errors": errors,
+            "worse": ORDER.index(complexity) > ORDER.index(case.complexity),
+        })
+    return {"meta": harness.metadata(), "results": results}
+
+
+def select(patterns: Iterable[str] = ()) -> Dict[str, Case]:
+    """Cases whose names contain one of `patterns` (all without patterns)."""
+    patterns = list(patterns)
+    return {
+        name: case for name, case in CASES.items()
+        if not patterns or any(p in name for p in patterns)
+    }
+
+
+def format_results(results: Dict[str, Any]) -> str:
+    lines = [
+        f"{'case':<22} {'kind':<10} {'documented':<11} {'fitted':<11} "
+        f"{'first':>9} {'last':>9}"
+    ]
+    for r in results["results"]:
+        lines.append(
+            f"{r['name']:<22} {r['kind']:<10} {r['documented']:<11} "
+            f"{r['fitted']:<11} {harness.format_time(r['times'][0])} "
+            f"{harness.format_time(r['times'][-1])}"
+            + ("  WORSE" if r["worse"] else "")
+        )
+    return "\n".join(lines)
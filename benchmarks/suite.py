@@ -0,0 +1,216 @@
+# -*- coding=utf-8 -*-
+
+"""
+Benchmark cases for the public functions of :mod:`iterage.reduce`,
+:mod:`iterage.iterate` and every public method of :class:`iterage.itr.Itr`.
+
+Case names are ``module.function`` or ``Itr.method``. Adaptors are consumed
+with ``consume()``, so every case measures the full operation.
+"""
+
+import atexit
+import inspect
+import operator
+import os
+import shutil
+import sys
+import tempfile
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from iterage.itr import Itr, itr
+from iterage.reducers import Count, Sum
+
+# the package namespace shadows the modules with functions of the same name
+reduce = sys.modules["iterage.reduce"]
+iterate = sys.modules["iterage.iterate"]
+
+
+def inc(x):
+    return x + 1
+
+
+def odd(x):
+    return x % 2
+
+
+def pair(x):
+    return x % 17, x
+
+
+def key(x):
+    return -x
+
+
+_files: Dict[int, str] = {}
+_tmpdir: Optional[str] = None
+
+
+def _text_file(n: int) -> str:
+    # temporary file with n lines, removed at exit
+    global _tmpdir
+    if n not in _files:
+        if _tmpdir is None:
+            _tmpdir = tempfile.mkdtemp(prefix="iterage-bench-")
+            atexit.register(shutil.rmtree, _tmpdir, True)
+        path = os.path.join(_tmpdir, f"{n}.txt")
+        with open(path, "w") as f:
+            f.writelines(f"{i}\n" for i in range(n))
+        _files[n] = path
+    return _files[n]
+
+
+# cases that do not depend on the input kind
+SOURCE_FREE = {
+    "Itr.repeat", "Itr.ntimes", "Itr.empty", "Itr.from_optional",
+    "Itr.from_file", "iterate.iterate",
+}
+
+# combinatoric cases only use the first elements of the input
+_SMALL = 30
+
+CASES: Dict[str, Any] = {
+    # iterage.reduce
+    "reduce.consume": lambda s, n: reduce.consume(iter(s)),
+    "reduce.foreach": lambda s, n: reduce.foreach(inc, s),
+    "reduce.ilen": lambda s, n: reduce.ilen(s),
+    "reduce.icount_if": lambda s, n: reduce.icount_if(s, odd),
+    "reduce.all_equal": lambda s, n: reduce.all_equal(map(bool, s)),
+    "reduce.find_first": lambda s, n: reduce.find_first(s, lambda x: x == n - 1),
+    "reduce.find_first_not": lambda s, n: reduce.find_first_not(s, lambda x: x < n - 1),
+    "reduce.is_empty": lambda s, n: reduce.is_empty(s),
+    "reduce.none": lambda s, n: reduce.none(map(bool, iterate.drop(s, 1))),
+    "reduce.first": lambda s, n: reduce.first(s),
+    "reduce.single": lambda s, n: reduce.single(iterate.take(s, 1)),
+    "reduce.to_optional": lambda s, n: reduce.to_optional(iterate.take(s, 1)),
+    # iterage.iterate
+    "iterate.take": lambda s, n: reduce.consume(iterate.take(s, n // 2)),
+    "iterate.take_last": lambda s, n: iterate.take_last(s, 10),
+    "iterate.drop": lambda s, n: reduce.consume(iterate.drop(s, n // 2)),
+    "iterate.iterate": lambda s, n: reduce.consume(iterate.take(iterate.iterate(0, inc), n)),
+    "iterate.uniq": lambda s, n: reduce.consume(iterate.uniq(s)),
+    "iterate.dedup": lambda s, n: reduce.consume(iterate.dedup(map(odd, s), mode="hash")),
+    "iterate.visit": lambda s, n: reduce.consume(iterate.visit(s, inc)),
+    "iterate.chunk": lambda s, n: reduce.consume(iterate.chunk(s, 64)),
+    "iterate.chunk_filled": lambda s, n: reduce.consume(iterate.chunk_filled(s, 64)),
+    "iterate.chunk_trunc": lambda s, n: reduce.consume(iterate.chunk_trunc(s, 64)),
+    # Itr generators
+    "Itr.repeat": lambda s, n: Itr.repeat(0, n).consume(),
+    "Itr.ntimes": lambda s, n: Itr.ntimes(n).consume(),
+    "Itr.empty": lambda s, n: Itr.empty().consume(),
+    "Itr.from_optional": lambda s, n: Itr.from_optional(n).consume(),
+    "Itr.from_file": lambda s, n: Itr.from_file(_text_file(n)).consume(),
+    # Itr adaptors
+    "Itr.take": lambda s, n: itr(s).take(n // 2).consume(),
+    "Itr.take_while": lambda s, n: itr(s).take_while(lambda x: x < n // 2).consume(),
+    "Itr.take_last": lambda s, n: itr(s).take_last(10).consume(),
+    "Itr.drop": lambda s, n: itr(s).drop(n // 2).consume(),
+    "Itr.drop_while": lambda s, n: itr(s).drop_while(lambda x: x < n // 2).consume(),
+    "Itr.slice": lambda s, n: itr(s).slice(1, n, 3).consume(),
+    "Itr.where": lambda s, n: itr(s).where(odd).consume(),
+    "Itr.where_not": lambda s, n: itr(s).where_not(odd).consume(),
+    "Itr.drop_elements": lambda s, n: itr(s).drop_elements(0).consume(),
+    "Itr.drop_na": lambda s, n: itr(s).drop_na().consume(),
+    "Itr.sort": lambda s, n: itr(s).sort(key).consume(),
+    "Itr.top_k": lambda s, n: itr(s).top_k(10).consume(),
+    "Itr.bottom_k": lambda s, n: itr(s).bottom_k(10).consume(),
+    "Itr.reverse": lambda s, n: itr(s).reverse().consume(),
+    "Itr.uniq": lambda s, n: itr(s).uniq().consume(),
+    "Itr.dedup": lambda s, n: itr(s).map(odd).dedup(mode="hash").consume(),
+    "Itr.map": lambda s, n: itr(s).map(inc).consume(),
+    "Itr.star_map": lambda s, n: itr(s).map(pair).star_map(operator.add).consume(),
+    "Itr.par_map": lambda s, n: itr(s).par_map(inc, workers=2, chunksize=256).consume(),
+    "Itr.batched": lambda s, n: itr(s).batched(1024).map(inc).where(odd).consume(),
+    "Itr.prefetch": lambda s, n: itr(s).prefetch(256).map(inc).consume(),
+    "Itr.flat_map": lambda s, n: itr(s).flat_map(pair).consume(),
+    "Itr.flatten": lambda s, n: itr(s).map(pair).flatten().consume(),
+    "Itr.batch": lambda s, n: itr(s).batch(64, max_delay=0.1).consume(),
+    "Itr.chunk": lambda s, n: itr(s).chunk(64).consume(),
+    "Itr.chunk_filled": lambda s, n: itr(s).chunk_filled(64).consume(),
+    "Itr.chunk_trunc": lambda s, n: itr(s).chunk_trunc(64).consume(),
+    "Itr.zip": lambda s, n: itr(s).zip(range(n)).consume(),
+    "Itr.zip_longest": lambda s, n: itr(s).zip_longest(range(n + 1)).consume(),
+    "Itr.enumerate": lambda s, n: itr(s).enumerate().consume(),
+    "Itr.sliding": lambda s, n: itr(s).sliding(8).consume(),
+    "Itr.rolling_sum": lambda s, n: itr(s).rolling_sum(64).consume(),
+    "Itr.rolling_mean": lambda s, n: itr(s).rolling_mean(64).consume(),
+    "Itr.rolling_min": lambda s, n: itr(s).rolling_min(64).consume(),
+    "Itr.rolling_max": lambda s, n: itr(s).rolling_max(64).consume(),
+    "Itr.accumulate": lambda s, n: itr(s).accumulate().consume(),
+    "Itr.group_by": lambda s, n: itr(s).group_by(odd),
+    "Itr.group_by_external":
+        lambda s, n: itr(s).group_by_external(odd, max(n // 4, 1)).consume(),
+    "Itr.join": lambda s, n: itr(s).join(range(0, n, 3)).consume(),
+    "Itr.prelude": lambda s, n: itr(s).prelude((0,)).consume(),
+    "Itr.postlude": lambda s, n: itr(s).postlude((0,)).consume(),
+    "Itr.cycle": lambda s, n: itr(s).cycle().take(2 * n).consume(),
+    "Itr.product": lambda s, n: itr(s).take(_SMALL).product(2).consume(),
+    "Itr.permutations": lambda s, n: itr(s).take(_SMALL).permutations(2).consume(),
+    "Itr.combinations": lambda s, n: itr(s).take(_SMALL).combinations(2).consume(),
+    "Itr.combinations_with_replacement":
+        lambda s, n: itr(s).take(_SMALL).combinations_with_replacement(2).consume(),
+    # Itr reductions
+    "Itr.reduce": lambda s, n: itr(s).reduce(operator.add, 0),
+    "Itr.aggregate": lambda s, n: itr(s).aggregate(n=Count(), total=Sum()),
+    "Itr.fan_out": lambda s, n: itr(s).fan_out(Count(), Sum()),
+    "Itr.to_string": lambda s, n: itr(s).to_string(","),
+    "Itr.to_list": lambda s, n: itr(s).to_list(),
+    "Itr.to_tuple": lambda s, n: itr(s).to_tuple(),
+    "Itr.to_dict": lambda s, n: itr(s).map(pair).to_dict(),
+    "Itr.to_set": lambda s, n: itr(s).to_set(),
+    "Itr.collect": lambda s, n: itr(s).collect(frozenset),
+    "Itr.to_optional": lambda s, n: itr(s).take(1).to_optional(),
+    "Itr.consume": lambda s, n: itr(s).consume(),
+    "Itr.foreach": lambda s, n: itr(s).foreach(inc),
+    "Itr.sum": lambda s, n: itr(s).sum(),
+    "Itr.all": lambda s, n: itr(s).drop(1).all(),
+    "Itr.any": lambda s, n: itr(s).map(bool).where_not(None).any(),
+    "Itr.none": lambda s, n: itr(s).where(lambda x: x < 0).none(),
+    "Itr.max": lambda s, n: itr(s).max(),
+    "Itr.min": lambda s, n: itr(s).min(),
+    "Itr.len": lambda s, n: itr(s).where(odd).len(),
+    "Itr.find_first": lambda s, n: itr(s).find_first(lambda x: x == n - 1),
+    "Itr.is_empty": lambda s, n: itr(s).is_empty(),
+    "Itr.all_equal": lambda s, n: itr(s).map(bool).all_equal(),
+    "Itr.first": lambda s, n: itr(s).first(),
+    "Itr.single": lambda s, n: itr(s).take(1).single(),
+    "Itr.nth": lambda s, n: itr(s).nth(n // 2 + 1),
+    "Itr.count": lambda s, n: itr(s).count(1),
+    "Itr.exists": lambda s, n: itr(s).exists(lambda x: x == n - 1),
+    "Itr.quantities": lambda s, n: itr(s).map(odd).quantities(),
+    "Itr.profile": lambda s, n: itr(s, instrument=True).map(inc).where(odd).consume(),
+}
+
+
+def public_names() -> List[str]:
+    """Names of all public functions and methods that need a case."""
+    names = []
+    for module in (reduce, iterate):
+        prefix = module.__name__.rsplit(".", 1)[-1]
+        for name, obj in vars(module).items():
+            if (
+                inspect.isfunction(obj)
+                and obj.__module__ == module.__name__
+                and not name.startswith("_")
+            ):
+                names.append(f"{prefix}.{name}")
+    names.extend(f"Itr.{name}" for name in dir(Itr) if not name.startswith("_"))
+    return names
+
+
+def missing() -> List[str]:
+    """Public functions without a benchmark case."""
+    return [name for name in public_names() if name not in CASES]
+
+
+def select(patterns: Iterable[str] = ()) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Cases whose names contain one of `patterns` (all without patterns) and
+    the input kinds they are restricted to.
+    """
+    patterns = list(patterns)
+    cases = {
+        name: case for name, case in CASES.items()
+        if not patterns or any(p in name for p in patterns)
+    }
+    kinds = {name: ("list",) for name in SOURCE_FREE}
+    return cases, kinds
@@ -46,12 +46,12 @@ class TakeBenchmark(bench.BenchmarkBase):
 
     def baseline(self, args):
       return timeit.Timer(
-        setup='from iterage.benchmarks.take import takebaseline',
+        setup='from benchmarks.take import takebaseline',
         stmt='list(takebaseline({iterable}, {n}))'.format(**args))
 
     def baseline2(self, args):
       return timeit.Timer(
-        setup='from iterage.benchmarks.take import takebaseline2',
+        setup='from benchmarks.take import takebaseline2',
         stmt='list(takebaseline2({iterable}, {n}))'.format(**args))
 
     def test1(self, args):
@@ -66,7 +66,7 @@ class TakeBenchmark(bench.BenchmarkBase):
 
     def run(self):
       self.__base().run(
-        args={'iterable': 'xrange(1000)', 'n': 1000 - 1},
+        args={'iterable': 'range(1000)', 'n': 1000 - 1},
         number=100)
 
 
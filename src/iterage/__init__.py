@@ -22,19 +22,82 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
-try:
-    from importlib.metadata import version, PackageNotFoundError  # type: ignore
-except ImportError:  # pragma: no cover
-    from importlib_metadata import version, PackageNotFoundError  # type: ignore
+"""
+Besides `reduce`, `iterate` and `itr` submodules are imported on first access
+of one of their names, so ``import iterage`` stays cheap. Star imports only
+see the eagerly imported names.
 
+``iterage.aitr`` is the submodule, import the function with
+``from iterage.aitr import aitr``.
+"""
 
-try:
-    __version__ = version(__name__)
-except PackageNotFoundError:  # pragma: no cover
-    __version__ = "unknown"
+from importlib import import_module as _import_module
 
-
-from .reduce import *
-from .iterate import *
+from .reduce import (all_equal, consume, find_first, find_first_not, first,
+                     foreach, icount_if, ilen, is_empty, none, single,
+                     to_optional)
+from .iterate import (chunk, chunk_filled, chunk_trunc, dedup, drop, icycle,
+                      iterate, take, take_last, uniq, visit)
 
 from .itr import itr
+
+# names of the package namespace and the submodules defining them
+_LAZY = {
+    "batch": "parallel",
+    "par_map": "parallel",
+    "prefetch": "parallel",
+    "external_group_by": "external",
+    "external_sort": "external",
+    "read_lines": "files",
+    "read_records": "files",
+    "split_file": "files",
+    "hash_join": "join",
+    "merge_join": "join",
+}
+
+_SUBMODULES = frozenset((
+    "aitr", "external", "files", "fn", "itr", "join", "parallel", "profiling",
+    "reduce", "reducers", "iterate",
+))
+
+
+def _version():
+    try:
+        from importlib.metadata import version, PackageNotFoundError  # type: ignore
+    except ImportError:  # pragma: no cover
+        from importlib_metadata import version, PackageNotFoundError  # type: ignore
+
+    try:
+        return version(__name__)
+    except PackageNotFoundError:  # pragma: no cover
+        return "unknown"
+
+
+def __getattr__(name):
+    if name == "__version__":
+        value = _version()
+    elif name in _LAZY:
+        value = getattr(_import_module(f".{_LAZY[name]}", __name__), name)
+    elif name in _SUBMODULES:
+        return _import_module(f".{name}", __name__)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY) | {"__version__"})
+
+
+__all__ = (
+    # reduce
+    "all_equal", "consume", "find_first", "find_first_not", "first",
+    "foreach", "icount_if", "ilen", "is_empty", "none", "single",
+    "to_optional",
+    # iterate
+    "chunk", "chunk_filled", "chunk_trunc", "dedup", "drop", "icycle",
+    "iterate", "take", "take_last", "uniq", "visit",
+    # itr
+    "itr",
+)
@@ -0,0 +1,61 @@
+# -*- coding=utf-8 -*-
+
+"""
+Bloom filter over hashable objects.
+"""
+
+import math
+from typing import Hashable
+
+_MASK = (1 << 64) - 1
+
+
+class BloomFilter:
+    """
+    Set-like membership test in bounded memory with false positives.
+
+    For `capacity` added items the chance of a false positive is about
+    `error_rate`.
+
+    >>> bf = BloomFilter(100, 0.01)
+    >>> bf.add("a"), bf.add("b"), bf.add("a")
+    (True, True, False)
+    >>> "b" in bf, "c" in bf
+    (True, False)
+
+    """
+
+    __slots__ = ("_bits", "_m", "_k")
+
+    def __init__(self, capacity: int, error_rate: float):
+        if capacity < 1:
+            raise ValueError("capacity must be greater than 0")
+        if not 0 < error_rate < 1:
+            raise ValueError("error_rate must be between 0 and 1")
+
+        m = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self._m = max(m, 8)
+        self._k = max(round(self._m / capacity * math.log(2)), 1)
+        self._bits = bytearray((self._m + 7) // 8)
+
+    def _indices(self, item: Hashable):
+        # double hashing: h1 + i * h2
+        h1 = hash(item) & _MASK
+        h2 = hash((h1, 0x9E3779B97F4A7C15)) & _MASK | 1
+        m = self._m
+        return [(h1 + i * h2) % m for i in range(self._k)]
+
+    def add(self, item: Hashable) -> bool:
+        """Add item, returns False if item was (probably) added before."""
+        bits = self._bits
+        new = False
+        for i in self._indices(item):
+            byte, bit = i >> 3, 1 << (i & 7)
+            if not bits[byte] & bit:
+                bits[byte] |= bit
+                new = True
+        return new
+
+    def __contains__(self, item: Hashable) -> bool:
+        bits = self._bits
+        return all(bits[i >> 3] & (1 << (i & 7)) for i in self._indices(item))
@@ -0,0 +1,200 @@
+# -*- coding=utf-8 -*-
+
+"""
+Vectorized evaluation of Itr plans over NumPy arrays and `array.array`.
+
+Only used if NumPy is installed. A plan is vectorized when its source is a
+one-dimensional numeric array and all stages are `map`/`where`/`where_not`
+with expression functions (see :func:`iterage.fn.is_expr_function`) or NumPy
+ufuncs, or `take`/`drop`/`slice`. Otherwise `evaluate` returns `None` and the
+caller falls back to iterating.
+
+Vectorizing must not change results. Integers are widened to 64 bits and
+every function applied to them is checked against the same function in
+floating point, which catches overflows of fixed width integers. Any NumPy
+error or warning, like a division by zero, and any exception of the
+functions also make `evaluate` return `None`, so iterating computes the
+result or raises the error Python raises. Floats are not summed with
+NumPy, its pairwise summation rounds differently than adding one element
+after the other.
+"""
+
+import array
+import warnings
+from typing import Any, Callable, Dict, Iterable, Optional, Sequence
+
+from iterage import _plan
+from iterage.fn import is_expr_function
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None  # type: ignore
+
+_NUMERIC_KINDS = "biuf"
+
+_INTEGER_KINDS = "biu"
+
+_INT64_MAX = 2 ** 63 - 1
+
+
+class _Fallback(Exception):
+    pass
+
+
+def _vectorizable(fn: Optional[Callable]) -> bool:
+    return (
+        fn is None
+        or is_expr_function(fn)
+        or isinstance(fn, numpy.ufunc)  # type: ignore
+    )
+
+
+def _as_array(source: Iterable) -> Any:
+    if isinstance(source, numpy.ndarray):  # type: ignore
+        arr = source
+    elif isinstance(source, array.array) and source.typecode != "u":
+        arr = numpy.asarray(source)  # type: ignore
+    else:
+        return None
+
+    if arr.ndim != 1 or arr.dtype.kind not in _NUMERIC_KINDS:
+        return None
+    return arr
+
+
+def _elementwise(arr: Any, result: Any) -> bool:
+    return isinstance(result, numpy.ndarray) and result.shape == arr.shape  # type: ignore
+
+
+def _wide(arr: Any) -> Any:
+    if arr.dtype == numpy.uint64 and arr.size and arr.max() > _INT64_MAX:  # type: ignore
+        raise _Fallback
+    return arr.astype(numpy.int64)  # type: ignore
+
+
+def _apply(fn: Callable, arr: Any) -> Any:
+    if arr.dtype.kind not in _INTEGER_KINDS:
+        result = fn(arr)
+        expected = result
+    else:
+        result = fn(_wide(arr))
+        # overflows wrap around silently, floats do not
+        expected = fn(arr.astype(numpy.float64))  # type: ignore
+    if not _elementwise(arr, result) or not _elementwise(arr, expected):
+        raise _Fallback
+    if expected is not result and not (result == expected).all():
+        raise _Fallback
+    return result
+
+
+def _run(arr: Any, stages: Sequence[_plan.Stage]) -> Any:
+    for stage in stages:
+        kind = type(stage)
+        if kind is _plan.Slice:
+            arr = arr[stage.start : stage.stop : stage.step]  # type: ignore
+            continue
+
+        fn = stage.fn  # type: ignore
+        if kind is _plan.Map:
+            arr = _apply(fn, arr)
+        else:
+            mask = arr if fn is None else _apply(fn, arr)
+            mask = mask.astype(bool, copy=False)
+            arr = arr[~mask if kind is _plan.WhereNot else mask]
+
+        if arr.dtype.kind not in _NUMERIC_KINDS:
+            raise _Fallback
+    return arr
+
+
+def _guarded(fn: Callable, *args: Any) -> Any:
+    # None on any exception or NumPy warning
+    try:
+        with numpy.errstate(all="raise"), warnings.catch_warnings():  # type: ignore
+            warnings.simplefilter("error")
+            return fn(*args)
+    except Exception:
+        return None
+
+
+def evaluate(source: Iterable, stages: Sequence[_plan.Stage]) -> Any:
+    """
+    Evaluate plan to a NumPy array or return `None`, if not possible.
+    """
+    if numpy is None:
+        return None
+
+    arr = _as_array(source)
+    if arr is None:
+        return None
+
+    stages = _plan.optimize(stages)
+    for stage in stages:
+        kind = type(stage)
+        if kind is _plan.Slice:
+            continue
+        if kind not in (_plan.Map, _plan.Where, _plan.WhereNot):
+            return None
+        if not _vectorizable(stage.fn):  # type: ignore
+            return None
+    return _guarded(_run, arr, stages)
+
+
+def _sum(arr: Any, source: Iterable) -> Any:
+    # NumPy sums floats pairwise and narrow integers in a wider type, while
+    # iterating adds one element after the other. Only integer sums give
+    # the same result: exact Python ints for `array.array`, and for NumPy
+    # arrays 64-bit sums that can not overflow.
+    if arr.dtype.kind not in "iu":
+        raise _Fallback
+    overflows = arr.size and (
+        max(abs(int(arr.min())), abs(int(arr.max()))) * arr.size > _INT64_MAX)
+    if not isinstance(source, numpy.ndarray):  # type: ignore
+        return sum(arr.tolist()) if overflows else arr.sum()
+    if overflows or arr.dtype != source.dtype or arr.dtype.itemsize != 8:
+        raise _Fallback
+    return arr.sum()
+
+
+def _count(arr: Any, value: Any) -> int:
+    matches = arr == value
+    if not _elementwise(arr, matches):
+        raise _Fallback
+    return int(matches.sum())
+
+
+_REDUCERS: Dict[str, Callable[..., Any]] = {
+    "all": lambda arr: bool(arr.all()),
+    "any": lambda arr: bool(arr.any()),
+    "max": lambda arr: arr.max() if arr.size else None,
+    "min": lambda arr: arr.min() if arr.size else None,
+    "len": lambda arr: arr.size,
+    "count": _count,
+}
+
+
+def reduce(source: Iterable, stages: Sequence[_plan.Stage], name: str, *args: Any) -> Any:
+    """
+    Reduce the evaluated plan with the reduction `name` or return `None`, if
+    not possible.
+    """
+    arr = evaluate(source, stages)
+    if arr is None:
+        return None
+    if name == "sum":
+        result = _guarded(_sum, arr, source)
+    else:
+        result = _guarded(_REDUCERS[name], arr, *args)
+    if result is None:
+        return None
+    return scalar(result, source)
+
+
+def scalar(value: Any, source: Iterable) -> Any:
+    """
+    Convert a NumPy scalar to the type iterating `source` would give.
+    """
+    if isinstance(source, numpy.ndarray) or not isinstance(value, numpy.generic):  # type: ignore
+        return value
+    return value.item()
@@ -0,0 +1,638 @@
+# -*- coding=utf-8 -*-
+
+"""
+Lazy query plan behind :class:`iterage.itr.Itr`.
+
+An ``Itr`` records its operations as a tuple of stages on top of a source
+iterable. When the ``Itr`` is consumed, :func:`optimize` rewrites the stages
+and :func:`build` turns them into as few iterator layers as possible.
+
+Rewrite rules:
+
+- ``slice``, ``take_last`` and ``reverse`` stages are pushed below
+  length-preserving stages (``map``, ``star_map``, ``par_map``), so skipped
+  elements are never mapped.
+- adjacent ``slice`` stages are merged into one and no-op slices are dropped.
+- a ``sort`` followed by a ``slice`` with a stop only selects the needed
+  smallest (largest) elements with a heap.
+- runs of ``map``, ``star_map``, ``where`` and ``where_not`` stages are fused
+  into one generated generator function, so every element passes a single
+  iterator layer instead of one per stage.
+
+In batched mode (:func:`build_blocks`) elements move between stages in
+lists of up to ``size`` elements. A fused run then turns one block into the
+next in a plain loop, without resuming a generator per element, and
+reductions can combine per-block results.
+
+Selecting stages (``slice``, ``take_last``, ``reverse``, ``cycle``) use
+random access on sequence sources and produce lazy views instead of walking
+or copying the elements.
+
+Every stage also knows how it changes the number of elements, so the length
+of a plan over a sized source can be computed without iterating
+(:func:`length`, :func:`length_hint`).
+"""
+
+from functools import lru_cache
+from collections import deque
+from heapq import nlargest, nsmallest
+from itertools import (chain, cycle, filterfalse, islice, repeat, starmap,
+                       zip_longest)
+from operator import index, length_hint as _length_hint
+from typing import (TYPE_CHECKING, Any, Callable, Iterable, List, Optional,
+                    Sequence, Tuple)
+
+from iterage._views import is_random_access, view
+from iterage.iterate import chunk, chunk_filled, chunk_trunc
+
+if TYPE_CHECKING:  # pragma: no cover
+    from iterage.profiling import Profile
+
+
+class Stage:
+    """One operation of a plan."""
+
+    __slots__ = ()
+
+    #: stage can be swapped with a following `Map`
+    before_map = False
+
+    #: stage maps every element to one element, keeping the order
+    elementwise = False
+
+    #: letter of fusable stages in the generated loops, see `_fused_factory`
+    kind = ""
+
+    def build(self, iterable: Iterable) -> Iterable:
+        raise NotImplementedError
+
+    def instrument(self, wrap: Callable[[Callable], Callable]) -> "Stage":
+        """Copy of the stage with the user callables wrapped with `wrap`."""
+        return self
+
+    def length(self, n: Optional[int]) -> Optional[int]:
+        """
+        Number of elements produced from `n` input elements.
+
+        `None` means unknown. The default is length-preserving.
+        """
+        return n
+
+
+class Map(Stage):
+    __slots__ = ("fn",)
+
+    kind = "m"
+    elementwise = True
+
+    def __init__(self, fn: Callable):
+        self.fn = fn
+
+    def build(self, iterable: Iterable) -> Iterable:
+        return map(self.fn, iterable)
+
+    def instrument(self, wrap: Callable[[Callable], Callable]) -> Stage:
+        return type(self)(wrap(self.fn))
+
+
+class StarMap(Map):
+    __slots__ = ()
+
+    kind = "s"
+
+    def build(self, iterable: Iterable) -> Iterable:
+        return starmap(self.fn, iterable)
+
+
+class ParMap(Stage):
+    __slots__ = ("fn", "options")
+
+    elementwise = True
+
+    def __init__(self, fn: Callable, **options: Any):
+        from iterage import parallel
+        parallel.check_options(
+            options["workers"], options["backend"], options["chunksize"],
+            options["max_in_flight"])
+        self.fn = fn
+        self.options = options
+
+    def build(self, iterable: Iterable) -> Iterable:
+        from iterage import parallel
+        return parallel.par_map(iterable, self.fn, **self.options)
+
+    def instrument(self, wrap: Callable[[Callable], Callable]) -> Stage:
+        if self.options["backend"] != "thread":
+            return self  # wrapped functions can not be pickled
+        return ParMap(wrap(self.fn), **self.options)
+
+
+class Prefetch(Stage):
+    __slots__ = ("n", "backend")
+
+    def __init__(self, n: int, backend: str):
+        from iterage import parallel
+        parallel.check_prefetch_options(n, backend)
+        self.n = n
+        self.backend = backend
+
+    def build(self, iterable: Iterable) -> Iterable:
+        from iterage import parallel
+        return parallel.prefetch(iterable, self.n, self.backend)
+
+
+class Where(Stage):
+    __slots__ = ("fn",)
+
+    kind = "w"
+
+    def __init__(self, fn: Optional[Callable]):
+        self.fn = fn
+
+    def build(self, iterable: Iterable) -> Iterable:
+        return filter(self.fn, iterable)
+
+    def instrument(self, wrap: Callable[[Callable], Callable]) -> Stage:
+        return type(self)(wrap(self.fn or bool))
+
+    def length(self, n: Optional[int]) -> Optional[int]:
+        return None
+
+
+class WhereNot(Where):
+    __slots__ = ()
+
+    kind = "n"
+
+    def build(self, iterable: Iterable) -> Iterable:
+        return filterfalse(self.fn, iterable)
+
+
+def _slice_arg(value: Any, name: str, default: Optional[int]) -> Optional[int]:
+    if value is None:
+        return default
+    try:
+        value = index(value)
+    except TypeError:
+        value = -1
+    if value < 0:
+        raise ValueError(
+            f"{name} argument for slice must be None or an integer: 0 <= x"
+        )
+    return value
+
+
+class Slice(Stage):
+    """
+    ``islice`` with non-negative, normalized arguments.
+
+    >>> s = Slice(1, None, 2).then(Slice(None, 3))
+    >>> s.start, s.stop, s.step
+    (1, 7, 2)
+
+    """
+
+    __slots__ = ("start", "stop", "step")
+
+    before_map = True
+
+    def __init__(self, *args: Any):
+        s = slice(*args)
+        self.start: int = _slice_arg(s.start, "Start", 0)  # type: ignore
+        self.stop = _slice_arg(s.stop, "Stop", None)
+        self.step: int = _slice_arg(s.step, "Step", 1)  # type: ignore
+        if self.step == 0:
+            raise ValueError("Step argument for slice must be positive")
+        if self.stop is not None and self.stop < self.start:
+            self.stop = self.start
+
+    def is_noop(self) -> bool:
+        return self.start == 0 and self.stop is None and self.step == 1
+
+    def then(self, other: "Slice") -> "Slice":
+        """Merge with a slice that is applied after this one."""
+        start = self.start + other.start * self.step
+        stop = self.stop
+        if other.stop is not None:
+            ostop = self.start + other.stop * self.step
+            stop = ostop if stop is None else min(stop, ostop)
+        return Slice(start, stop, self.step * other.step)
+
+    def build(self, iterable: Iterable) -> Iterable:
+        if is_random_access(iterable):
+            return view(iterable, slice(self.start, self.stop, self.step))  # type: ignore
+        return islice(iterable, self.start, self.stop, self.step)
+
+    def length(self, n: Optional[int]) -> Optional[int]:
+        if n is None:
+            return None
+        return len(range(n)[self.start : self.stop : self.step])
+
+
+class TakeLast(Stage):
+    __slots__ = ("n",)
+
+    before_map = True
+
+    def __init__(self, n: int):
+        if n < 0:
+            raise ValueError("n must be greater than or equal 0")
+        self.n = n
+
+    def build(self, iterable: Iterable) -> Iterable:
+        if is_random_access(iterable):
+            size = len(iterable)  # type: ignore
+            return view(iterable, slice(max(size - self.n, 0), None))  # type: ignore
+        # a list, so following stages can index it in O(1)
+        return list(deque(iterable, maxlen=self.n))
+
+    def length(self, n: Optional[int]) -> Optional[int]:
+        return None if n is None else min(n, self.n)
+
+
+class Reverse(Stage):
+    __slots__ = ()
+
+    before_map = True
+
+    def build(self, iterable: Iterable) -> Iterable:
+        if is_random_access(iterable):
+            return view(iterable, slice(None, None, -1))  # type: ignore
+        try:
+            return reversed(iterable)  # type: ignore
+        except TypeError:
+            return reversed(list(iterable))
+
+
+class Cycle(Stage):
+    __slots__ = ()
+
+    def build(self, iterable: Iterable) -> Iterable:
+        if is_random_access(iterable):
+            # iterate the sequence again and again instead of copying it
+            return chain.from_iterable(repeat(iterable)) if iterable else ()
+        return cycle(iterable)
+
+    def length(self, n: Optional[int]) -> Optional[int]:
+        return 0 if n == 0 else None
+
+
+class Sort(Stage):
+    __slots__ = ("key", "reverse", "limit")
+
+    def __init__(
+        self,
+        key: Optional[Callable] = None,
+        reverse: bool = False,
+        limit: Optional[int] = None,
+    ):
+        self.key = key
+        self.reverse = reverse
+        self.limit = limit
+
+    def build(self, iterable: Iterable) -> Iterable:
+        if self.limit is None:
+            return sorted(iterable, key=self.key, reverse=self.reverse)
+        select = nlargest if self.reverse else nsmallest
+        return select(self.limit, iterable, key=self.key)
+
+    def instrument(self, wrap: Callable[[Callable], Callable]) -> Stage:
+        if self.key is None:
+            return self
+        return Sort(wrap(self.key), self.reverse, self.limit)
+
+
+class Enumerate(Stage):
+    __slots__ = ("start",)
+
+    def __init__(self, start: int):
+        self.start = start
+
+    def build(self, iterable: Iterable) -> Iterable:
+        return enumerate(iterable, self.start)
+
+
+def _len(iterable: Iterable) -> Optional[int]:
+    try:
+        return len(iterable)  # type: ignore
+    except TypeError:
+        return None
+
+
+class Zip(Stage):
+    __slots__ = ("other",)
+
+    def __init__(self, other: Iterable):
+        self.other = other
+
+    def build(self, iterable: Iterable) -> Iterable:
+        return zip(iterable, self.other)
+
+    def length(self, n: Optional[int]) -> Optional[int]:
+        m = _len(self.other)
+        if n is None or m is None:
+            return None
+        return min(n, m)
+
+
+class ZipLongest(Zip):
+    __slots__ = ("fillvalue",)
+
+    def __init__(self, other: Iterable, fillvalue: Any):
+        super().__init__(other)
+        self.fillvalue = fillvalue
+
+    def build(self, iterable: Iterable) -> Iterable:
+        return zip_longest(iterable, self.other, fillvalue=self.fillvalue)
+
+    def length(self, n: Optional[int]) -> Optional[int]:
+        m = _len(self.other)
+        if n is None or m is None:
+            return None
+        return max(n, m)
+
+
+class Chunk(Stage):
+    __slots__ = ("n",)
+
+    def __init__(self, n: int):
+        if n < 1:
+            raise ValueError("n must be greater than 0")
+        self.n = n
+
+    def build(self, iterable: Iterable) -> Iterable:
+        return chunk(iterable, self.n)
+
+    def length(self, n: Optional[int]) -> Optional[int]:
+        return None if n is None else -(-n // self.n)
+
+
+class Batch(Stage):
+    __slots__ = ("max_size", "max_delay")
+
+    def __init__(self, max_size: int, max_delay: Optional[float]):
+        from iterage import parallel
+        parallel.check_batch_options(max_size, max_delay)
+        self.max_size = max_size
+        self.max_delay = max_delay
+
+    def build(self, iterable: Iterable) -> Iterable:
+        from iterage import parallel
+        return parallel.batch(iterable, self.max_size, self.max_delay)
+
+    def length(self, n: Optional[int]) -> Optional[int]:
+        if n is None or self.max_delay is not None:
+            return None
+        return -(-n // self.max_size)
+
+
+class ChunkFilled(Chunk):
+    __slots__ = ("fillvalue",)
+
+    def __init__(self, n: int, fillvalue: Any):
+        super().__init__(n)
+        self.fillvalue = fillvalue
+
+    def build(self, iterable: Iterable) -> Iterable:
+        return chunk_filled(iterable, self.n, self.fillvalue)
+
+
+class ChunkTrunc(Chunk):
+    __slots__ = ()
+
+    def build(self, iterable: Iterable) -> Iterable:
+        return chunk_trunc(iterable, self.n)
+
+    def length(self, n: Optional[int]) -> Optional[int]:
+        return None if n is None else n // self.n
+
+
+_FUSABLE = (Map, Where)
+
+
+def optimize(stages: Sequence[Stage]) -> List[Stage]:
+    """
+    Rewrite stages into an equivalent, cheaper plan.
+
+    >>> plan = optimize([Map(str), Slice(2, None), Slice(None, 3)])
+    >>> [type(s).__name__ for s in plan]
+    ['Slice', 'Map']
+    >>> optimize([Slice(None, None), Where(None)])[0].__class__.__name__
+    'Where'
+
+    """
+    result: List[Stage] = []
+    for stage in stages:
+        if stage.before_map:
+            i = len(result)
+            while i > 0 and result[i - 1].elementwise:
+                i -= 1
+            if isinstance(stage, Slice):
+                if i > 0 and isinstance(result[i - 1], Slice):
+                    stage = result[i - 1].then(stage)  # type: ignore
+                    i -= 1
+                    del result[i]
+                if stage.is_noop():
+                    continue
+            result.insert(i, stage)
+        else:
+            result.append(stage)
+
+    for i, stage in enumerate(result[:-1]):
+        following = result[i + 1]
+        if (
+            isinstance(stage, Sort)
+            and isinstance(following, Slice)
+            and following.stop is not None
+        ):
+            result[i] = Sort(stage.key, stage.reverse, following.stop)
+    return result
+
+
+# loop body line of every stage kind, `{f}` is the function of the stage.
+# Filters skip to the next element.
+_FUSED_LINES = {
+    "m": "x = {f}(x)",
+    "s": "x = {f}(*x)",
+    "w": "if not {f}(x): continue",
+    "n": "if {f}(x): continue",
+    "W": "if not x: continue",
+    "N": "if x: continue",
+}
+
+
+@lru_cache(maxsize=None)
+def _fused_factory(kinds: str, blocks: bool = False) -> Callable:
+    names = [f"f{i}" for i in range(len(kinds))]
+    if blocks:
+        lines = [
+            "def fused(blocks, fns):",
+            f"    {', '.join(names)}, = fns",
+            "    for block in blocks:",
+            "        out = []",
+            "        append = out.append",
+            "        for x in block:",
+        ]
+    else:
+        lines = [
+            "def fused(iterable, fns):",
+            f"    {', '.join(names)}, = fns",
+            "    for x in iterable:",
+        ]
+    indent = " " * (12 if blocks else 8)
+    lines.extend(
+        indent + _FUSED_LINES[kind].format(f=name)
+        for name, kind in zip(names, kinds))
+    if blocks:
+        lines.append(f"{indent}append(x)")
+        lines.append("        if out:")
+        lines.append("            yield out")
+    else:
+        lines.append(f"{indent}yield x")
+
+    namespace: dict = {}
+    exec("\n".join(lines), namespace)  # noqa: S102
+    return namespace["fused"]
+
+
+def _kinds(run: List[Stage]) -> str:
+    return "".join(
+        s.kind.upper() if isinstance(s, Where) and s.fn is None else s.kind
+        for s in run
+    )
+
+
+def _fuse(iterable: Iterable, run: List[Stage]) -> Iterable:
+    if len(run) == 1:
+        return run[0].build(iterable)
+
+    fns: Tuple = tuple(s.fn for s in run)  # type: ignore
+    return _fused_factory(_kinds(run))(iterable, fns)
+
+
+def build(
+    source: Iterable,
+    stages: Sequence[Stage],
+    size: Optional[int] = None,
+    profile: Optional["Profile"] = None,
+) -> Iterable:
+    """
+    Build the iterable that runs stages over source.
+
+    Without stages source itself is returned. With `size` the stages run in
+    batched mode, see :func:`build_blocks`. With `profile` stages are not
+    fused or batched, but every stage records its statistics in `profile`.
+
+    >>> list(build(range(10), [Map(lambda x: x * 2), Where(lambda x: x % 3)]))
+    [2, 4, 8, 10, 14, 16]
+
+    """
+    if profile is not None:
+        return profile.build(source, optimize(stages))
+    if size is not None:
+        return chain.from_iterable(build_blocks(source, stages, size))
+
+    result = source
+    run: List[Stage] = []
+    for stage in optimize(stages):
+        if isinstance(stage, _FUSABLE):
+            run.append(stage)
+            continue
+        if run:
+            result = _fuse(result, run)
+            run = []
+        result = stage.build(result)
+    if run:
+        result = _fuse(result, run)
+    return result
+
+
+def _blocks(iterable: Iterable, size: int) -> Iterable[list]:
+    if type(iterable) is list:
+        return (iterable[i : i + size] for i in range(0, len(iterable), size))
+    it = iter(iterable)
+    return iter(lambda: list(islice(it, size)), [])
+
+
+def _build_blocks(blocks: Iterable[list], stage: Stage) -> Iterable[list]:
+    for block in blocks:
+        block = list(stage.build(block))
+        if block:
+            yield block
+
+
+def _fuse_blocks(blocks: Iterable[list], run: List[Stage]) -> Iterable[list]:
+    if len(run) == 1:
+        return _build_blocks(blocks, run[0])
+
+    fns: Tuple = tuple(s.fn for s in run)  # type: ignore
+    return _fused_factory(_kinds(run), True)(blocks, fns)
+
+
+def build_blocks(
+    source: Iterable,
+    stages: Sequence[Stage],
+    size: int,
+    profile: Optional["Profile"] = None,
+) -> Iterable[list]:
+    """
+    Build an iterable of non-empty lists that hold the elements of the plan.
+
+    Runs of ``map``/``where`` stages are applied to blocks of up to `size`
+    source elements. Other stages get the elements one by one and their
+    output is cut into blocks again.
+
+    >>> list(build_blocks(range(10), [Where(lambda x: x % 3)], 4))
+    [[1, 2], [4, 5, 7], [8]]
+
+    """
+    if profile is not None:
+        return _blocks(profile.build(source, optimize(stages)), size)
+
+    result = source
+    run: List[Stage] = []
+    for stage in optimize(stages):
+        if isinstance(stage, _FUSABLE):
+            run.append(stage)
+            continue
+        if run:
+            result = chain.from_iterable(
+                _fuse_blocks(_blocks(result, size), run))
+            run = []
+        result = stage.build(result)
+    if run:
+        return _fuse_blocks(_blocks(result, size), run)
+    return _blocks(result, size)
+
+
+def _propagate(n: Optional[int], stages: Sequence[Stage]) -> Optional[int]:
+    for stage in stages:
+        if n is None:
+            break
+        n = stage.length(n)
+    return n
+
+
+def length(source: Iterable, stages: Sequence[Stage]) -> Optional[int]:
+    """
+    Number of elements of the plan or `None` if unknown without iterating.
+
+    >>> length(range(10 ** 9), [Map(str), Slice(5)])
+    5
+    >>> length(range(10), [Where(None)]) is None
+    True
+
+    """
+    return _propagate(_len(source), stages)
+
+
+def length_hint(source: Iterable, stages: Sequence[Stage]) -> int:
+    """
+    Estimated number of elements of the plan, like `operator.length_hint`.
+
+    >>> length_hint(iter(range(10)), [Chunk(3)])
+    4
+
+    """
+    n = _propagate(_length_hint(source, -1), stages)
+    return 0 if n is None or n < 0 else n
@@ -0,0 +1,48 @@
+# -*- coding=utf-8 -*-
+
+"""
+Temporary files for elements that do not fit in memory.
+"""
+
+import pickle
+import tempfile
+from typing import Any, Iterator, List, Optional
+
+
+class SpillFile:
+    """
+    Anonymous temporary file holding pickled batches of elements.
+
+    >>> f = SpillFile()
+    >>> f.write([1, 2]); f.write([3])
+    >>> list(f)
+    [1, 2, 3]
+    >>> f.close()
+
+    """
+
+    __slots__ = ("_file", "count")
+
+    def __init__(self, dir: Optional[str] = None):
+        self._file = tempfile.TemporaryFile(dir=dir)
+        self.count = 0
+
+    def write(self, items: List[Any]) -> None:
+        if items:
+            pickle.dump(items, self._file, pickle.HIGHEST_PROTOCOL)
+            self.count += len(items)
+
+    def __iter__(self) -> Iterator[Any]:
+        f = self._file
+        f.flush()
+        f.seek(0)
+        load = pickle.load
+        while True:
+            try:
+                items = load(f)  # noqa: S301
+            except EOFError:
+                return
+            yield from items
+
+    def close(self) -> None:
+        self._file.close()
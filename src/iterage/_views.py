@@ -0,0 +1,98 @@
+# -*- coding=utf-8 -*-
+
+"""
+Lazy, copy-free views on sequences.
+"""
+
+from collections.abc import Sequence
+from itertools import islice
+from operator import eq
+from typing import Any, Iterator
+
+
+def is_random_access(iterable: Any) -> bool:
+    """
+    Returns True if iterable supports O(1) `len` and indexing.
+
+    Only builtin sequences and views are known to index in O(1), other
+    sequences like `collections.deque` do not.
+
+    >>> from collections import deque
+    >>> is_random_access([1, 2]), is_random_access(iter([1, 2]))
+    (True, False)
+    >>> is_random_access(deque([1, 2]))
+    False
+
+    """
+    if isinstance(iterable, memoryview):
+        return iterable.ndim == 1
+    return isinstance(iterable, (list, tuple, range, SequenceView))
+
+
+class SequenceView(Sequence):
+    """
+    Read-only view on the elements of `seq` at the indices of `indices`.
+
+    >>> v = SequenceView([1, 2, 3, 4, 5], range(1, 5))
+    >>> list(v[::2])
+    [2, 4]
+    >>> v[-1]
+    5
+
+    """
+
+    __slots__ = ("_seq", "_indices")
+
+    def __init__(self, seq: Sequence, indices: range):
+        self._seq = seq
+        self._indices = indices
+
+    def __len__(self) -> int:
+        return len(self._indices)
+
+    def __getitem__(self, item: Any) -> Any:
+        if isinstance(item, slice):
+            return SequenceView(self._seq, self._indices[item])
+        return self._seq[self._indices[item]]
+
+    def __iter__(self) -> Iterator:
+        indices = self._indices
+        if indices.step == 1:
+            seq = self._seq
+            if indices.start == 0 and indices.stop == len(seq):
+                return iter(seq)
+            if isinstance(seq, (list, tuple)):
+                # C-speed for contiguous parts of builtin sequences: the
+                # iterators can be positioned in O(1) via pickle support
+                it = iter(seq)
+                it.__setstate__(indices.start)  # type: ignore
+                return islice(it, len(indices))
+        return map(self._seq.__getitem__, indices)
+
+    def __reversed__(self) -> Iterator:
+        return map(self._seq.__getitem__, reversed(self._indices))
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, Sequence):
+            return NotImplemented
+        return len(self) == len(other) and all(map(eq, self, other))
+
+    __hash__ = None  # type: ignore
+
+    def __repr__(self) -> str:
+        return f"SequenceView({self._seq!r}, {self._indices!r})"
+
+
+def view(seq: Sequence, s: slice) -> Sequence:
+    """
+    Slice `seq` without copying elements.
+
+    >>> view(range(10), slice(2, 4))
+    range(2, 4)
+    >>> list(view([1, 2, 3], slice(None, None, -1)))
+    [3, 2, 1]
+
+    """
+    if isinstance(seq, (range, memoryview, SequenceView)):
+        return seq[s]
+    return SequenceView(seq, range(len(seq))[s])
@@ -0,0 +1,429 @@
+# -*- coding=utf-8 -*-
+
+"""
+asyncio counterpart of :mod:`iterage.itr`.
+
+>>> async def source():
+...     for i in range(5):
+...         yield i
+>>> asyncio.run(aitr(source()).map(lambda x: x * 2).where(bool).to_list())
+[2, 4, 6, 8]
+
+"""
+
+import asyncio
+from collections import deque
+from typing import (Any, AsyncIterable, AsyncIterator, Awaitable, Callable,
+                    Dict, Iterable, List, Optional, Set, Tuple, TypeVar, Union)
+
+__all__ = ("aitr", "AsyncItr")
+
+T = TypeVar("T")
+U = TypeVar("U")
+
+_nothing = object()
+_sentinal = object()
+
+
+async def _from_iterable(iterable: Iterable[T]) -> AsyncIterator[T]:
+    for e in iterable:
+        yield e
+
+
+async def _map(fn, aiterable):
+    async for e in aiterable:
+        yield fn(e)
+
+
+async def _star_map(fn, aiterable):
+    async for e in aiterable:
+        yield fn(*e)
+
+
+async def _where(fn, aiterable):
+    if fn is None:
+        fn = bool
+    async for e in aiterable:
+        if fn(e):
+            yield e
+
+
+async def _where_not(fn, aiterable):
+    if fn is None:
+        fn = bool
+    async for e in aiterable:
+        if not fn(e):
+            yield e
+
+
+async def _slice(aiterable, start, stop, step):
+    if stop is not None and start >= stop:
+        return
+
+    i = 0
+    nexti = start
+    async for e in aiterable:
+        if i == nexti:
+            yield e
+            nexti += step
+            if stop is not None and nexti >= stop:
+                return
+        i += 1
+
+
+async def _take_while(pred, aiterable):
+    async for e in aiterable:
+        if not pred(e):
+            return
+        yield e
+
+
+async def _drop_while(pred, aiterable):
+    dropping = True
+    async for e in aiterable:
+        if dropping and pred(e):
+            continue
+        dropping = False
+        yield e
+
+
+async def _flatten(aiterable):
+    async for e in aiterable:
+        for x in e:
+            yield x
+
+
+async def _chunk(aiterable, n):
+    buffer: List = []
+    async for e in aiterable:
+        buffer.append(e)
+        if len(buffer) == n:
+            yield tuple(buffer)
+            buffer = []
+    if buffer:
+        yield tuple(buffer)
+
+
+async def _enumerate(aiterable, start):
+    i = start
+    async for e in aiterable:
+        yield i, e
+        i += 1
+
+
+async def _start(fn, it, pending, limit) -> bool:
+    """Start coroutines until `limit` are pending, False if `it` is exhausted."""
+    while len(pending) < limit:
+        try:
+            e = await it.__anext__()
+        except StopAsyncIteration:
+            return False
+        pending.append(asyncio.ensure_future(fn(e)))
+    return True
+
+
+async def _finished(pending, ordered) -> List[asyncio.Future]:
+    """Wait for the first pending task, or for any task if not `ordered`."""
+    if ordered:
+        # the task stays in `pending` until it is done, so `_amap` cancels
+        # it if the consumer is cancelled while waiting for it
+        await asyncio.wait((pending[0],))
+        return [pending.popleft()]
+    done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+    for task in done:
+        pending.remove(task)
+    return list(done)
+
+
+async def _amap(fn, aiterable, limit, ordered):
+    """Run up to `limit` coroutines of `fn` at once."""
+    it = aiterable.__aiter__()
+    pending: deque = deque()
+    exhausted = False
+    try:
+        while True:
+            if not exhausted:
+                exhausted = not await _start(fn, it, pending, limit)
+            if not pending:
+                return
+            for task in await _finished(pending, ordered):
+                yield task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            # let the cancelled tasks finish before the generator does
+            await asyncio.gather(*pending, return_exceptions=True)
+
+
+def _slice_args(*args) -> Tuple[int, Optional[int], int]:
+    s = slice(*args)
+    start = 0 if s.start is None else s.start
+    step = 1 if s.step is None else s.step
+    for v in (start, s.stop, step):
+        if v is not None and (not isinstance(v, int) or v < 0):
+            raise ValueError(
+                "Indices for slice must be None or an integer: 0 <= x"
+            )
+    if step == 0:
+        raise ValueError("Step for slice must be positive")
+    return start, s.stop, step
+
+
+class AsyncItr(AsyncIterable[T]):
+    """
+    Fluent interface over async iterables, see :class:`iterage.itr.Itr`.
+
+    Adaptors return a new AsyncItr, reductions are coroutines.
+
+    :note: Like Itr, do not reuse a instance of AsyncItr.
+    """
+
+    _aitr: AsyncIterable[T]
+
+    def __init__(self, iterable: Union[AsyncIterable[T], Iterable[T]]):
+        if not isinstance(iterable, AsyncIterable):
+            iterable = _from_iterable(iterable)
+        self._aitr = iterable
+
+    @staticmethod
+    def _new(iterable: AsyncIterable[U]) -> "AsyncItr[U]":
+        return AsyncItr(iterable)
+
+    # generators
+
+    @classmethod
+    def empty(cls) -> "AsyncItr[T]":
+        """
+        Create an empty async iterable.
+
+        >>> asyncio.run(AsyncItr.empty().to_list())
+        []
+
+        """
+        return cls._new(_from_iterable(()))
+
+    # selecting
+
+    def take(self, n: int) -> "AsyncItr[T]":
+        """
+        Pass through only n elements.
+
+        >>> asyncio.run(aitr(range(1000)).take(2).to_list())
+        [0, 1]
+
+        """
+        return self.slice(n)
+
+    def take_while(self, pred: Callable[[T], Any]) -> "AsyncItr[T]":
+        return self._new(_take_while(pred, self._aitr))
+
+    def drop(self, n: int) -> "AsyncItr[T]":
+        """
+        Skip the first ´n´ elements
+
+        >>> asyncio.run(aitr(range(4)).drop(2).to_list())
+        [2, 3]
+
+        """
+        return self.slice(n, None)
+
+    def drop_while(self, pred: Callable[[T], Any]) -> "AsyncItr[T]":
+        return self._new(_drop_while(pred, self._aitr))
+
+    def slice(self, *args) -> "AsyncItr[T]":
+        """
+        Slice elements like `itertools.islice`.
+
+        >>> asyncio.run(aitr(range(10)).slice(1, 8, 3).to_list())
+        [1, 4, 7]
+
+        """
+        return self._new(_slice(self._aitr, *_slice_args(*args)))
+
+    def where(self, fn: Optional[Callable[[T], Any]]) -> "AsyncItr[T]":
+        return self._new(_where(fn, self._aitr))
+
+    def where_not(self, fn: Optional[Callable[[T], Any]]) -> "AsyncItr[T]":
+        return self._new(_where_not(fn, self._aitr))
+
+    def drop_na(self) -> "AsyncItr[T]":
+        return self.where(lambda e: e is not None)
+
+    # mapping
+
+    def map(self, fn: Callable[[T], U]) -> "AsyncItr[U]":
+        return self._new(_map(fn, self._aitr))
+
+    def star_map(self, fn: Callable[..., U]) -> "AsyncItr[U]":
+        return self._new(_star_map(fn, self._aitr))
+
+    def amap(
+            self,
+            fn: Callable[[T], Awaitable[U]],
+            limit: int = 1,
+            ordered: bool = True) -> "AsyncItr[U]":
+        """
+        Map elements with a coroutine function, running up to `limit`
+        coroutines concurrently.
+
+        With `ordered=False` results are passed through as soon as they are
+        ready.
+
+        >>> async def double(x):
+        ...     await asyncio.sleep(0.01 * (3 - x))
+        ...     return x * 2
+        >>> asyncio.run(aitr(range(3)).amap(double, limit=3).to_list())
+        [0, 2, 4]
+        >>> sorted(asyncio.run(aitr(range(3)).amap(double, 3, ordered=False).to_list()))
+        [0, 2, 4]
+
+        """
+        if limit < 1:
+            raise ValueError("limit must be greater than 0")
+        return self._new(_amap(fn, self._aitr, limit, ordered))
+
+    def flat_map(self, fn: Callable[[T], Iterable[U]]) -> "AsyncItr[U]":
+        return self.map(fn).flatten()
+
+    def flatten(self) -> "AsyncItr":
+        return self._new(_flatten(self._aitr))
+
+    def chunk(self, n: int) -> "AsyncItr[Tuple[T, ...]]":
+        """
+        Group elements in tuples of n elements.
+
+        >>> asyncio.run(aitr(range(5)).chunk(2).to_list())
+        [(0, 1), (2, 3), (4,)]
+
+        """
+        if n < 1:
+            raise ValueError("n must be greater than 0")
+        return self._new(_chunk(self._aitr, n))
+
+    def enumerate(self, start: int = 0) -> "AsyncItr[Tuple[int, T]]":
+        return self._new(_enumerate(self._aitr, start))
+
+    # reduce
+
+    async def reduce(self, f: Callable[[T, T], T], *args) -> T:
+        if len(args) > 1:
+            raise TypeError("reduce expected at most 1 initial value")
+
+        result = args[0] if args else _sentinal
+        async for e in self._aitr:
+            result = e if result is _sentinal else f(result, e)  # type: ignore
+        if result is _sentinal:
+            raise TypeError("reduce() of empty iterable with no initial value")
+        return result  # type: ignore
+
+    async def collect(self, cls: Callable[[Iterable[T]], U]) -> U:
+        return cls(await self.to_list())
+
+    async def to_list(self) -> List[T]:
+        return [e async for e in self._aitr]
+
+    async def to_tuple(self) -> Tuple[T, ...]:
+        return tuple(await self.to_list())
+
+    async def to_set(self) -> Set[T]:
+        return {e async for e in self._aitr}
+
+    async def to_dict(self) -> Dict:
+        return {k: v async for k, v in self._aitr}  # type: ignore
+
+    async def consume(self) -> None:
+        async for _ in self._aitr:
+            pass
+
+    async def foreach(self, fn: Callable[[T], None]) -> None:
+        async for e in self._aitr:
+            fn(e)
+
+    async def sum(self) -> T:
+        result: Any = 0
+        async for e in self._aitr:
+            result = result + e
+        return result
+
+    async def all(self) -> bool:
+        async for e in self._aitr:
+            if not e:
+                return False
+        return True
+
+    async def any(self) -> bool:
+        async for e in self._aitr:
+            if e:
+                return True
+        return False
+
+    async def none(self) -> bool:
+        return not await self.any()
+
+    async def _extreme(self, better, key, default) -> T:
+        result: Any = _sentinal
+        result_key: Any = None
+        async for e in self._aitr:
+            k = e if key is None else key(e)
+            if result is _sentinal or better(k, result_key):
+                result, result_key = e, k
+        if result is _sentinal:
+            if default is _nothing:
+                raise ValueError("empty async iterable")
+            return default
+        return result
+
+    async def max(self, key: Optional[Callable] = None, default=_nothing) -> T:
+        """
+        >>> asyncio.run(aitr([2, 4, 3]).max())
+        4
+        """
+        return await self._extreme(lambda a, b: a > b, key, default)
+
+    async def min(self, key: Optional[Callable] = None, default=_nothing) -> T:
+        return await self._extreme(lambda a, b: a < b, key, default)
+
+    async def len(self) -> int:
+        n = 0
+        async for _ in self._aitr:
+            n += 1
+        return n
+
+    async def find_first(self, pred=bool, default=_nothing) -> T:
+        async for e in self._aitr:
+            if pred(e):
+                return e
+        if default is _nothing:
+            raise LookupError("no such element")
+        return default
+
+    async def first(self, default: Optional[U] = None) -> Union[T, U, None]:
+        async for e in self._aitr:
+            return e
+        return default
+
+    async def is_empty(self) -> bool:
+        return await self.first(_sentinal) is _sentinal  # type: ignore
+
+    async def count(self, t: T) -> int:
+        return await self.where(lambda e: e == t).len()
+
+    # integration
+
+    def __aiter__(self) -> AsyncIterator[T]:
+        return self._aitr.__aiter__()
+
+    def __repr__(self):
+        return f"AsyncItr({repr(self._aitr)})"
+
+
+def aitr(iterable: Union[AsyncIterable[T], Iterable[T]]) -> "AsyncItr[T]":
+    """
+    Create AsyncItr class from a async or sync iterable.
+
+    >>> asyncio.run(aitr(range(3)).to_list())
+    [0, 1, 2]
+
+    """
+    return AsyncItr(iterable)
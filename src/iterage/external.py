@@ -0,0 +1,221 @@
+# -*- coding=utf-8 -*-
+
+"""
+Operations for inputs larger than memory.
+
+Elements that do not fit in the memory budget are pickled to anonymous
+temporary files. The budget is given as a number of elements.
+"""
+
+from heapq import merge
+from itertools import chain, groupby, islice
+from operator import itemgetter
+from typing import (Any, Callable, Dict, Iterable, Iterator, List, Optional,
+                    Tuple, TypeVar)
+
+from iterage._spill import SpillFile
+
+__all__ = ("external_group_by", "external_sort")
+
+T = TypeVar("T")
+U = TypeVar("U")
+
+# after this many re-partitionings a partition is grouped in memory, even
+# if it exceeds the budget (e.g. a single key with too many elements)
+_MAX_DEPTH = 4
+
+# maximum number of elements per pickled batch in a sorted run
+_BATCH = 1024
+
+# maximum number of runs merged at once, more runs are merged in several
+# passes
+_MAX_FAN_IN = 64
+
+
+def _group(pairs: Iterable[Tuple[U, T]]) -> Dict[U, List[T]]:
+    result: Dict[U, List[T]] = {}
+    for k, item in pairs:
+        if k in result:
+            result[k].append(item)
+        else:
+            result[k] = [item]
+    return result
+
+
+def _partition(
+    pairs: Iterable[Tuple[U, T]],
+    max_in_memory: int,
+    partitions: int,
+    depth: int,
+    dir: Optional[str],
+) -> Iterator[Tuple[U, List[T]]]:
+    files = [SpillFile(dir) for _ in range(partitions)]
+    try:
+        buffers: List[list] = [[] for _ in range(partitions)]
+        buffered = 0
+        for pair in pairs:
+            buffers[hash((depth, pair[0])) % partitions].append(pair)
+            buffered += 1
+            if buffered >= max_in_memory:
+                for f, buffer in zip(files, buffers):
+                    f.write(buffer)
+                    buffer.clear()
+                buffered = 0
+        for f, buffer in zip(files, buffers):
+            f.write(buffer)
+        del buffers
+
+        for f in files:
+            if f.count > max_in_memory and depth < _MAX_DEPTH:
+                yield from _partition(
+                    f, max_in_memory, partitions, depth + 1, dir
+                )
+            else:
+                yield from _group(f).items()
+            f.close()
+    finally:
+        for f in files:
+            f.close()
+
+
+def external_group_by(
+    iterable: Iterable[T],
+    key: Callable[[T], U],
+    max_in_memory: int,
+    partitions: int = 16,
+    dir: Optional[str] = None,
+) -> Iterator[Tuple[U, List[T]]]:
+    """
+    Group elements by `key` holding about `max_in_memory` elements in memory.
+
+    As long as the budget is not exceeded, groups are collected in memory
+    and yielded in order of the first occurrence of their key. Otherwise all
+    elements are hash-partitioned by key into `partitions` temporary files
+    in `dir` and the groups of one partition after the other are yielded.
+    Partitions that still exceed the budget are partitioned again. Elements
+    and keys must be picklable and keys hashable.
+
+    >>> sorted(external_group_by(range(10), lambda x: x % 3, max_in_memory=4))
+    [(0, [0, 3, 6, 9]), (1, [1, 4, 7]), (2, [2, 5, 8])]
+
+    """
+    if max_in_memory < 1:
+        raise ValueError("max_in_memory must be greater than 0")
+    if partitions < 2:
+        raise ValueError("partitions must be greater than 1")
+    return _external_group_by(iterable, key, max_in_memory, partitions, dir)
+
+
+def _external_group_by(iterable, key, max_in_memory, partitions, dir):
+    it = iter(iterable)
+    pairs = []
+    for item in it:
+        pairs.append((key(item), item))
+        if len(pairs) > max_in_memory:
+            break
+    else:
+        yield from _group(pairs).items()
+        return
+
+    def spilled():
+        yield from pairs
+        pairs.clear()
+        for item in it:
+            yield key(item), item
+
+    yield from _partition(spilled(), max_in_memory, partitions, 0, dir)
+
+
+def _uniq(iterable: Iterable[T], key: Optional[Callable]) -> Iterator[T]:
+    return map(next, map(itemgetter(1), groupby(iterable, key)))
+
+
+def _merge_shape(max_in_memory: int) -> Tuple[int, int]:
+    """
+    Fan-in and batch size of a merge holding about `max_in_memory` elements.
+
+    A merge reads one batch of each of its runs, the fan-in and the batch
+    size are balanced so that their product stays within the budget.
+
+    >>> _merge_shape(100)
+    (10, 10)
+    >>> _merge_shape(1_000_000)
+    (64, 1024)
+
+    """
+    fan_in = max(2, min(_MAX_FAN_IN, int(max_in_memory ** 0.5)))
+    return fan_in, max(1, min(_BATCH, max_in_memory // fan_in))
+
+
+def _spill(iterable: Iterable[T], dir: Optional[str], size: int) -> SpillFile:
+    f = SpillFile(dir)
+    it = iter(iterable)
+    for batch in iter(lambda: list(islice(it, size)), []):
+        f.write(batch)
+    return f
+
+
+def external_sort(
+    iterable: Iterable[T],
+    key: Optional[Callable[[T], Any]] = None,
+    max_in_memory: int = 1_000_000,
+    unique: bool = False,
+    dir: Optional[str] = None,
+) -> Iterator[T]:
+    """
+    Stable sort holding about `max_in_memory` elements in memory.
+
+    Inputs larger than the budget are cut into sorted runs of
+    `max_in_memory` elements that are pickled to temporary files in `dir`
+    and merged lazily. With `unique=True` only the first of equal elements
+    is passed through, duplicates are already dropped in the runs.
+
+    >>> list(external_sort([5, 1, 4, 1, 3], max_in_memory=2))
+    [1, 1, 3, 4, 5]
+    >>> list(external_sort("bAaB", key=str.lower, max_in_memory=2, unique=True))
+    ['A', 'b']
+
+    """
+    if max_in_memory < 1:
+        raise ValueError("max_in_memory must be greater than 0")
+    return _external_sort(iterable, key, max_in_memory, unique, dir)
+
+
+def _external_sort(iterable, key, max_in_memory, unique, dir):
+    def sorted_run(items):
+        items.sort(key=key)
+        return _uniq(items, key) if unique else items
+
+    def merged(sources):
+        result = merge(*sources, key=key)
+        return _uniq(result, key) if unique else result
+
+    it = iter(iterable)
+    items = list(islice(it, max_in_memory + 1))
+    if len(items) <= max_in_memory:
+        yield from sorted_run(items)
+        return
+
+    fan_in, size = _merge_shape(max_in_memory)
+    it = chain([items.pop()], it)
+    runs: List[SpillFile] = []
+    try:
+        while items:
+            runs.append(_spill(sorted_run(items), dir, size))
+            items.clear()
+            items = list(islice(it, max_in_memory))
+
+        while len(runs) > fan_in:
+            groups = [
+                runs[i : i + fan_in] for i in range(0, len(runs), fan_in)
+            ]
+            runs = []
+            for group in groups:
+                runs.append(_spill(merged(group), dir, size))
+                for f in group:
+                    f.close()
+
+        yield from merged(runs)
+    finally:
+        for f in runs:
+            f.close()
@@ -0,0 +1,184 @@
+# -*- coding=utf-8 -*-
+
+"""
+Memory-mapped file sources.
+
+Files are mapped with :mod:`mmap` and split at delimiters with `find` on the
+mapping, so no Python-level read per line is needed. Lines and records are
+either decoded strings or `memoryview` slices of the mapping.
+
+A file can be processed in parallel by giving each worker one of the byte
+ranges of :func:`split_file`. Every line belongs to the range its first byte
+is in, so the ranges do not need to be aligned to line boundaries.
+
+>>> import os, tempfile
+>>> with tempfile.NamedTemporaryFile(delete=False) as f:
+...     _ = f.write(b"one\\ntwo\\nthree\\n")
+>>> list(read_lines(f.name))
+['one', 'two', 'three']
+>>> [list(read_lines(f.name, start=a, stop=b)) for a, b in split_file(f.name, 2)]
+[['one', 'two'], ['three']]
+>>> os.remove(f.name)
+
+"""
+
+import mmap
+import os
+from itertools import chain
+from typing import Iterator, List, Optional, Tuple, Union
+
+__all__ = ("read_lines", "read_records", "split_file")
+
+PathLike = Union[str, bytes, os.PathLike]
+
+# bytes decoded and split at once in `read_lines`
+_WINDOW = 1 << 20
+
+
+def _map(path: PathLike) -> Optional[mmap.mmap]:
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return None  # empty files can not be mapped
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _close(mm: mmap.mmap) -> None:
+    try:
+        mm.close()
+    except BufferError:
+        # memoryviews handed out are still alive, they keep the mapping
+        pass
+
+
+def _check_range(start: int, stop: Optional[int]) -> None:
+    if start < 0 or (stop is not None and stop < start):
+        raise ValueError("range must be 0 <= start <= stop")
+
+
+def _first_line(mm: mmap.mmap, delimiter: bytes, start: int) -> int:
+    # offset of the first line starting at or after `start`
+    if start == 0:
+        return 0
+    i = mm.find(delimiter, max(start - len(delimiter), 0))
+    return len(mm) if i == -1 else i + len(delimiter)
+
+
+def read_lines(
+    path: PathLike,
+    delimiter: bytes = b"\n",
+    encoding: Optional[str] = "utf-8",
+    start: int = 0,
+    stop: Optional[int] = None,
+) -> Iterator[Union[str, memoryview]]:
+    """
+    Iterate over the lines of a file, without delimiters.
+
+    Lines are decoded with `encoding`, or with `encoding=None` passed through
+    as `memoryview` slices of the mapping. With `start` and `stop` only lines
+    beginning in this byte range are read.
+    """
+    if not delimiter:
+        raise ValueError("delimiter must not be empty")
+    _check_range(start, stop)
+    if encoding is None:
+        return _read_line_views(path, delimiter, start, stop)
+    return chain.from_iterable(
+        _read_lines(path, delimiter, encoding, start, stop))
+
+
+def _read_lines(path, delimiter, encoding, start, stop):
+    # yields lists of lines, so the lines are passed through at C speed
+    mm = _map(path)
+    if mm is None:
+        return
+    try:
+        size = len(mm)
+        end = size if stop is None else min(stop, size)
+        pos = _first_line(mm, delimiter, start)
+        n = len(delimiter)
+        text_delimiter = delimiter.decode(encoding)
+        while pos < end:
+            # decode and split a window of whole lines at once, extended to
+            # the end of the last line that begins in it
+            i = mm.find(delimiter, max(min(pos + _WINDOW, end) - n, pos))
+            window = mm[pos : size if i == -1 else i]
+            yield window.decode(encoding).split(text_delimiter)
+            if i == -1:
+                return
+            pos = i + n
+    finally:
+        _close(mm)
+
+
+def _read_line_views(path, delimiter, start, stop):
+    mm = _map(path)
+    if mm is None:
+        return
+    try:
+        end = len(mm) if stop is None else min(stop, len(mm))
+        pos = _first_line(mm, delimiter, start)
+        n = len(delimiter)
+        find = mm.find
+        with memoryview(mm) as mv:
+            while pos < end:
+                i = find(delimiter, pos)
+                if i == -1:
+                    yield mv[pos:]
+                    return
+                yield mv[pos:i]
+                pos = i + n
+    finally:
+        _close(mm)
+
+
+def read_records(
+    path: PathLike,
+    record_size: int,
+    start: int = 0,
+    stop: Optional[int] = None,
+) -> Iterator[memoryview]:
+    """
+    Iterate over fixed-size records of a file as `memoryview` slices.
+
+    A last incomplete record is passed through as it is. With `start` and
+    `stop` only records beginning in this byte range are read.
+    """
+    if record_size < 1:
+        raise ValueError("record_size must be greater than 0")
+    _check_range(start, stop)
+    return _read_records(path, record_size, start, stop)
+
+
+def _read_records(path, record_size, start, stop):
+    mm = _map(path)
+    if mm is None:
+        return
+    try:
+        size = len(mm)
+        end = size if stop is None else min(stop, size)
+        first = -(-start // record_size) * record_size
+        with memoryview(mm) as mv:
+            for pos in range(first, end, record_size):
+                yield mv[pos : pos + record_size]
+    finally:
+        _close(mm)
+
+
+def split_file(
+    path: PathLike, parts: int, record_size: int = 1
+) -> List[Tuple[int, int]]:
+    """
+    Split a file in up to `parts` byte ranges of about the same size.
+
+    Range bounds are multiples of `record_size`. The ranges can be passed as
+    `start` and `stop` to :func:`read_lines` and :func:`read_records`.
+    """
+    if parts < 1:
+        raise ValueError("parts must be greater than 0")
+    if record_size < 1:
+        raise ValueError("record_size must be greater than 0")
+
+    records = -(-os.path.getsize(path) // record_size)
+    bounds = sorted({records * i // parts * record_size
+                     for i in range(parts + 1)})
+    return list(zip(bounds, bounds[1:]))
@@ -1,8 +1,51 @@
 # -*- coding=utf-8 -*-
+"""
+Expression functions: build small functions from operator expressions.
+
+>>> list(map(λ(_ * 2 + 1), [1, 2, 3]))
+[3, 5, 7]
+
+A expression records a tree of operations. `λ` compiles the tree lazily into
+a single flat function (generated Python code), so evaluating it costs one
+function call. Simple expressions are lowered to `operator` functions:
+
+>>> λ(_.real)
+operator.attrgetter('real')
+>>> λ(_1 * _2)
+<built-in function mul>
+
+"""
+import keyword
 import operator
-from collections import Callable
-from functools import reduce
-from typing import Any
+from functools import lru_cache, reduce
+from typing import Any, Callable, List, Optional, Tuple
+
+# expression tree nodes, tuples:
+#  ("arg", index)
+#  ("const", value)
+#  ("func", callable)           -> callable(*args)
+#  ("op", symbol, left, right)  -> left <symbol> right
+#  ("attr", node, name)         -> node.name
+#  ("item", node, key)          -> node[key]
+#  ("call", node, arg_nodes)    -> node evaluated with arg_nodes as arguments
+#  ("in", item, container)      -> item in container
+Node = Tuple
+
+_OPERATORS = {
+    "+": operator.add,
+    "-": operator.sub,
+    "*": operator.mul,
+    "/": operator.truediv,
+    "//": operator.floordiv,
+    "%": operator.mod,
+    "^": operator.xor,
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
 
 
 def const(c):
@@ -12,251 +55,332 @@ def const(c):
     return fn
 
 
-class ExprFn:
-    __slots__ = ("_exprfn_",)
+def _node(value: Any) -> Node:
+    if isinstance(value, ExprFn):
+        return value._expr_
+    return ("const", value)
 
-    _exprfn_: Callable
 
-    def __init__(self, fn: Callable):
-        self._exprfn_ = fn
+def _is_name(name: Any) -> bool:
+    return isinstance(name, str) and name.isidentifier() and not keyword.iskeyword(name)
 
-    @classmethod
-    def _binop_helper(cls, a, b, op):
-        if isinstance(a, ExprFn) and isinstance(b, ExprFn):
-            fn = a._exprfn_
-            ofn = b._exprfn_
 
-            def result_fn(*args):
-                return op(fn(*args), ofn(*args))
+class _Source:
+    """Python source of expression trees, one method per node kind."""
 
-        elif isinstance(a, ExprFn):
-            fn = a._exprfn_
+    def __init__(self, names: List[str], call_args: str):
+        self.names = names
+        self.call_args = call_args
+        self.consts: List[Any] = []
 
-            def result_fn(*args):
-                return op(fn(*args), b)
+    def __call__(self, node: Node) -> str:
+        method = getattr(self, f"_{node[0]}", None)
+        if method is None:
+            raise ValueError(f"unknown expression node {node[0]!r}")
+        return method(node)
 
-        elif isinstance(b, ExprFn):
-            fn = b._exprfn_
+    def const_name(self, value: Any) -> str:
+        self.consts.append(value)
+        return f"c{len(self.consts) - 1}"
 
-            def result_fn(*args):
-                return op(a, fn(*args))
+    def _arg(self, node: Node) -> str:
+        return self.names[node[1]]
 
-        else:
-            assert False
+    def _const(self, node: Node) -> str:
+        return self.const_name(node[1])
 
-        return cls(result_fn)
+    def _func(self, node: Node) -> str:
+        return f"{self.const_name(node[1])}({self.call_args})"
 
-    def __call__(self, *args) -> "ExprFn":
-        argfns = [
-            arg._exprfn_ if isinstance(arg, ExprFn) else const(arg) for arg in args
-        ]
+    def _op(self, node: Node) -> str:
+        return f"({self(node[2])} {node[1]} {self(node[3])})"
 
-        fn = self._exprfn_
+    def _attr(self, node: Node) -> str:
+        if _is_name(node[2]):
+            return f"{self(node[1])}.{node[2]}"
+        return f"getattr({self(node[1])}, {self.const_name(node[2])})"
 
-        def result_fn(*aargs):
-            return fn(*[argfn(*aargs) for argfn in argfns])
+    def _item(self, node: Node) -> str:
+        return f"{self(node[1])}[{self.const_name(node[2])}]"
 
-        return ExprFn(result_fn)
+    def _call(self, node: Node) -> str:
+        inner = compile_expr(node[1], len(node[2]))
+        args = ", ".join(self(arg) for arg in node[2])
+        return f"{self.const_name(inner)}({args})"
 
-    # TODO: def __eq__(self, other) -> "ExprFn":
-    # TODO:    return self._binop_helper(self, other, operator.eq)
+    def _in(self, node: Node) -> str:
+        return f"({self(node[1])} in {self(node[2])})"
 
-    def __add__(self, other) -> "ExprFn":
-        return self._binop_helper(self, other, operator.add)
 
-    def __radd__(self, other) -> "ExprFn":
-        return self._binop_helper(other, self, operator.add)
+def _children(node: Node) -> Tuple:
+    kind = node[0]
+    if kind == "op":
+        return node[2:]
+    if kind in ("attr", "item"):
+        return node[1:2]
+    if kind == "call":
+        return (node[1], *node[2])
+    if kind == "in":
+        return node[1:]
+    return ()
 
-    def __sub__(self, other) -> "ExprFn":
-        return self._binop_helper(self, other, operator.sub)
 
-    def __rsub__(self, other) -> "ExprFn":
-        return self._binop_helper(other, self, operator.sub)
-
-    def __mul__(self, other) -> "ExprFn":
-        return self._binop_helper(self, other, operator.mul)
+def _max_arg(node: Node) -> int:
+    if node[0] == "arg":
+        return node[1]
+    if node[0] == "call":
+        # the called expression has its own arguments
+        children = node[2]
+    else:
+        children = _children(node)
+    return max([-1] + [_max_arg(child) for child in children])
+
+
+def _operators_only(node: Node) -> bool:
+    """Whether the expression calls no functions, only operators."""
+    if node[0] in ("func", "call"):
+        return False
+    return all(_operators_only(child) for child in _children(node))
+
+
+@lru_cache(maxsize=1024)
+def _factory(source: str, params: Tuple[str, ...], nconsts: int) -> Callable:
+    # constants become closure cells of the generated function
+    consts = ", ".join(f"c{i}" for i in range(nconsts))
+    code = (
+        f"def __make({consts}):\n"
+        f"    def __expr({', '.join(params)}):\n"
+        f"        return {source}\n"
+        f"    return __expr\n"
+    )
+    namespace: dict = {}
+    exec(code, namespace)  # noqa: S102
+    return namespace["__make"]
+
+
+def _attr_path(node: Node) -> Optional[str]:
+    # "a.b.c" for a attribute chain on the first argument
+    names = []
+    while node[0] == "attr" and _is_name(node[2]):
+        names.append(node[2])
+        node = node[1]
+    if node != ("arg", 0) or not names:
+        return None
+    return ".".join(reversed(names))
+
+
+def _lower(node: Node, arity: Optional[int]) -> Optional[Callable]:
+    """Builtin function equivalent to the expression, if there is one."""
+    kind = node[0]
+    if kind == "func":
+        return node[1]
+    if arity == 1:
+        path = _attr_path(node)
+        if path is not None:
+            return operator.attrgetter(path)
+        if kind == "item" and node[1] == ("arg", 0):
+            return operator.itemgetter(node[2])
+    if arity == 2 and kind == "op" and node[2:] == (("arg", 0), ("arg", 1)):
+        return _OPERATORS[node[1]]
+    return None
+
+
+def compile_expr(node: Node, arity: Optional[int]) -> Callable:
+    """
+    Compile a expression tree to a function with `arity` arguments
+    (`None` for variadic).
+    """
+    lowered = _lower(node, arity)
+    if lowered is not None:
+        return lowered
+
+    if arity is None:
+        params: Tuple[str, ...] = ("*args",)
+        names = [f"args[{i}]" for i in range(_max_arg(node) + 1)]
+    else:
+        params = tuple(f"a{i}" for i in range(arity))
+        names = list(params)
 
-    def __rmul__(self, other) -> "ExprFn":
-        return self._binop_helper(other, self, operator.mul)
+    source = _Source(names, ", ".join(params))
+    code = source(node)
+    return _factory(code, params, len(source.consts))(*source.consts)
 
-    def __truediv__(self, other) -> "ExprFn":
-        return self._binop_helper(self, other, operator.truediv)
 
-    def __rtruediv__(self, other) -> "ExprFn":
-        return self._binop_helper(other, self, operator.truediv)
+class ExprFn:
+    __slots__ = ("_expr_", "_compiled_")
 
-    def __floordiv__(self, other) -> "ExprFn":
-        return self._binop_helper(self, other, operator.floordiv)
+    _expr_: Node
+    _compiled_: Callable
 
-    def __rfloordiv__(self, other) -> "ExprFn":
-        return self._binop_helper(other, self, operator.floordiv)
+    #: number of arguments of the compiled function, `None` for variadic
+    _arity_: Optional[int] = None
 
-    def __divmod__(self, other) -> "ExprFn":
-        return self._binop_helper(self, other, operator.mod)
+    def __init__(self, fn: Callable):
+        self._expr_ = ("func", fn)
 
-    def __rdivmod__(self, other) -> "ExprFn":
-        return self._binop_helper(other, self, operator.mod)
+    @classmethod
+    def _from_node(cls, node: Node) -> "ExprFn":
+        result = cls.__new__(cls)
+        result._expr_ = node
+        return result
+
+    @property
+    def _exprfn_(self) -> Callable:
+        """The compiled function, compiled on first access."""
+        try:
+            return self._compiled_
+        except AttributeError:
+            pass
+        fn = compile_expr(self._expr_, self._arity_)
+        if _operators_only(self._expr_):
+            # mark as elementwise expression, see `is_expr_function`; with
+            # "func" nodes `fn` may be the callable of the user
+            try:
+                setattr(fn, "__exprfn__", self)
+            except AttributeError:
+                pass  # builtins like operator.mul
+        self._compiled_ = fn
+        return fn
 
-    def __xor__(self, other) -> "ExprFn":
-        return self._binop_helper(self, other, operator.xor)
+    @classmethod
+    def _binop_helper(cls, a, b, op):
+        return cls._from_node(("op", op, _node(a), _node(b)))
 
-    def __rxor__(self, other) -> "ExprFn":
-        return self._binop_helper(other, self, operator.xor)
+    def __call__(self, *args) -> "ExprFn":
+        return self._from_node(("call", self._expr_, [_node(a) for a in args]))
 
-    def __getattr__(self, item: str) -> "ExprFn":
-        if item.startswith("_"):
-            raise AttributeError()
+    def __eq__(self, other) -> "ExprFn":  # type: ignore
+        return self._binop_helper(self, other, "==")
 
-        fn = self._exprfn_
+    def __ne__(self, other) -> "ExprFn":  # type: ignore
+        return self._binop_helper(self, other, "!=")
 
-        def result_fn(*args):
-            return getattr(fn(*args), item)
+    __hash__ = object.__hash__
 
-        return self.__class__(result_fn)
+    def __lt__(self, other) -> "ExprFn":
+        return self._binop_helper(self, other, "<")
 
-    def __getitem__(self, item: Any) -> "ExprFn":
-        fn = self._exprfn_
+    def __le__(self, other) -> "ExprFn":
+        return self._binop_helper(self, other, "<=")
 
-        def result_fn(*args):
-            return fn(*args)[item]
+    def __gt__(self, other) -> "ExprFn":
+        return self._binop_helper(self, other, ">")
 
-        return self.__class__(result_fn)
+    def __ge__(self, other) -> "ExprFn":
+        return self._binop_helper(self, other, ">=")
 
-    # __contains__ not possible -> must always return a bool
-
-
-class ExprFn1(ExprFn):
-    def __getattr__(self, item: str) -> "ExprFn":
-        if item.startswith("_"):
-            raise AttributeError()
+    def __add__(self, other) -> "ExprFn":
+        return self._binop_helper(self, other, "+")
 
-        if self is _:
-            return self.__class__(operator.attrgetter(item))
+    def __radd__(self, other) -> "ExprFn":
+        return self._binop_helper(other, self, "+")
 
-        fn = self._exprfn_
+    def __sub__(self, other) -> "ExprFn":
+        return self._binop_helper(self, other, "-")
 
-        def result_fn(a):
-            return getattr(fn(a), item)
+    def __rsub__(self, other) -> "ExprFn":
+        return self._binop_helper(other, self, "-")
 
-        return self.__class__(result_fn)
+    def __mul__(self, other) -> "ExprFn":
+        return self._binop_helper(self, other, "*")
 
-    def __getitem__(self, item: Any) -> "ExprFn":
-        fn = self._exprfn_
+    def __rmul__(self, other) -> "ExprFn":
+        return self._binop_helper(other, self, "*")
 
-        def result_fn(a):
-            return fn(a)[item]
+    def __truediv__(self, other) -> "ExprFn":
+        return self._binop_helper(self, other, "/")
 
-        return self.__class__(result_fn)
+    def __rtruediv__(self, other) -> "ExprFn":
+        return self._binop_helper(other, self, "/")
 
-    @classmethod
-    def _binop_helper(cls, a, b, op):
-        if isinstance(a, ExprFn) and isinstance(b, ExprFn):
-            fn = a._exprfn_
-            ofn = b._exprfn_
+    def __floordiv__(self, other) -> "ExprFn":
+        return self._binop_helper(self, other, "//")
 
-            if a is _ and b is _:
+    def __rfloordiv__(self, other) -> "ExprFn":
+        return self._binop_helper(other, self, "//")
 
-                def result_fn(x):
-                    return op(x, x)
+    def __mod__(self, other) -> "ExprFn":
+        return self._binop_helper(self, other, "%")
 
-            else:
+    def __rmod__(self, other) -> "ExprFn":
+        return self._binop_helper(other, self, "%")
 
-                def result_fn(x):
-                    return op(fn(x), ofn(x))
+    def __divmod__(self, other) -> "ExprFn":
+        return self._binop_helper(self, other, "%")
 
-        elif isinstance(a, ExprFn):
-            fn = a._exprfn_
+    def __rdivmod__(self, other) -> "ExprFn":
+        return self._binop_helper(other, self, "%")
 
-            if a is _:
-                # TODO: partial?
-                def result_fn(x):
-                    return op(x, b)
+    def __xor__(self, other) -> "ExprFn":
+        return self._binop_helper(self, other, "^")
 
-            else:
+    def __rxor__(self, other) -> "ExprFn":
+        return self._binop_helper(other, self, "^")
 
-                def result_fn(x):
-                    return op(fn(x), b)
+    def __getattr__(self, item: str) -> "ExprFn":
+        if item.startswith("_"):
+            raise AttributeError()
 
-        elif isinstance(b, ExprFn):
-            fn = b._exprfn_
+        return self._from_node(("attr", self._expr_, item))
 
-            if b is _:
-                # TODO: partial?
-                def result_fn(x):
-                    return op(a, x)
+    def __getitem__(self, item: Any) -> "ExprFn":
+        return self._from_node(("item", self._expr_, item))
 
-            else:
+    # __contains__ not possible -> must always return a bool
 
-                def result_fn(x):
-                    return op(a, fn(x))
 
-        else:
-            assert False
+class ExprFn1(ExprFn):
+    __slots__ = ()
 
-        return cls(result_fn)
+    _arity_ = 1
 
 
 class ExprFn2(ExprFn):
-    @classmethod
-    def _binop_helper(cls, a, b, op) -> "ExprFn2":
-        if a is _1 and b is _2:
-            return cls(op)
+    __slots__ = ()
 
-        return super()._binop_helper(a, b, op)
+    _arity_ = 2
 
 
 def isin(item, container):
     cls = None
 
-    if hasattr(item, "_exprfn_"):
-        itemfn = item._exprfn_
+    if isinstance(item, ExprFn):
         cls = item.__class__
-    else:
-        itemfn = const(item)
-
-    if hasattr(container, "_exprfn_"):
-        containerfn = container._exprfn_
 
-        if cls is not None:
+    if isinstance(container, ExprFn):
+        if cls is not None and cls is not container.__class__:
             raise ValueError(
                 f"Missmatching expr classes: "
                 f"{cls.__name__} != {container.__class__.__name__}"
             )
 
         cls = container.__class__
-    else:
-        containerfn = const(item)
 
     if cls is None:
         raise ValueError("No expr object as item or container")
 
-    def result_fn(*args):
-        return itemfn(*args) in containerfn(*args)
-
-    return cls(result_fn)
+    return cls._from_node(("in", _node(item), _node(container)))
 
 
 def λ(fn: ExprFn) -> Callable:
     return fn._exprfn_
 
 
-def fn(fn: ExprFn) -> Callable:
-    return fn._exprfn_
-
+fn = λ
 
-@ExprFn1
-def _(_):
-    return _
 
+def is_expr_function(f: Callable) -> bool:
+    """
+    Returns True if f was created with `λ` and is build only from operators.
 
-@ExprFn2
-def _1(_1, _2):
-    return _1
+    Such functions can be applied on whole NumPy arrays.
+    """
+    return getattr(f, "__exprfn__", None) is not None
 
 
-@ExprFn2
-def _2(_1, _2):
-    return _2
+_ = ExprFn1._from_node(("arg", 0))
+_1 = ExprFn2._from_node(("arg", 0))
+_2 = ExprFn2._from_node(("arg", 1))
 
 
 def test_args():
@@ -3,14 +3,16 @@
 # Adaptors
 # - adapt a iterable
 from collections import deque
-from collections.abc import Sequence
+import collections.abc
 from itertools import islice, cycle as icycle, groupby, zip_longest
 from operator import itemgetter
 
 from typing import Generator, Iterable, Iterator, TypeVar, Any, Callable, \
-    Optional
+    Optional, Sequence, Set
 
+from iterage._bloom import BloomFilter
 from iterage._types import OrderedT
+from iterage._views import SequenceView, view
 
 T = TypeVar("T")
 U = TypeVar("U")
@@ -72,14 +74,83 @@ def uniq(iterable: Iterable[T], key: Optional[Callable[[T], U]] = None) -> Itera
         return map(next, map(itemgetter(1), groupby(iterable, key)))
 
 
-def dedup(iterable: Iterable[T], key: Optional[Callable[[T], OrderedT]] = None) -> Iterator[T]:
+def _dedup_hash(iterable: Iterable[T], key: Optional[Callable[[T], Any]]) -> Iterator[T]:
+    seen: Set[Any] = set()
+    add = seen.add
+    if key is None:
+        for e in iterable:
+            if e not in seen:
+                add(e)
+                yield e
+    else:
+        for e in iterable:
+            k = key(e)
+            if k not in seen:
+                add(k)
+                yield e
+
+
+def _dedup_bloom(
+    iterable: Iterable[T],
+    key: Optional[Callable[[T], Any]],
+    capacity: int,
+    error_rate: float,
+) -> Iterator[T]:
+    add = BloomFilter(capacity, error_rate).add
+    if key is None:
+        return filter(add, iterable)
+    else:
+        return (e for e in iterable if add(key(e)))
+
+
+def dedup(
+    iterable: Iterable[T],
+    key: Optional[Callable[[T], OrderedT]] = None,
+    max_in_memory: Optional[int] = None,
+    mode: str = "sort",
+    capacity: int = 1_000_000,
+    error_rate: float = 0.001,
+) -> Iterator[T]:
     """
     List unique elements.
 
+    Modes:
+
+    - ``"sort"``: sorted output, needs orderable keys. With `max_in_memory`
+      an external sort is used, that drops duplicates while merging.
+    - ``"hash"``: streaming in input order, remembers every key in a set.
+    - ``"bloom"``: streaming in input order in bounded memory, remembers
+      keys in a Bloom filter. With up to `capacity` unique keys, about
+      `error_rate` of the unique elements are dropped by mistake.
+
+    `max_in_memory` is only supported by ``"sort"``, ValueError is raised
+    for the other modes.
+
     >>> tuple(dedup([5, 4, 3, 5, 3, 3]))
     (3, 4, 5)
+    >>> tuple(dedup([5, 4, 3, 5, 3, 3], max_in_memory=2))
+    (3, 4, 5)
+    >>> tuple(dedup([5, 4, 3, 5, 3, 3], mode="hash"))
+    (5, 4, 3)
+    >>> tuple(dedup([5, 4, 3, 5, 3, 3], mode="bloom", capacity=100))
+    (5, 4, 3)
 
+    @see iterage.external.external_sort
     """
+    if mode not in ("sort", "hash", "bloom"):
+        raise ValueError(f"unknown mode {mode!r}, use sort, hash or bloom")
+    if max_in_memory is not None and mode != "sort":
+        raise ValueError(f"mode {mode!r} does not support max_in_memory")
+
+    if mode == "hash":
+        return _dedup_hash(iterable, key)
+    elif mode == "bloom":
+        return _dedup_bloom(iterable, key, capacity, error_rate)
+
+    if max_in_memory is not None:
+        from iterage.external import external_sort
+
+        return external_sort(iterable, key, max_in_memory, unique=True)
     return uniq(sorted(iterable, key=key), key)
 
 
@@ -92,28 +163,64 @@ def visit(iterable: Iterable[T], func: Callable[[T], Any]) -> Iterator[T]:
         yield e
 
 
-def chunk(iterable: Iterable[T], n: int) -> Iterator[Iterable[T]]:
+_NATIVE_FORMATS = frozenset("cbB?hHiIlLqQnNefdP")
+
+
+def _buffer(obj: Any) -> Optional[memoryview]:
+    # one-dimensional memoryview on objects supporting the buffer protocol
+    if isinstance(obj, (str, list, tuple, range, SequenceView)):
+        return None
+    try:
+        mv = memoryview(obj)
+    except TypeError:
+        return None
+    # memoryviews can only index native single-value formats
+    if mv.ndim != 1 or mv.format.lstrip("@") not in _NATIVE_FORMATS:
+        return None
+    return mv
+
+
+def chunk(iterable: Iterable[T], n: int) -> Iterator[Sequence[T]]:
     """
     Group data in fixed-length chunks.
 
-    >>> tuple(chunk([1, 2, 3, 4, 5], 2))
-    ([1, 2], [3, 4], [5])
+    Chunks do not copy elements, if possible: sources supporting the buffer
+    protocol (`bytes`, `bytearray`, `mmap`, `array.array`, NumPy arrays) are
+    cut into `memoryview` slices, lists and tuples into index-range views
+    (:class:`iterage._views.SequenceView`). While views exist, a
+    `bytearray` can not be resized and a `mmap` can not be closed.
+
+    >>> [bytes(c) for c in chunk(b"abcde", 2)]
+    [b'ab', b'cd', b'e']
+    >>> [list(c) for c in chunk([1, 2, 3, 4, 5], 2)]
+    [[1, 2], [3, 4], [5]]
     >>> tuple(chunk((x for x in range(1, 6)), 2))
     ((1, 2), (3, 4), (5,))
 
     """
-    if isinstance(iterable, Sequence):
-        for i in range(0, len(iterable), n):
-            yield iterable[i : i + n]
-    else:
-        _islice = islice
-        _tuple = tuple
-
-        it = iter(iterable)
+    mv = _buffer(iterable)
+    if mv is not None:
+        # memoryviews are sequences of the elements of iterable
+        return (mv[i : i + n] for i in range(0, len(mv), n))  # type: ignore
+    if isinstance(iterable, (list, tuple, SequenceView)):
+        return (
+            view(iterable, slice(i, i + n))
+            for i in range(0, len(iterable), n)
+        )
+    if isinstance(iterable, collections.abc.Sequence):
+        return (iterable[i : i + n] for i in range(0, len(iterable), n))
+    return _chunk_iter(iterable, n)
+
+
+def _chunk_iter(iterable: Iterable[T], n: int) -> Iterator[Sequence[T]]:
+    _islice = islice
+    _tuple = tuple
+
+    it = iter(iterable)
+    item = _tuple(_islice(it, n))
+    while item:
+        yield item
         item = _tuple(_islice(it, n))
-        while item:
-            yield item
-            item = _tuple(_islice(it, n))
 
 
 def chunk_filled(
@@ -1,21 +1,33 @@
 # -*- coding=utf-8 -*-
 
+import array
 import collections
 import collections.abc
+import sys
 from collections import deque
 from functools import reduce
+from operator import ge, le
 from itertools import *
-from typing import (Any, Callable, Counter, Dict, Iterable, Iterator, List,
-                    NewType, Optional, Sequence, Tuple, TypeVar,
-                    Union)
+from typing import (TYPE_CHECKING, Any, Callable, Counter, Dict, Iterable,
+                    Iterator, List, NewType, Optional, Sequence, Tuple,
+                    TypeVar, Union)
 
-from iterage import (all_equal, chunk, chunk_filled, chunk_trunc, dedup,
-                     find_first, ilen, single, to_optional, uniq)
+from iterage import (all_equal, dedup, find_first, ilen, single,
+                     to_optional, uniq)
 
 __all__ = ("itr", "Itr")
 
+from iterage import _plan
 from iterage._types import OrderedT
 
+if TYPE_CHECKING:  # pragma: no cover
+    from iterage.files import PathLike
+    from iterage.profiling import Profile
+    from iterage.reducers import Reducer
+
+# the other submodules are imported by the methods using them, so importing
+# `itr` stays cheap
+
 T = TypeVar("T")
 U = TypeVar("U")
 
@@ -25,7 +37,7 @@ _nothing = object()
 _sentinal = object()
 
 
-def sliding(iterable, length):
+def sliding(iterable, length, step=1):
     iterator = iter(iterable)
 
     _tuple = tuple
@@ -35,14 +47,71 @@ def sliding(iterable, length):
     queue = deque(islice(iterator, length), length)
     yield _tuple(queue)
 
+    if step == 1:
+        while True:
+            e = _next(iterator, sentinal)
+            if e is sentinal:
+                break
+            queue.append(e)
+            yield _tuple(queue)
+        return
+
+    skip = max(step - length, 0)
+    n = min(step, length)
     while True:
-        e = _next(iterator, sentinal)
-        if e is sentinal:
+        if skip:
+            deque(islice(iterator, skip), 0)
+        new = _tuple(islice(iterator, n))
+        if len(new) < n:
             break
-        queue.append(e)
+        queue.extend(new)
         yield _tuple(queue)
 
 
+def _rolling_sum(iterable, length, step, mean):
+    window = deque()
+    total = 0
+    i = -1
+    next_window = length - 1
+    for i, e in enumerate(iterable):
+        total += e
+        window.append(e)
+        if i >= length:
+            total -= window.popleft()
+        if i == next_window:
+            yield total / length if mean else total
+            next_window += step
+    if 0 <= i < length - 1:
+        # input shorter than one window, an empty input has no window
+        yield total / (i + 1) if mean else total
+
+
+def _rolling_extreme(iterable, length, step, dominated):
+    # monotonic deque of (index, value): values that can not become the
+    # extreme of a window anymore are dropped, the front is the extreme
+    candidates: deque = deque()
+    i = -1
+    next_window = length - 1
+    for i, e in enumerate(iterable):
+        while candidates and dominated(candidates[-1][1], e):
+            candidates.pop()
+        candidates.append((i, e))
+        if candidates[0][0] == i - length:
+            candidates.popleft()
+        if i == next_window:
+            yield candidates[0][1]
+            next_window += step
+    if 0 <= i < length - 1:
+        yield candidates[0][1]
+
+
+def _check_window(length: int, step: int) -> None:
+    if length < 1:
+        raise ValueError("length must be greater than 0")
+    if step < 1:
+        raise ValueError("step must be greater than 0")
+
+
 def partial_reduce(op, iterable):
     iterator = iter(iterable)
 
@@ -68,17 +137,49 @@ class Itr(Iterable[T]):
     >>> itr(t).map(...)
     >>> itr(t).map(...)
 
+    :note: Operations are recorded lazily and optimized when the Itr is
+        consumed: `take`/`drop`/`slice` are moved before `map`, and chains of
+        `map`/`where` run in a single iterator layer. So functions passed to
+        `map` should be free of side effects, they may be called less often
+        than the number of source elements.
+
     """
 
-    _itr: Iterable[T]
+    _src: Iterable
+    _stages: Tuple[_plan.Stage, ...]
+    _batch: Optional[int] = None
+    _profile: Optional["Profile"] = None
 
     def __init__(self, iterable: Iterable[T]):
-        self._itr = iterable
+        self._src = iterable
+        self._stages = ()
 
     @classmethod
     def _new(cls, iterable: Iterable[U]) -> "Itr[U]":
         return cls(iterable)
 
+    def _then(self, iterable: Iterable[U]) -> "Itr[U]":
+        # new Itr over iterable in the same execution mode
+        result = self._new(iterable)
+        result._batch = self._batch
+        result._profile = self._profile
+        return result
+
+    def _push(self, stage: _plan.Stage) -> "Itr":
+        result = self._then(self._src)
+        result._stages = self._stages + (stage,)
+        return result
+
+    @property
+    def _itr(self) -> Iterable[T]:
+        return _plan.build(
+            self._src, self._stages, self._batch, self._profile)
+
+    def _blocks(self, size: int) -> Iterable[list]:
+        # blocks of batched mode, `size` is self._batch
+        return _plan.build_blocks(
+            self._src, self._stages, size, self._profile)
+
     # generators
 
     @classmethod
@@ -129,6 +230,37 @@ class Itr(Iterable[T]):
         """
         return cls.empty() if v is None else cls._new((v,))
 
+    @classmethod
+    def from_file(
+            cls,
+            path: "PathLike",
+            mode: str = "lines",
+            record_size: Optional[int] = None,
+            delimiter: bytes = b"\n",
+            encoding: Optional[str] = "utf-8",
+            start: int = 0,
+            stop: Optional[int] = None) -> "Itr":
+        """
+        Iterate over a memory-mapped file.
+
+        With ``mode="lines"`` the lines without `delimiter` are decoded with
+        `encoding`, or with `encoding=None` passed as memoryviews. With
+        ``mode="records"`` the file is cut into memoryviews of `record_size`
+        bytes. `start` and `stop` select a byte range, see
+        :func:`iterage.files.split_file`.
+
+        :see: iterage.files.read_lines, iterage.files.read_records
+        """
+        from iterage.files import read_lines, read_records
+
+        if mode == "lines":
+            return cls._new(read_lines(path, delimiter, encoding, start, stop))
+        if mode == "records":
+            if record_size is None:
+                raise ValueError("mode 'records' needs a record_size")
+            return cls._new(read_records(path, record_size, start, stop))
+        raise ValueError(f"unknown mode {mode!r}, use 'lines' or 'records'")
+
     # selecting
 
     def take(self, n: int) -> "Itr[T]":
@@ -144,7 +276,7 @@ class Itr(Iterable[T]):
 
         :see: Itr.drop, Itr.take_while
         """
-        return self._new(islice(self._itr, n))
+        return self._push(_plan.Slice(n))
 
     def take_while(self, pred):
         """
@@ -155,7 +287,7 @@ class Itr(Iterable[T]):
 
         :see: Itr.drop_while, Itr.take
         """
-        return self._new(takewhile(pred, self._itr))
+        return self._then(takewhile(pred, self._itr))
 
     def take_last(self, n: int) -> "Itr[T]":
         """
@@ -167,7 +299,7 @@ class Itr(Iterable[T]):
         [0, 1]
 
         """
-        return self._new(deque(self._itr, maxlen=n))
+        return self._push(_plan.TakeLast(n))
 
     def drop(self, n: int) -> "Itr[T]":
         """
@@ -179,7 +311,7 @@ class Itr(Iterable[T]):
         []
 
         """
-        return self._new(islice(self._itr, n, None))
+        return self._push(_plan.Slice(n, None))
 
     def drop_while(self, pred):
         """
@@ -190,7 +322,7 @@ class Itr(Iterable[T]):
 
         :see: Itr.take_while, Itr.drop
         """
-        return self._new(dropwhile(pred, self._itr))
+        return self._then(dropwhile(pred, self._itr))
 
     def slice(self, *args):
         """
@@ -208,7 +340,7 @@ class Itr(Iterable[T]):
         [0, 1, 2, 3]
 
         """
-        return self._new(islice(self._itr, *args))
+        return self._push(_plan.Slice(*args))
 
     def where(self, fn: Callable[[T], U]) -> "Itr[T]":
         """
@@ -218,82 +350,302 @@ class Itr(Iterable[T]):
         [0, 2]
 
         """
-        return self._new(filter(fn, self._itr))
+        return self._push(_plan.Where(fn))
 
     def where_not(self, fn: Callable[[T], U]) -> "Itr[T]":
-        return self._new(filterfalse(fn, self._itr))
+        return self._push(_plan.WhereNot(fn))
 
     def drop_elements(self, t: T) -> "Itr[T]":
-        return self._new(e for e in self._itr if e == t)
+        return self._then(e for e in self._itr if e == t)
 
     def drop_na(self) -> "Itr[T]":
-        return self._new(e for e in self._itr if e is not None)
+        return self._then(e for e in self._itr if e is not None)
 
     # ordering
 
     def sort(
             self,
+            key: Optional[Callable[[T], OrderedT]] = None,
+            max_in_memory: Optional[int] = None) -> "Itr[T]":
+        """
+        Sort elements, stable.
+
+        A following `take` (or `first`) only selects the k smallest elements
+        with a heap in O(n log k) instead of sorting everything.
+
+        With `max_in_memory` the elements are sorted lazily by a external
+        merge sort, that spills sorted runs to temporary files.
+
+        >>> itr([3, 1, 2]).sort().to_list()
+        [1, 2, 3]
+        >>> itr([3, 1, 2]).sort(max_in_memory=2).to_list()
+        [1, 2, 3]
+
+        :see: iterage.external.external_sort
+        """
+        if max_in_memory is not None:
+            from iterage.external import external_sort
+            return self._then(external_sort(self._itr, key, max_in_memory))
+        return self._push(_plan.Sort(key))
+
+    def top_k(
+            self,
+            k: int,
             key: Optional[Callable[[T], OrderedT]] = None) -> "Itr[T]":
-        if key is None:
-            return self._new(sorted(self._itr))
-        else:
-            return self._new(sorted(self._itr, key=key))
+        """
+        The k largest elements, largest first.
+
+        Uses a bounded heap: O(n log k) time and O(k) memory.
+
+        >>> itr([5, 1, 4, 2, 3]).top_k(2).to_list()
+        [5, 4]
+
+        :see: Itr.bottom_k
+        """
+        return self._push(_plan.Sort(key, reverse=True)).take(k)
+
+    def bottom_k(
+            self,
+            k: int,
+            key: Optional[Callable[[T], OrderedT]] = None) -> "Itr[T]":
+        """
+        The k smallest elements, smallest first.
+
+        >>> itr([5, 1, 4, 2, 3]).bottom_k(2, key=lambda x: -x).to_list()
+        [5, 4]
+
+        :see: Itr.top_k
+        """
+        return self.sort(key).take(k)
 
     def reverse(self) -> "Itr[T]":
-        try:
-            return self._new(reversed(self._itr))  # type: ignore
-        except TypeError:
-            return self._new(reversed(list(self._itr)))
+        """
+        Reverse the order of the elements.
+
+        Sequences are reversed by index, other iterables are copied into a
+        list if they are not reversible.
+
+        >>> itr([1, 2, 3]).reverse().to_list()
+        [3, 2, 1]
+        >>> itr(x for x in range(3)).reverse().to_list()
+        [2, 1, 0]
+
+        """
+        return self._push(_plan.Reverse())
 
     # unique
 
     def uniq(self, key: _KeyFn = None) -> "Itr[T]":
-        return self._new(uniq(self._itr, key))
+        return self._then(uniq(self._itr, key))
 
-    def dedup(self, key: _KeyFn = None) -> "Itr[T]":
-        return self._new(dedup(self._itr, key))
+    def dedup(
+            self,
+            key: _KeyFn = None,
+            max_in_memory: Optional[int] = None,
+            mode: str = "sort",
+            capacity: int = 1_000_000,
+            error_rate: float = 0.001) -> "Itr[T]":
+        """
+        Pass through unique elements.
+
+        >>> itr([2, 1, 2, 3, 1]).dedup().to_list()
+        [1, 2, 3]
+        >>> itr([2, 1, 2, 3, 1]).dedup(mode="hash").to_list()
+        [2, 1, 3]
+
+        :see: iterage.iterate.dedup
+        """
+        return self._then(dedup(
+            self._itr, key, max_in_memory, mode, capacity, error_rate))
 
     # mapping
 
     def map(self, fn: Callable[[T], U]) -> "Itr[U]":
-        return self._new(map(fn, self._itr))
+        return self._push(_plan.Map(fn))
 
     def star_map(self, fn: Callable[..., U]) -> "Itr[U]":
-        return self._new(starmap(fn, self._itr))
+        return self._push(_plan.StarMap(fn))
+
+    def par_map(
+            self,
+            fn: Callable[[T], U],
+            workers: Optional[int] = None,
+            backend: str = "thread",
+            chunksize: int = 1,
+            ordered: bool = True,
+            max_in_flight: Optional[int] = None) -> "Itr[U]":
+        """
+        Map elements in parallel in a thread or process pool.
+
+        >>> itr(range(5)).par_map(lambda x: x * 2, workers=2).to_list()
+        [0, 2, 4, 6, 8]
+
+        :see: iterage.parallel.par_map
+        """
+        return self._push(_plan.ParMap(
+            fn, workers=workers, backend=backend, chunksize=chunksize,
+            ordered=ordered, max_in_flight=max_in_flight))
+
+    def prefetch(self, n: int, backend: str = "thread") -> "Itr[T]":
+        """
+        Run everything before this point in a background thread or process,
+        that reads up to `n` elements ahead.
+
+        The upstream, e.g. reading a file, overlaps with the work done on
+        the elements downstream. Exceptions are raised in the consumer and
+        the worker stops when the Itr is closed or dropped.
+
+        >>> itr(range(5)).map(lambda x: x * 2).prefetch(2).to_list()
+        [0, 2, 4, 6, 8]
+
+        :see: iterage.parallel.prefetch
+        """
+        return self._push(_plan.Prefetch(n, backend))
+
+    def batched(self, size: int = 4096) -> "Itr[T]":
+        """
+        Run the pipeline block-at-a-time with blocks of `size` elements.
+
+        `map`, `star_map`, `where` and `where_not` stages process whole
+        blocks with the builtin `map`/`filter` instead of one element after
+        the other, and `sum`, `min`, `max`, `all`, `any` and `len` combine
+        results per block. The elements are the same as without batching,
+        but up to `size` elements are read and mapped ahead.
+
+        >>> itr(range(10)).batched(4).map(lambda x: x * 3).where(bool).sum()
+        135
+
+        """
+        if size < 1:
+            raise ValueError("size must be greater than 0")
+        result = self._then(self._src)
+        result._stages = self._stages
+        result._batch = size
+        return result
 
     def flat_map(self, fn: Callable[[T], Iterable[U]]) -> "Itr[U]":
-        return self._new(chain.from_iterable(map(fn, self._itr)))
+        return self._then(chain.from_iterable(map(fn, self._itr)))
 
     def flatten(self) -> "Itr":
-        return self._new(chain.from_iterable(self._itr))
+        return self._then(chain.from_iterable(self._itr))
 
     def chunk(self, n: int) -> "Itr[Sequence[T]]":
-        return self._new(chunk(self._itr, n))
+        return self._push(_plan.Chunk(n))
+
+    def batch(
+            self,
+            max_size: int,
+            max_delay: Optional[float] = None) -> "Itr[List[T]]":
+        """
+        Lists of up to `max_size` elements. With `max_delay` a batch is
+        emitted as soon as its first element waited `max_delay` seconds,
+        even while the source blocks.
+
+        >>> itr(range(5)).batch(2, max_delay=0.5).to_list()
+        [[0, 1], [2, 3], [4]]
+
+        :see: iterage.parallel.batch
+        """
+        return self._push(_plan.Batch(max_size, max_delay))
 
     def chunk_filled(self, n: int, fillvalue: Any = None) -> "Itr[Sequence[T]]":
-        return self._new(chunk_filled(self._itr, n, fillvalue))
+        return self._push(_plan.ChunkFilled(n, fillvalue))
 
     def chunk_trunc(self, n: int) -> "Itr[Sequence[T]]":
-        return self._new(chunk_trunc(self._itr, n))
+        return self._push(_plan.ChunkTrunc(n))
 
     def zip(self, other: Iterable[U]) -> "Itr[Tuple[T, U]]":
-        return self._new(zip(self._itr, other))
+        return self._push(_plan.Zip(other))
 
     def zip_longest(
             self, other: Iterable[U], fillvalue: Any = None
     ) -> "Itr[Tuple[T, U]]":
-        return self._new(zip_longest(self._itr, other, fillvalue=fillvalue))
+        return self._push(_plan.ZipLongest(other, fillvalue))
 
     def enumerate(self, start=0) -> "Itr[Tuple[int, T]]":
-        return self._new(enumerate(self._itr, start))
+        return self._push(_plan.Enumerate(start))
+
+    def sliding(self, length: int, step: int = 1) -> "Itr[Tuple[T, ...]]":
+        """
+        Windows of `length` elements, each `step` elements after the last.
+
+        An input shorter than `length` gives one short window.
+
+        >>> itr(range(5)).sliding(3).to_list()
+        [(0, 1, 2), (1, 2, 3), (2, 3, 4)]
+        >>> itr(range(7)).sliding(2, step=3).to_list()
+        [(0, 1), (3, 4)]
+
+        :see: Itr.rolling_sum, Itr.rolling_min
+        """
+        _check_window(length, step)
+        return self._then(sliding(self._itr, length, step))
+
+    def rolling_sum(self, length: int, step: int = 1) -> "Itr[T]":
+        """
+        Sums of the windows of :meth:`Itr.sliding`, in O(1) per element.
+
+        The sum is updated by adding the entering and subtracting the leaving
+        elements, so for floats rounding errors can add up. Unlike
+        :meth:`Itr.sliding`, an empty input gives no window and no sum.
+
+        >>> itr([1, 2, 3, 4, 5]).rolling_sum(3).to_list()
+        [6, 9, 12]
+        >>> itr([]).rolling_sum(3).to_list()
+        []
+
+        """
+        _check_window(length, step)
+        return self._then(_rolling_sum(self._itr, length, step, False))
+
+    def rolling_mean(self, length: int, step: int = 1) -> "Itr[float]":
+        """
+        Means of the windows of :meth:`Itr.sliding`, in O(1) per element.
+
+        >>> itr([1, 2, 3, 4, 5]).rolling_mean(2, step=2).to_list()
+        [1.5, 3.5]
 
-    def sliding(self, length):
-        return self._new(sliding(self._itr, length))
+        :see: Itr.rolling_sum
+        """
+        _check_window(length, step)
+        return self._then(_rolling_sum(self._itr, length, step, True))
+
+    def rolling_min(self, length: int, step: int = 1) -> "Itr[T]":
+        """
+        Minima of the windows of :meth:`Itr.sliding`, in amortized O(1) per
+        element. An empty input gives no window, as it has no minimum.
+
+        >>> itr([3, 1, 4, 1, 5, 9, 2]).rolling_min(3).to_list()
+        [1, 1, 1, 1, 2]
+
+        """
+        _check_window(length, step)
+        return self._then(_rolling_extreme(self._itr, length, step, ge))
+
+    def rolling_max(self, length: int, step: int = 1) -> "Itr[T]":
+        """
+        Maxima of the windows of :meth:`Itr.sliding`, in amortized O(1) per
+        element. An empty input gives no window, as it has no maximum.
+
+        >>> itr([3, 1, 4, 1, 5, 9, 2]).rolling_max(3).to_list()
+        [4, 4, 5, 9, 9]
+
+        """
+        _check_window(length, step)
+        return self._then(_rolling_extreme(self._itr, length, step, le))
 
     def accumulate(self):
-        return self._new(accumulate(self._itr))
+        return self._then(accumulate(self._itr))
 
     def group_by(self, key: Callable[[T], U]) -> Dict[U, List[T]]:
+        """
+        Group elements by key into a dict of lists.
+
+        >>> itr(range(5)).group_by(lambda x: x % 2)
+        {0: [0, 2, 4], 1: [1, 3]}
+
+        :see: group_by_external
+        """
         result: Dict[U, List[T]] = {}
         for item in self._itr:
             k = key(item)
@@ -303,44 +655,155 @@ class Itr(Iterable[T]):
                 result[k] = [item]
         return result
 
+    def group_by_external(
+            self,
+            key: Callable[[T], U],
+            max_in_memory: int,
+            partitions: int = 16,
+            dir: Optional[str] = None) -> "Itr[Tuple[U, List[T]]]":
+        """
+        Group elements by key into `(key, group)` pairs, spilling elements to
+        temporary files when more than `max_in_memory` elements would be held
+        in memory.
+
+        >>> sorted(itr(range(5)).group_by_external(lambda x: x % 2, max_in_memory=2))
+        [(0, [0, 2, 4]), (1, [1, 3])]
+
+        :see: iterage.external.external_group_by
+        """
+        from iterage.external import external_group_by
+        return self._then(external_group_by(
+            self._itr, key, max_in_memory, partitions, dir))
+
     # composing
 
+    def join(
+            self,
+            other: Iterable[U],
+            left_key: Optional[Callable[[T], Any]] = None,
+            right_key: Optional[Callable[[U], Any]] = None,
+            how: str = "inner",
+            strategy: str = "hash",
+            fillvalue: Any = None,
+            asof: bool = False,
+            tolerance: Any = None) -> "Itr[Tuple[T, U]]":
+        """
+        Join with `other` on keys into ``(left, right)`` pairs.
+
+        `how` is ``"inner"``, ``"left"`` or ``"outer"``, unmatched elements
+        are paired with `fillvalue`. Without `right_key` both sides use
+        `left_key`.
+
+        With ``strategy="hash"`` the smaller side (the right side if a
+        length is unknown) is loaded into a hash table and the other side
+        is streamed. ``strategy="merge"`` needs both sides sorted by key,
+        holds only the elements of one key in memory and supports as-of
+        joins with `asof` and `tolerance`.
+
+        >>> names = [(1, "one"), (2, "two")]
+        >>> itr([2, 3, 1]).join(names, right_key=lambda e: e[0], how="left").to_list()
+        [(2, (2, 'two')), (3, None), (1, (1, 'one'))]
+        >>> itr([1, 4]).join([0, 3], strategy="merge", asof=True).to_list()
+        [(1, 0), (4, 3)]
+
+        :see: iterage.join.hash_join, iterage.join.merge_join
+        """
+        from iterage.join import hash_join, merge_join
+
+        # without right_key the elements of other are keyed like ours
+        other_key: Optional[Callable[[Any], Any]] = (
+            left_key if right_key is None else right_key)
+        if strategy == "merge":
+            return self._then(merge_join(
+                self._itr, other, left_key, other_key, how, fillvalue, asof,
+                tolerance))
+        if strategy != "hash":
+            raise ValueError(
+                f"unknown strategy {strategy!r}, use hash or merge")
+        if asof:
+            raise ValueError("as-of joins need strategy='merge'")
+
+        n = _plan.length(self._src, self._stages)
+        m = (_plan.length(other._src, other._stages) if isinstance(other, Itr)
+             else _plan.length(other, ()))
+        build = "left" if n is not None and m is not None and n < m else "right"
+        return self._then(hash_join(
+            self._itr, other, left_key, other_key, how, fillvalue, build))
+
     def prelude(self, prelude: Iterable[T]) -> Iterable[T]:
-        return self._new(chain(prelude, self._itr))
+        return self._then(chain(prelude, self._itr))
 
     def postlude(self, postlude: Iterable[T]) -> Iterable[T]:
-        return self._new(chain(self._itr, postlude))
+        return self._then(chain(self._itr, postlude))
 
     def cycle(self):
-        return self._new(cycle(self._itr))
+        return self._push(_plan.Cycle())
 
     # combinatoric
 
     def product(self, repeat):
-        return self._new(product(self._itr, repeat))
+        return self._then(product(self._itr, repeat=repeat))
 
     def permutations(self, r=None):
-        return self._new(permutations(self._itr, r))
+        return self._then(permutations(self._itr, r))
 
     def combinations(self, r):
-        return self._new(combinations(self._itr, r))
+        return self._then(combinations(self._itr, r))
 
     def combinations_with_replacement(self, r):
-        return self._new(combinations_with_replacement(self._itr, r))
+        return self._then(combinations_with_replacement(self._itr, r))
 
     # reduce
 
     def reduce(self, f: Callable[[T, T], T], *args):
         return reduce(f, self._itr, *args)
 
+    def aggregate(self, **reducers: "Reducer") -> Dict[str, Any]:
+        """
+        Run several reducers in a single pass, results by keyword.
+
+        >>> from iterage.reducers import Count, Max, Sum
+        >>> itr(range(5)).aggregate(count=Count(), total=Sum(), hi=Max())
+        {'count': 5, 'total': 10, 'hi': 4}
+
+        :see: iterage.reducers
+        """
+        from iterage.reducers import aggregate
+        return aggregate(self._itr, **reducers)
+
+    def fan_out(self, *sinks: "Reducer") -> Tuple:
+        """
+        Push every element into several sinks in a single pass.
+
+        Memory is only bounded by the state of the sinks, nothing is
+        buffered between them.
+
+        >>> from iterage.reducers import Sum, sink
+        >>> evens, odds, total = itr(range(6)).fan_out(
+        ...     sink.where(lambda x: x % 2 == 0).to_list(),
+        ...     sink.where(lambda x: x % 2).map(str).to_list(),
+        ...     Sum())
+        >>> evens, odds, total
+        ([0, 2, 4], ['1', '3', '5'], 15)
+
+        :see: iterage.reducers.Sink
+        """
+        from iterage.reducers import fan_out
+        return fan_out(self._itr, *sinks)
+
     def to_string(self, sep: str):
         return sep.join(map(str, self._itr))
 
     def to_list(self):
-        return list(self._itr)
+        if self._batch is not None:
+            result: list = []
+            for block in self._blocks(self._batch):
+                result.extend(block)
+            return result
+        return list(self._sized())
 
     def to_tuple(self):
-        return tuple(self._itr)
+        return tuple(self._sized())
 
     def to_dict(self):
         return dict(self._itr)
@@ -368,25 +831,80 @@ class Itr(Iterable[T]):
     def foreach(self, fn: Callable[[T], None]) -> None:
         self.map(fn).consume()
 
+    def _vectorized(self, name: str, *args: Any) -> Any:
+        # whole-array reduction with NumPy, None if not possible. NumPy is
+        # imported only for sources that can be vectorized.
+        if not isinstance(self._src, array.array) and "numpy" not in sys.modules:
+            return None
+        from iterage import _numpy
+        return _numpy.reduce(self._src, self._stages, name, *args)
+
     def sum(self) -> T:
+        result: Any = self._vectorized("sum")
+        if result is not None:
+            return result
+        if self._batch is not None:
+            result = 0
+            for block in self._blocks(self._batch):
+                result = sum(block, result)
+            return result
         return sum(self._itr)
 
     def all(self) -> bool:
+        result = self._vectorized("all")
+        if result is not None:
+            return result
+        if self._batch is not None:
+            return all(map(all, self._blocks(self._batch)))
         return all(self._itr)
 
     def any(self) -> bool:
+        result = self._vectorized("any")
+        if result is not None:
+            return result
+        if self._batch is not None:
+            return any(map(any, self._blocks(self._batch)))
         return any(self._itr)
 
     def none(self) -> bool:
         return not any(self._itr)
 
     def max(self, *args, **kwargs) -> T:
+        if not args and not kwargs:
+            result = self._vectorized("max")
+            if result is not None:
+                return result
+            if self._batch is not None:
+                return max(map(max, self._blocks(self._batch)))
         return max(self._itr, *args, **kwargs)
 
-    def min(self) -> T:
-        return min(self._itr)
+    def min(self, *args, **kwargs) -> T:
+        if not args and not kwargs:
+            result = self._vectorized("min")
+            if result is not None:
+                return result
+            if self._batch is not None:
+                return min(map(min, self._blocks(self._batch)))
+        return min(self._itr, *args, **kwargs)
 
     def len(self) -> int:
+        """
+        Number of elements. Drains the Itr only if the length is not known.
+
+        >>> itr(range(10 ** 9)).map(str).drop(5).take(3).len()
+        3
+        >>> itr(x for x in range(5)).len()
+        5
+
+        """
+        n = _plan.length(self._src, self._stages)
+        if n is not None:
+            return n
+        size = self._vectorized("len")
+        if size is not None:
+            return size
+        if self._batch is not None:
+            return sum(map(len, self._blocks(self._batch)))
         return ilen(self._itr)
 
     def find_first(self, pred, default=_nothing):
@@ -399,7 +917,7 @@ class Itr(Iterable[T]):
         return all_equal(self._itr)
 
     def first(self, default: U = None) -> Union[T, U]:
-        return next(iter(self._itr), default)
+        return next(iter(self.take(1)._itr), default)
 
     def single(self) -> T:
         return single(self._itr)
@@ -407,9 +925,12 @@ class Itr(Iterable[T]):
     def nth(self, n: int, default=None) -> T:
         if n < 0:
             raise ValueError("n must be greater than or equal 0")
-        return next(islice(self._itr, n - 1, None), default)
+        return self.drop(n - 1).first(default)
 
     def count(self, t: T) -> int:
+        result = self._vectorized("count", t)
+        if result is not None:
+            return result
         return sum(e == t for e in self._itr)
 
     def exists(self, t: Callable[[T], bool]) -> bool:
@@ -418,20 +939,49 @@ class Itr(Iterable[T]):
     def quantities(self) -> Counter[T]:
         return collections.Counter(self._itr)
 
+    def profile(self) -> "Profile":
+        """
+        Statistics of the stages of an instrumented Itr.
+
+        Stages are recorded when they are run, so call it after consuming
+        the Itr. Vectorized NumPy reductions bypass the stages and are not
+        recorded.
+
+        >>> it = itr([3, -1, 2], instrument=True).map(abs).sort()
+        >>> it.to_list()
+        [1, 2, 3]
+        >>> it.profile().stages[0].elements_out
+        3
+
+        :see: iterage.profiling.Profile
+        """
+        if self._profile is None:
+            raise ValueError("Itr is not instrumented, use itr(..., instrument=True)")
+        return self._profile
+
     # integration
 
     def __iter__(self) -> Iterator[T]:
         return iter(self._itr)
 
+    def __length_hint__(self) -> int:
+        return _plan.length_hint(self._src, self._stages)
+
+    def _sized(self) -> Iterable[T]:
+        # let list/tuple presize with __length_hint__
+        return self._src if not self._stages else self
+
+    def _unprofiled(self) -> Iterable[T]:
+        # the plan for display, without adding stages to the profile
+        return _plan.build(self._src, self._stages, self._batch)
+
     def __repr__(self):
-        return f"Itr({repr(self._itr)})"
+        return f"Itr({repr(self._unprofiled())})"
 
     def __str__(self):
-        return f"Itr({str(self._itr)})"
+        return f"Itr({str(self._unprofiled())})"
 
     # TODO:
-    #  sliding(n: int)
-    #  sliding(n: int, step: int)
     #  partition -> (Itr, Itr)
     #  reduce/fold
     #  min(key)/max(key)/average(key)
@@ -460,10 +1010,13 @@ class Itr(Iterable[T]):
     #  std::inner_product/std::adjacent_difference/std::partial_sum
 
 
-def itr(iterable: Iterable[T]) -> "Itr[T]":
+def itr(iterable: Iterable[T], instrument: bool = False) -> "Itr[T]":
     """
     Create Itr class from a iterable.
 
+    With `instrument=True` every stage records statistics, see
+    :meth:`Itr.profile`.
+
     >>> itr(range(3)).to_list()
     [0, 1, 2]
     >>> itr([56]).to_list()
@@ -472,4 +1025,8 @@ def itr(iterable: Iterable[T]) -> "Itr[T]":
     [2, 3, 4]
 
     """
-    return Itr(iterable)
+    result = Itr(iterable)
+    if instrument:
+        from iterage.profiling import Profile
+        result._profile = Profile()
+    return result
@@ -0,0 +1,249 @@
+# -*- coding=utf-8 -*-
+
+"""
+Joins of two iterables on keys.
+
+Joined elements are ``(left, right)`` pairs. With ``how="left"`` left
+elements without partner are passed through as ``(left, fillvalue)`` and
+with ``how="outer"`` also right elements as ``(fillvalue, right)``.
+
+>>> users = [(1, "ann"), (2, "bob")]
+>>> orders = [(1, "tea"), (1, "milk"), (3, "rice")]
+>>> list(hash_join(orders, users, lambda o: o[0], lambda u: u[0]))
+[((1, 'tea'), (1, 'ann')), ((1, 'milk'), (1, 'ann'))]
+>>> list(merge_join(users, orders, lambda u: u[0], lambda o: o[0], how="outer"))
+[((1, 'ann'), (1, 'tea')), ((1, 'ann'), (1, 'milk')), ((2, 'bob'), None), (None, (3, 'rice'))]
+
+"""
+
+from itertools import groupby
+from typing import (Any, Callable, Dict, Iterable, Iterator, List, Optional,
+                    Tuple, TypeVar)
+
+__all__ = ("hash_join", "merge_join")
+
+T = TypeVar("T")
+U = TypeVar("U")
+
+_HOW = ("inner", "left", "outer")
+
+_nothing = object()
+
+# next group of an exhausted side
+_END: Tuple[Any, Any] = (_nothing, None)
+
+
+def _check_how(how: str) -> None:
+    if how not in _HOW:
+        raise ValueError(f"unknown join {how!r}, use one of {', '.join(_HOW)}")
+
+
+def _identity(x: Any) -> Any:
+    return x
+
+
+def _table(iterable: Iterable[T], key: Callable[[T], Any]) -> Dict[Any, List[T]]:
+    table: Dict[Any, List[T]] = {}
+    for e in iterable:
+        k = key(e)
+        if k in table:
+            table[k].append(e)
+        else:
+            table[k] = [e]
+    return table
+
+
+def hash_join(
+    left: Iterable[T],
+    right: Iterable[U],
+    left_key: Optional[Callable[[T], Any]] = None,
+    right_key: Optional[Callable[[U], Any]] = None,
+    how: str = "inner",
+    fillvalue: Any = None,
+    build: Optional[str] = None,
+) -> Iterator[Tuple[T, U]]:
+    """
+    Join on equal keys with a hash table of one side.
+
+    The table is built from the `build` side (``"left"`` or ``"right"``) and
+    the other side is streamed, so pairs come in the order of the streamed
+    side. By default the smaller side is built if both sides have a length,
+    otherwise the right side. Unmatched elements of the built side come
+    last.
+
+    Keys have to be hashable, without key functions the elements are keys.
+    """
+    _check_how(how)
+    if build is None:
+        build = "left" if _smaller(left, right) else "right"
+    elif build not in ("left", "right"):
+        raise ValueError(f"unknown build side {build!r}, use left or right")
+    left_key = left_key or _identity
+    right_key = right_key or _identity
+    if build == "right":
+        return _hash_join(
+            left, right, left_key, right_key, how in ("left", "outer"),
+            how == "outer", fillvalue, False)
+    return _hash_join(
+        right, left, right_key, left_key, how == "outer",
+        how in ("left", "outer"), fillvalue, True)
+
+
+def _smaller(left: Iterable, right: Iterable) -> bool:
+    try:
+        return len(left) < len(right)  # type: ignore
+    except TypeError:
+        return False
+
+
+def _hash_join(probe, table, probe_key, table_key, keep_probe, keep_table,
+               fillvalue, swapped):
+    # is a generator, so the table is built on the first `next`
+    rows = _table(table, table_key)
+    matched = set()
+    for e in probe:
+        k = probe_key(e)
+        partners = rows.get(k, _nothing)
+        if partners is _nothing:
+            if keep_probe:
+                yield (fillvalue, e) if swapped else (e, fillvalue)
+            continue
+        if keep_table:
+            matched.add(k)
+        for partner in partners:
+            yield (partner, e) if swapped else (e, partner)
+
+    if keep_table:
+        for k, partners in rows.items():
+            if k not in matched:
+                for partner in partners:
+                    yield (partner, fillvalue) if swapped else (fillvalue, partner)
+
+
+def merge_join(
+    left: Iterable[T],
+    right: Iterable[U],
+    left_key: Optional[Callable[[T], Any]] = None,
+    right_key: Optional[Callable[[U], Any]] = None,
+    how: str = "inner",
+    fillvalue: Any = None,
+    asof: bool = False,
+    tolerance: Any = None,
+) -> Iterator[Tuple[T, U]]:
+    """
+    Join inputs sorted by key in one pass over both.
+
+    Only the right elements of the current key are held in memory. Keys
+    have to be orderable and ascending on both sides, otherwise ValueError
+    is raised when the order violation is reached.
+
+    With `asof` every left element is joined with the last right element
+    whose key is less or equal, like the last known quote at the time of a
+    trade. With `tolerance` the keys must also be at most `tolerance`
+    apart. As-of joins are inner or left joins.
+
+    >>> trades = [(1, "a"), (5, "b"), (9, "c")]
+    >>> quotes = [(0, 10), (4, 11), (5, 12)]
+    >>> list(merge_join(trades, quotes, lambda t: t[0], lambda q: q[0], asof=True))
+    [((1, 'a'), (0, 10)), ((5, 'b'), (5, 12)), ((9, 'c'), (5, 12))]
+    >>> list(merge_join(trades, quotes, lambda t: t[0], lambda q: q[0], how="left",
+    ...                 asof=True, tolerance=2))
+    [((1, 'a'), (0, 10)), ((5, 'b'), (5, 12)), ((9, 'c'), None)]
+
+    """
+    _check_how(how)
+    left_key = left_key or _identity
+    right_key = right_key or _identity
+    if asof:
+        if how == "outer":
+            raise ValueError("as-of joins are inner or left joins")
+        return _asof_join(
+            left, right, left_key, right_key, how == "left", fillvalue,
+            tolerance)
+    return _merge_join(
+        left, right, left_key, right_key, how in ("left", "outer"),
+        how == "outer", fillvalue)
+
+
+def _sorted_groups(iterable: Iterable, key: Callable, side: str) -> Iterator:
+    previous = _nothing
+    for k, group in groupby(iterable, key):
+        if previous is not _nothing and k < previous:
+            raise ValueError(f"{side} input is not sorted by key")
+        previous = k
+        yield k, group
+
+
+def _unmatched(group: Iterable, fillvalue: Any, left: bool) -> Iterator:
+    if left:
+        return ((e, fillvalue) for e in group)
+    return ((fillvalue, e) for e in group)
+
+
+def _rest(key: Any, group: Iterable, groups: Iterator, fillvalue: Any,
+          left: bool) -> Iterator:
+    # the current and all following groups of a side without partners
+    while key is not _nothing:
+        yield from _unmatched(group, fillvalue, left)
+        key, group = next(groups, _END)
+
+
+def _pairs(lgroup: Iterable, rgroup: Iterable) -> Iterator:
+    partners = list(rgroup)
+    for e in lgroup:
+        for partner in partners:
+            yield e, partner
+
+
+def _merge_join(left, right, left_key, right_key, keep_left, keep_right,
+                fillvalue):
+    lefts = _sorted_groups(left, left_key, "left")
+    rights = _sorted_groups(right, right_key, "right")
+    lk, lgroup = next(lefts, _END)
+    rk, rgroup = next(rights, _END)
+    while lk is not _nothing and rk is not _nothing:
+        if lk < rk:
+            if keep_left:
+                yield from _unmatched(lgroup, fillvalue, True)
+            lk, lgroup = next(lefts, _END)
+        elif rk < lk:
+            if keep_right:
+                yield from _unmatched(rgroup, fillvalue, False)
+            rk, rgroup = next(rights, _END)
+        else:
+            yield from _pairs(lgroup, rgroup)
+            lk, lgroup = next(lefts, _END)
+            rk, rgroup = next(rights, _END)
+
+    if keep_left:
+        yield from _rest(lk, lgroup, lefts, fillvalue, True)
+    if keep_right:
+        yield from _rest(rk, rgroup, rights, fillvalue, False)
+
+
+def _asof_join(left, right, left_key, right_key, keep_left, fillvalue,
+               tolerance):
+    rights = iter(right)
+    last = _nothing  # last right element with a key <= the left key
+    last_key = None
+    ahead = next(rights, _nothing)  # first right element not taken yet
+    ahead_key = None if ahead is _nothing else right_key(ahead)
+    previous = _nothing
+    for e in left:
+        k = left_key(e)
+        if previous is not _nothing and k < previous:
+            raise ValueError("left input is not sorted by key")
+        previous = k
+        while ahead is not _nothing and not k < ahead_key:
+            if last is not _nothing and ahead_key < last_key:
+                raise ValueError("right input is not sorted by key")
+            last, last_key = ahead, ahead_key
+            ahead = next(rights, _nothing)
+            if ahead is not _nothing:
+                ahead_key = right_key(ahead)
+        if last is not _nothing and (
+            tolerance is None or not k - last_key > tolerance
+        ):
+            yield e, last
+        elif keep_left:
+            yield e, fillvalue
@@ -0,0 +1,367 @@
+# -*- coding=utf-8 -*-
+
+"""
+Parallel adaptors on top of :mod:`concurrent.futures` and background
+workers.
+"""
+
+import multiprocessing
+import os
+import pickle
+import threading
+import time
+from collections import deque
+from concurrent.futures import (FIRST_COMPLETED, Future, ProcessPoolExecutor,
+                                ThreadPoolExecutor, wait)
+from functools import partial
+from itertools import islice
+from queue import Empty, Full, Queue
+from typing import (Any, Callable, Iterable, Iterator, List, Optional, Tuple,
+                    TypeVar)
+
+__all__ = ("batch", "par_map", "prefetch")
+
+T = TypeVar("T")
+U = TypeVar("U")
+
+_EXECUTORS = {
+    "thread": ThreadPoolExecutor,
+    "process": ProcessPoolExecutor,
+}
+
+
+def _map_chunk(fn: Callable[[T], U], items: Iterable[T]) -> List[U]:
+    return [fn(item) for item in items]
+
+
+def _check_backend(backend: str) -> None:
+    if backend not in _EXECUTORS:
+        raise ValueError(
+            f"unknown backend {backend!r}, use one of {', '.join(_EXECUTORS)}"
+        )
+
+
+def check_options(
+    workers: Optional[int], backend: str, chunksize: int,
+    max_in_flight: Optional[int]
+) -> None:
+    """Raise ValueError for invalid `par_map` options."""
+    _check_backend(backend)
+    if workers is not None and workers < 1:
+        raise ValueError("workers must be greater than 0")
+    if chunksize < 1:
+        raise ValueError("chunksize must be greater than 0")
+    if max_in_flight is not None and max_in_flight < 1:
+        raise ValueError("max_in_flight must be greater than 0")
+
+
+def par_map(
+    iterable: Iterable[T],
+    fn: Callable[[T], U],
+    workers: Optional[int] = None,
+    backend: str = "thread",
+    chunksize: int = 1,
+    ordered: bool = True,
+    max_in_flight: Optional[int] = None,
+) -> Iterator[U]:
+    """
+    Map `fn` over `iterable` in a thread or process pool.
+
+    At most `max_in_flight` tasks of `chunksize` elements are submitted at
+    once (default: twice the number of workers), so memory stays bounded on
+    unbounded inputs. With `ordered=False` results are yielded as soon as
+    they are completed.
+
+    The pool is started on the first `next` call and is shut down when the
+    iterator is exhausted or closed. Exceptions of `fn` are raised in the
+    consumer.
+
+    >>> list(par_map(range(5), lambda x: x * 2, workers=2))
+    [0, 2, 4, 6, 8]
+    >>> sorted(par_map(range(5), abs, ordered=False, chunksize=2))
+    [0, 1, 2, 3, 4]
+
+    """
+    check_options(workers, backend, chunksize, max_in_flight)
+    if max_in_flight is None:
+        max_in_flight = 2 * (workers or os.cpu_count() or 1)
+
+    return _par_map(
+        iterable, fn, workers, backend, chunksize, ordered, max_in_flight
+    )
+
+
+def _submit(executor, fn, chunks, chunksize, pending, n):
+    for items in islice(chunks, n):
+        if chunksize == 1:
+            pending.append(executor.submit(fn, items[0]))
+        else:
+            pending.append(executor.submit(_map_chunk, fn, items))
+
+
+def _results(future: Future, chunksize: int) -> Iterable:
+    result = future.result()
+    return result if chunksize != 1 else (result,)
+
+
+def _in_order(pending, submit, chunksize):
+    while pending:
+        future = pending.popleft()
+        submit(1)
+        yield from _results(future, chunksize)
+
+
+def _as_completed(pending, submit, chunksize):
+    while pending:
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            pending.remove(future)
+        submit(len(done))
+        for future in done:
+            yield from _results(future, chunksize)
+
+
+def _par_map(iterable, fn, workers, backend, chunksize, ordered, max_in_flight):
+    # is a generator, so no pool is started before the first `next`
+    with _EXECUTORS[backend](workers) as executor:
+        it = iter(iterable)
+        chunks = iter(lambda: tuple(islice(it, chunksize)), ())
+        pending: deque = deque()
+        submit = partial(_submit, executor, fn, chunks, chunksize, pending)
+        try:
+            submit(max_in_flight)
+            collect = _in_order if ordered else _as_completed
+            yield from collect(pending, submit, chunksize)
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+# seconds between checks for a stopped consumer or a dead worker
+_POLL = 0.05
+
+# kinds of messages from a prefetch worker
+_ITEM, _DONE, _ERROR = range(3)
+
+
+def _put(queue: Any, stop: Any, message: Any) -> bool:
+    # False if the consumer stopped before the message was queued
+    while not stop.is_set():
+        try:
+            queue.put(message, timeout=_POLL)
+            return True
+        except Full:
+            pass
+    return False
+
+
+def _produce(
+    iterable: Iterable, queue: Any, stop: Any, encode: Callable[[Any], Any]
+) -> None:
+    iterator = iter(iterable)
+    message: Tuple[int, Any]
+    try:
+        for e in iterator:
+            if not _put(queue, stop, encode((_ITEM, e))):
+                return
+        message = (_DONE, None)
+    except BaseException as exc:
+        message = (_ERROR, exc)
+    finally:
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            close()
+    _put(queue, stop, encode(message))
+
+
+def _dumps(message: Any) -> bytes:
+    # pickle in the worker, so unpicklable elements are reported as errors
+    # instead of being dropped by the feeder thread of the queue
+    try:
+        return pickle.dumps(message, pickle.HIGHEST_PROTOCOL)
+    except Exception as exc:
+        if message[0] == _ERROR:
+            exc = RuntimeError(f"prefetch worker failed: {message[1]!r}")
+        return pickle.dumps((_ERROR, exc), pickle.HIGHEST_PROTOCOL)
+
+
+def _produce_process(iterable: Iterable, queue: Any, stop: Any) -> None:
+    _produce(iterable, queue, stop, _dumps)
+    if stop.is_set():
+        # nobody reads the queue anymore, do not wait to flush it on exit
+        queue.cancel_join_thread()
+
+
+def check_prefetch_options(n: int, backend: str) -> None:
+    """Raise ValueError for invalid `prefetch` options."""
+    _check_backend(backend)
+    if n < 1:
+        raise ValueError("n must be greater than 0")
+
+
+def _identity(message: Any) -> Any:
+    return message
+
+
+def prefetch(iterable: Iterable[T], n: int, backend: str = "thread") -> Iterator[T]:
+    """
+    Iterate over `iterable` in a background worker, up to `n` elements ahead.
+
+    The worker is a thread or a process. It is started on the first `next`
+    call and fills a queue of `n` elements, while the consumer processes
+    the elements already read. Exceptions of `iterable` are raised in the
+    consumer after the elements before them. When the iterator is closed
+    the worker stops after the element it is reading and closes `iterable`.
+
+    With ``backend="process"`` the elements (and exceptions) are pickled.
+    Unless processes are started with `fork`, `iterable` has to be
+    picklable too.
+
+    >>> list(prefetch(range(5), 2))
+    [0, 1, 2, 3, 4]
+
+    """
+    check_prefetch_options(n, backend)
+    return _prefetch(iterable, n, backend)
+
+
+def _start_prefetch(iterable: Iterable, n: int, backend: str) -> Tuple:
+    # queue, stop event, started worker and the decoder of its messages
+    decode: Callable[[Any], Any]
+    if backend == "thread":
+        queue: Any = Queue(n)
+        stop: Any = threading.Event()
+        worker: Any = threading.Thread(
+            target=_produce, args=(iterable, queue, stop, _identity),
+            daemon=True)
+        decode = _identity
+    else:
+        context = multiprocessing.get_context()
+        queue = context.Queue(n)
+        stop = context.Event()
+        worker = context.Process(
+            target=_produce_process, args=(iterable, queue, stop), daemon=True)
+        decode = pickle.loads
+    worker.start()
+    return queue, stop, worker, decode
+
+
+def _receive(queue: Any, worker: Any) -> Any:
+    # next message of a worker, RuntimeError if it died without sending one
+    while True:
+        try:
+            return queue.get(timeout=_POLL)
+        except Empty:
+            if worker.is_alive():
+                continue
+        try:
+            # the last message may still be on its way
+            return queue.get(timeout=_POLL)
+        except Empty:
+            raise RuntimeError("prefetch worker died") from None
+
+
+def _stop_prefetch(queue: Any, stop: Any, worker: Any, backend: str) -> None:
+    stop.set()
+    if backend == "process":
+        worker.join(10 * _POLL)
+        if worker.is_alive():
+            worker.terminate()
+            worker.join()
+        queue.close()
+
+
+def _prefetch(iterable, n, backend):
+    # is a generator, so no worker is started before the first `next`
+    queue, stop, worker, decode = _start_prefetch(iterable, n, backend)
+    try:
+        while True:
+            kind, value = decode(_receive(queue, worker))
+            if kind == _ITEM:
+                yield value
+            elif kind == _DONE:
+                return
+            else:
+                raise value
+    finally:
+        _stop_prefetch(queue, stop, worker, backend)
+
+
+def check_batch_options(max_size: int, max_delay: Optional[float]) -> None:
+    """Raise ValueError for invalid `batch` options."""
+    if max_size < 1:
+        raise ValueError("max_size must be greater than 0")
+    if max_delay is not None and max_delay <= 0:
+        raise ValueError("max_delay must be greater than 0")
+
+
+def _stamped(message: Any) -> Any:
+    return message, time.monotonic()
+
+
+def batch(
+    iterable: Iterable[T], max_size: int, max_delay: Optional[float] = None
+) -> Iterator[List[T]]:
+    """
+    Lists of up to `max_size` elements, emitted early when the first element
+    of a batch was read `max_delay` seconds ago.
+
+    With `max_delay` a background thread reads `iterable`, so a batch is
+    emitted in time even while reading the next element blocks. The thread
+    reads up to `max_size` elements ahead. Exceptions of `iterable` are
+    raised after the batch of the elements before them.
+
+    >>> list(batch(range(5), 2))
+    [[0, 1], [2, 3], [4]]
+    >>> list(batch(range(5), 2, max_delay=1.0))
+    [[0, 1], [2, 3], [4]]
+
+    """
+    check_batch_options(max_size, max_delay)
+    if max_delay is None:
+        it = iter(iterable)
+        return iter(lambda: list(islice(it, max_size)), [])
+    return _batch(iterable, max_size, max_delay)
+
+
+def _collect(queue: Any, message: Any, max_size: int, deadline: float) -> Tuple:
+    # items of one batch from `message` on, with the kind and value of the
+    # message ending it, which is an item if the batch is full or late
+    kind, value = message
+    items = []
+    monotonic = time.monotonic
+    while kind == _ITEM:
+        items.append(value)
+        if len(items) == max_size:
+            break
+        timeout = deadline - monotonic()
+        try:
+            if timeout > 0:
+                (kind, value), _ = queue.get(timeout=timeout)
+            else:
+                (kind, value), _ = queue.get_nowait()
+        except Empty:
+            break
+    return items, kind, value
+
+
+def _batch(iterable, max_size, max_delay):
+    # is a generator, so no thread is started before the first `next`
+    queue: Any = Queue(max_size)
+    stop = threading.Event()
+    threading.Thread(
+        target=_produce, args=(iterable, queue, stop, _stamped), daemon=True
+    ).start()
+    try:
+        while True:
+            message, stamp = queue.get()
+            items, kind, value = _collect(
+                queue, message, max_size, stamp + max_delay)
+            if items:
+                yield items
+            if kind == _DONE:
+                return
+            if kind == _ERROR:
+                raise value
+    finally:
+        stop.set()
@@ -0,0 +1,149 @@
+# -*- coding=utf-8 -*-
+
+"""
+Per-stage statistics of instrumented Itr pipelines.
+
+>>> from iterage import itr
+>>> it = itr(range(100), instrument=True).map(abs).where(lambda x: x % 4 == 0)
+>>> it.to_list()[:3]
+[0, 4, 8]
+>>> [(s.name, s.elements_in, s.elements_out) for s in it.profile().stages]
+[('map(abs)', 100, 100), ('where(<lambda>)', 100, 25)]
+
+"""
+
+import re
+from time import perf_counter, thread_time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+__all__ = ("Profile", "StageProfile")
+
+
+def _stage_name(stage: Any) -> str:
+    name = re.sub(r"(?<!^)(?=[A-Z])", "_", type(stage).__name__).lower()
+    fn = getattr(stage, "fn", getattr(stage, "key", None))
+    if fn is None:
+        return name
+    return f"{name}({getattr(fn, '__qualname__', None) or repr(fn)})"
+
+
+class StageProfile:
+    """
+    Statistics of one stage.
+
+    Times are the wall clock and CPU time spent in the callables of the
+    stage, for example the function passed to `map`.
+    """
+
+    __slots__ = (
+        "name", "elements_in", "elements_out", "wall_time", "cpu_time")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.elements_in = 0
+        self.elements_out = 0
+        self.wall_time = 0.0
+        self.cpu_time = 0.0
+
+    @property
+    def selectivity(self) -> Optional[float]:
+        """Ratio of output to input elements."""
+        if not self.elements_in:
+            return None
+        return self.elements_out / self.elements_in
+
+    @property
+    def throughput(self) -> Optional[float]:
+        """Input elements per second of time spent in callables."""
+        if not self.wall_time:
+            return None
+        return self.elements_in / self.wall_time
+
+    def timed(self, fn: Callable) -> Callable:
+        """Wrap `fn` to add its run time to this stage."""
+        def timed(*args: Any) -> Any:
+            wall = perf_counter()
+            cpu = thread_time()
+            try:
+                return fn(*args)
+            finally:
+                self.cpu_time += thread_time() - cpu
+                self.wall_time += perf_counter() - wall
+
+        return timed
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "elements_in": self.elements_in,
+            "elements_out": self.elements_out,
+            "selectivity": self.selectivity,
+            "wall_time": self.wall_time,
+            "cpu_time": self.cpu_time,
+            "throughput": self.throughput,
+        }
+
+    def __repr__(self) -> str:
+        return (
+            f"StageProfile({self.name!r}, in={self.elements_in}, "
+            f"out={self.elements_out}, wall_time={self.wall_time:.6f})"
+        )
+
+
+def _counted(
+    iterable: Iterable, before: Optional[StageProfile],
+    after: Optional[StageProfile]
+) -> Iterator:
+    for e in iterable:
+        if before is not None:
+            before.elements_out += 1
+        if after is not None:
+            after.elements_in += 1
+        yield e
+
+
+class Profile:
+    """
+    Statistics of all stages of an instrumented Itr, in execution order.
+
+    Stages are recorded when they are built, operations that are not part
+    of the lazy plan (like `take_while`) show up as the input of the
+    following stage only.
+    """
+
+    def __init__(self):
+        self.stages: List[StageProfile] = []
+
+    def build(self, source: Iterable, stages: Iterable[Any]) -> Iterable:
+        """Build optimized stages with counting and timing."""
+        result = source
+        previous = None
+        for stage in stages:
+            stats = StageProfile(_stage_name(stage))
+            self.stages.append(stats)
+            result = _counted(result, previous, stats)
+            result = stage.instrument(stats.timed).build(result)
+            previous = stats
+        if previous is not None:
+            result = _counted(result, previous, None)
+        return result
+
+    def report(self) -> List[Dict[str, Any]]:
+        """Statistics of every stage as dicts."""
+        return [stats.to_dict() for stats in self.stages]
+
+    def __str__(self) -> str:
+        lines = [
+            f"{'stage':<30} {'in':>10} {'out':>10} {'sel':>6} "
+            f"{'wall s':>10} {'cpu s':>10}"
+        ]
+        for s in self.stages:
+            selectivity = "" if s.selectivity is None else f"{s.selectivity:.2f}"
+            lines.append(
+                f"{s.name[:30]:<30} {s.elements_in:>10} {s.elements_out:>10} "
+                f"{selectivity:>6} {s.wall_time:>10.6f} {s.cpu_time:>10.6f}"
+            )
+        return "\n".join(lines)
+
+    def __repr__(self) -> str:
+        return f"Profile({self.stages!r})"
@@ -0,0 +1,451 @@
+# -*- coding=utf-8 -*-
+
+"""
+Reducers: reductions that run together in a single pass, see `aggregate`
+and `fan_out`.
+
+Every reducer matches a reduction of :mod:`iterage.reduce` or a builtin.
+
+>>> aggregate([3, 1, 2], n=Count(), lo=Min(), odd=CountIf(lambda x: x % 2))
+{'n': 3, 'lo': 1, 'odd': 2}
+
+"""
+
+import typing
+from typing import Callable, Dict, Tuple
+
+from iterage.reduce import _NOTHING, _SENTINEL, consume
+
+__all__ = (
+    "Reducer", "Fold", "Count", "CountIf", "Sum", "Mean", "Min", "Max", "Any",
+    "All", "AllEqual", "First", "ToList", "ToSet", "Sink", "sink", "fan_out",
+    "aggregate",
+)
+
+
+class Reducer:
+    """
+    Specification of a reduction, that can run together with other
+    reductions in a single pass over a iterable.
+
+    `accumulator()` returns a fresh `(update, result)` pair of functions:
+    `update(x)` is called for every element, `result()` returns the result
+    after the last element. A reducer can be reused for any number of runs.
+
+    >>> Sum()(range(5))
+    10
+    >>> Count().where(lambda x: x > 2)(range(5))
+    2
+    >>> Max().map(len)(["a", "abc", "ab"])
+    3
+
+    """
+
+    __slots__ = ()
+
+    def accumulator(self):
+        raise NotImplementedError
+
+    def __call__(self, iterable):
+        update, result = self.accumulator()
+        consume(map(update, iterable))
+        return result()
+
+    def map(self, fn) -> "Reducer":
+        """Reduce `fn(x)` instead of `x`."""
+        return _Mapped(self, fn)
+
+    def where(self, pred) -> "Reducer":
+        """Reduce only elements where `pred(x)` is true."""
+        return _Filtered(self, pred)
+
+
+class _Mapped(Reducer):
+    __slots__ = ("_reducer", "_fn")
+
+    def __init__(self, reducer, fn):
+        self._reducer = reducer
+        self._fn = fn
+
+    def accumulator(self):
+        update, result = self._reducer.accumulator()
+        fn = self._fn
+
+        def mapped_update(x):
+            update(fn(x))
+
+        return mapped_update, result
+
+
+class _Filtered(_Mapped):
+    __slots__ = ()
+
+    def accumulator(self):
+        update, result = self._reducer.accumulator()
+        pred = self._fn
+
+        def filtered_update(x):
+            if pred(x):
+                update(x)
+
+        return filtered_update, result
+
+
+class Fold(Reducer):
+    """
+    Left fold with `fn(acc, x)`, like `functools.reduce` with initial value.
+
+    >>> Fold(lambda acc, x: acc * x, 1)(range(1, 5))
+    24
+
+    """
+
+    __slots__ = ("_fn", "_initial")
+
+    def __init__(self, fn, initial):
+        self._fn = fn
+        self._initial = initial
+
+    def accumulator(self):
+        fn = self._fn
+        acc = self._initial
+
+        def update(x):
+            nonlocal acc
+            acc = fn(acc, x)
+
+        return update, lambda: acc
+
+
+class Count(Reducer):
+    """Number of elements, see `ilen`."""
+
+    __slots__ = ()
+
+    def accumulator(self):
+        n = 0
+
+        def update(_x):
+            nonlocal n
+            n += 1
+
+        return update, lambda: n
+
+
+class CountIf(Reducer):
+    """Number of elements where `pred(x)` is true, see `icount_if`."""
+
+    __slots__ = ("_pred",)
+
+    def __init__(self, pred: Callable[[typing.Any], bool] = bool):
+        self._pred = pred
+
+    def accumulator(self):
+        return Count().where(self._pred).accumulator()
+
+
+class Sum(Reducer):
+    """Sum of elements, see `sum`."""
+
+    __slots__ = ("_start",)
+
+    def __init__(self, start=0):
+        self._start = start
+
+    def accumulator(self):
+        total = self._start
+
+        def update(x):
+            nonlocal total
+            total += x
+
+        return update, lambda: total
+
+
+class Mean(Reducer):
+    """
+    Arithmetic mean, raises ValueError for no elements.
+
+    >>> Mean()([1, 2, 3, 4])
+    2.5
+
+    """
+
+    __slots__ = ()
+
+    def accumulator(self):
+        total = 0
+        n = 0
+
+        def update(x):
+            nonlocal total, n
+            total += x
+            n += 1
+
+        def result():
+            if not n:
+                raise ValueError("mean of empty iterable")
+            return total / n
+
+        return update, result
+
+
+class _Extreme(Reducer):
+    __slots__ = ("_key", "_default")
+
+    def __init__(self, key=None, default=_NOTHING):
+        self._key = key
+        self._default = default
+
+    def _better(self, a, b) -> bool:
+        raise NotImplementedError
+
+    def accumulator(self):
+        key = self._key
+        better = self._better
+        best = best_key = _SENTINEL
+
+        def update(x):
+            nonlocal best, best_key
+            k = x if key is None else key(x)
+            if best is _SENTINEL or better(k, best_key):
+                best, best_key = x, k
+
+        def result():
+            if best is _SENTINEL:
+                if self._default is _NOTHING:
+                    raise ValueError(
+                        f"{type(self).__name__.lower()} of empty iterable"
+                    )
+                return self._default
+            return best
+
+        return update, result
+
+
+class Min(_Extreme):
+    """Smallest element, first of equal elements, see `min`."""
+
+    __slots__ = ()
+
+    def _better(self, a, b):
+        return a < b
+
+
+class Max(_Extreme):
+    """Largest element, first of equal elements, see `max`."""
+
+    __slots__ = ()
+
+    def _better(self, a, b):
+        return a > b
+
+
+class Any(Reducer):
+    """True if any element is true, see `any`."""
+
+    __slots__ = ()
+
+    def accumulator(self):
+        found = False
+
+        def update(x):
+            nonlocal found
+            if x:
+                found = True
+
+        return update, lambda: found
+
+
+class All(Reducer):
+    """True if all elements are true, see `all`."""
+
+    __slots__ = ()
+
+    def accumulator(self):
+        update, result = Any().accumulator()
+        return (lambda x: update(not x)), (lambda: not result())
+
+
+class AllEqual(Reducer):
+    """True if all elements are equal to each other, see `all_equal`."""
+
+    __slots__ = ()
+
+    def accumulator(self):
+        first = _SENTINEL
+        equal = True
+
+        def update(x):
+            nonlocal first, equal
+            if first is _SENTINEL:
+                first = x
+            elif equal and not x == first:
+                equal = False
+
+        return update, lambda: equal
+
+
+class First(Reducer):
+    """First element or `default`, see `first`."""
+
+    __slots__ = ("_default",)
+
+    def __init__(self, default=None):
+        self._default = default
+
+    def accumulator(self):
+        value = _SENTINEL
+
+        def update(x):
+            nonlocal value
+            if value is _SENTINEL:
+                value = x
+
+        return update, lambda: self._default if value is _SENTINEL else value
+
+
+class ToList(Reducer):
+    """All elements in a list, see `list`."""
+
+    __slots__ = ()
+
+    def accumulator(self):
+        result: list = []
+        return result.append, lambda: result
+
+
+class ToSet(Reducer):
+    """All unique elements in a set, see `set`."""
+
+    __slots__ = ()
+
+    def accumulator(self):
+        result: set = set()
+        return result.add, lambda: result
+
+
+class _Taken(_Mapped):
+    __slots__ = ()
+
+    def accumulator(self):
+        update, result = self._reducer.accumulator()
+        left = self._fn
+
+        def taken_update(x):
+            nonlocal left
+            if left > 0:
+                left -= 1
+                update(x)
+
+        return taken_update, result
+
+
+class Sink:
+    """
+    Builder for reducers that read like a Itr pipeline.
+
+    Start from `sink`, add `map`/`where`/`take` steps and finish with a
+    terminal like `to_list`, which returns the Reducer.
+
+    >>> r = sink.where(lambda x: x % 2).map(str).to_list()
+    >>> r(range(6))
+    ['1', '3', '5']
+
+    """
+
+    __slots__ = ("_steps",)
+
+    def __init__(self, steps: Tuple = ()):
+        self._steps = steps
+
+    def _then(self, step: Callable[[Reducer], Reducer]) -> "Sink":
+        return Sink(self._steps + (step,))
+
+    def map(self, fn) -> "Sink":
+        return self._then(lambda r: r.map(fn))
+
+    def where(self, pred) -> "Sink":
+        return self._then(lambda r: r.where(pred))
+
+    def where_not(self, pred) -> "Sink":
+        return self._then(lambda r: r.where(lambda x: not pred(x)))
+
+    def take(self, n: int) -> "Sink":
+        if n < 0:
+            raise ValueError("n must be greater than or equal 0")
+        return self._then(lambda r: _Taken(r, n))
+
+    def into(self, reducer: Reducer) -> Reducer:
+        """Finish with any reducer."""
+        for step in reversed(self._steps):
+            reducer = step(reducer)
+        return reducer
+
+    def to_list(self) -> Reducer:
+        return self.into(ToList())
+
+    def to_set(self) -> Reducer:
+        return self.into(ToSet())
+
+    def len(self) -> Reducer:
+        return self.into(Count())
+
+    def sum(self) -> Reducer:
+        return self.into(Sum())
+
+    def min(self, key=None, default=_NOTHING) -> Reducer:
+        return self.into(Min(key, default))
+
+    def max(self, key=None, default=_NOTHING) -> Reducer:
+        return self.into(Max(key, default))
+
+    def any(self) -> Reducer:
+        return self.into(Any())
+
+    def all(self) -> Reducer:
+        return self.into(All())
+
+    def first(self, default=None) -> Reducer:
+        return self.into(First(default))
+
+    def reduce(self, fn, initial) -> Reducer:
+        return self.into(Fold(fn, initial))
+
+
+#: start of every `Sink` pipeline
+sink = Sink()
+
+
+def fan_out(iterable, *reducers: Reducer) -> Tuple:
+    """
+    Push every element into all reducers in a single pass.
+
+    Returns the results in the order of the reducers.
+
+    >>> fan_out(range(5), sink.where(lambda x: x > 2).to_list(), Sum())
+    ([3, 4], 10)
+
+    """
+    accumulators = [reducer.accumulator() for reducer in reducers]
+    updates = [update for update, _ in accumulators]
+
+    if len(updates) == 1:
+        consume(map(updates[0], iterable))
+    else:
+        for x in iterable:
+            for update in updates:
+                update(x)
+
+    return tuple(result() for _, result in accumulators)
+
+
+def aggregate(iterable, **reducers: Reducer) -> Dict[str, typing.Any]:
+    """
+    Run several reducers in a single pass over iterable.
+
+    >>> aggregate(range(5), n=Count(), total=Sum(), hi=Max())
+    {'n': 5, 'total': 10, 'hi': 4}
+
+    """
+    return dict(zip(reducers, fan_out(iterable, *reducers.values())))
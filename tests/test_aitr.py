@@ -0,0 +1,103 @@
+# -*- coding=utf-8 -*-
+
+import asyncio
+import unittest
+
+from iterage.aitr import aitr
+
+
+async def agen(n):
+    for i in range(n):
+        await asyncio.sleep(0)
+        yield i
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+class AsyncItrTests(unittest.TestCase):
+    def test_iter(self):
+        self.assertEqual(run(aitr(agen(3)).to_list()), [0, 1, 2])
+        self.assertEqual(run(aitr([1, 2]).to_tuple()), (1, 2))
+
+    def test_selecting(self):
+        self.assertEqual(run(aitr(agen(10)).take(3).to_list()), [0, 1, 2])
+        self.assertEqual(run(aitr(agen(10)).drop(8).to_list()), [8, 9])
+        self.assertEqual(run(aitr(agen(10)).slice(1, None, 4).to_list()), [1, 5, 9])
+        self.assertEqual(run(aitr(agen(10)).take(0).to_list()), [])
+        self.assertEqual(
+            run(aitr(agen(10)).where(lambda x: x % 3 == 0).where_not(None).to_list()),
+            [0],
+        )
+        self.assertEqual(
+            run(aitr(agen(10)).take_while(lambda x: x < 3).to_list()), [0, 1, 2])
+        self.assertEqual(
+            run(aitr(agen(5)).drop_while(lambda x: x < 3).to_list()), [3, 4])
+
+        with self.assertRaises(ValueError):
+            aitr(agen(1)).take(-1)
+
+    def test_mapping(self):
+        self.assertEqual(
+            run(aitr(agen(5)).map(str).chunk(2).to_list()),
+            [("0", "1"), ("2", "3"), ("4",)],
+        )
+        self.assertEqual(
+            run(aitr(agen(3)).enumerate(1).star_map(lambda i, x: i * x).to_list()),
+            [0, 2, 6],
+        )
+        self.assertEqual(
+            run(aitr(agen(3)).flat_map(lambda x: [x] * x).to_list()), [1, 2, 2])
+
+    def test_amap(self):
+        running = 0
+        peak = 0
+
+        async def work(x):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.001 * (1 + x % 3))
+            running -= 1
+            return x
+
+        self.assertEqual(
+            run(aitr(agen(20)).amap(work, limit=4).to_list()), list(range(20)))
+        self.assertEqual(peak, 4)
+        self.assertEqual(
+            sorted(run(aitr(agen(20)).amap(work, 5, ordered=False).to_list())),
+            list(range(20)),
+        )
+        self.assertEqual(run(aitr(agen(20)).amap(work, 5).first()), 0)
+
+    def test_amap_close(self):
+        started = []
+
+        async def work(x):
+            started.append(asyncio.current_task())
+            await asyncio.sleep(0 if x == 0 else 10)
+            return x
+
+        async def first_and_close():
+            it = aitr(agen(5)).amap(work, limit=3).__aiter__()
+            first = await it.__anext__()
+            await it.aclose()
+            return first, [task.done() for task in started]
+
+        # the other tasks are cancelled and finished when closing
+        self.assertEqual(run(first_and_close()), (0, [True, True, True]))
+
+    def test_reduce(self):
+        self.assertEqual(run(aitr(agen(5)).sum()), 10)
+        self.assertEqual(run(aitr(agen(5)).len()), 5)
+        self.assertEqual(run(aitr(agen(5)).max(key=lambda x: -x)), 0)
+        self.assertEqual(run(aitr(agen(5)).min()), 0)
+        self.assertEqual(run(aitr(agen(0)).min(default=None)), None)
+        self.assertEqual(run(aitr(agen(5)).reduce(lambda a, b: a * b, 1)), 0)
+        self.assertEqual(run(aitr(agen(5)).first()), 0)
+        self.assertTrue(run(aitr(agen(0)).is_empty()))
+        self.assertTrue(run(aitr(agen(5)).any()))
+        self.assertFalse(run(aitr(agen(5)).all()))
+        self.assertEqual(run(aitr(agen(5)).find_first(lambda x: x > 2)), 3)
+        self.assertEqual(run(aitr(agen(5)).count(3)), 1)
@@ -0,0 +1,99 @@
+# -*- coding=utf-8 -*-
+
+import random
+import unittest
+from operator import itemgetter
+from unittest import mock
+
+from iterage import dedup, external, uniq
+from iterage.external import external_group_by, external_sort
+from iterage.itr import itr
+
+
+class ExternalGroupByTests(unittest.TestCase):
+    def test_in_memory(self):
+        self.assertEqual(
+            list(external_group_by("abcab", str.upper, max_in_memory=10)),
+            [("A", ["a", "a"]), ("B", ["b", "b"]), ("C", ["c"])],
+        )
+        self.assertEqual(list(external_group_by([], str, max_in_memory=1)), [])
+
+    def test_spilled(self):
+        data = [random.randrange(1000) for _ in range(5000)]
+        expected = itr(data).group_by(lambda x: x % 37)
+
+        result = dict(external_group_by(data, lambda x: x % 37, 100, partitions=4))
+        self.assertEqual(result, expected)
+
+    def test_single_key(self):
+        result = list(external_group_by(range(100), lambda x: 0, 10))
+        self.assertEqual(result, [(0, list(range(100)))])
+
+    def test_itr(self):
+        self.assertEqual(
+            sorted(itr(range(10)).group_by_external(lambda x: x % 3, max_in_memory=3)),
+            [(0, [0, 3, 6, 9]), (1, [1, 4, 7]), (2, [2, 5, 8])],
+        )
+
+        with self.assertRaises(ValueError):
+            itr(range(10)).group_by_external(str, max_in_memory=0)
+
+
+class ExternalSortTests(unittest.TestCase):
+    def test_sort(self):
+        data = [random.randrange(1000) for _ in range(5000)]
+        self.assertEqual(list(external_sort(data, max_in_memory=100)), sorted(data))
+        self.assertEqual(list(external_sort(data, max_in_memory=10 ** 4)), sorted(data))
+        self.assertEqual(list(external_sort([], max_in_memory=1)), [])
+
+    def test_stable(self):
+        data = [(random.randrange(10), i) for i in range(1000)]
+        key = itemgetter(0)
+        self.assertEqual(
+            list(external_sort(data, key=key, max_in_memory=7)),
+            sorted(data, key=key),
+        )
+
+    def test_multi_pass(self):
+        data = list(range(3000, 0, -1))
+        self.assertEqual(list(external_sort(data, max_in_memory=10)), sorted(data))
+
+    def test_in_memory(self):
+        with mock.patch.object(external, "_spill") as spill:
+            self.assertEqual(list(external_sort([3, 1, 2], max_in_memory=3)), [1, 2, 3])
+        spill.assert_not_called()
+
+    def test_merge_budget(self):
+        sizes = []
+        merge = external.merge
+
+        def tracked(*sources, key):
+            sizes.append(len(sources))
+            return merge(*sources, key=key)
+
+        data = list(range(3000, 0, -1))
+        with mock.patch.object(external, "merge", tracked), \
+                mock.patch.object(external, "_spill", wraps=external._spill) as spill:
+            self.assertEqual(list(external_sort(data, max_in_memory=100)), sorted(data))
+        batch = {call.args[2] for call in spill.call_args_list}
+        self.assertLessEqual(max(sizes) * max(batch), 100)
+
+    def test_unique(self):
+        data = [(random.randrange(10), i) for i in range(1000)]
+        key = itemgetter(0)
+        self.assertEqual(
+            list(external_sort(data, key=key, max_in_memory=30, unique=True)),
+            list(uniq(sorted(data, key=key), key)),
+        )
+
+    def test_itr(self):
+        self.assertEqual(
+            itr(x % 10 for x in range(100)).sort(max_in_memory=9).take(3).to_list(),
+            [0, 0, 0],
+        )
+        self.assertEqual(
+            itr(x % 10 for x in range(100)).dedup(max_in_memory=9).to_list(),
+            list(range(10)),
+        )
+        self.assertEqual(
+            list(dedup([3, 1, 2, 1, 3], max_in_memory=2)), [1, 2, 3])
@@ -0,0 +1,72 @@
+# -*- coding=utf-8 -*-
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from iterage import files
+from iterage.files import read_lines, read_records, split_file
+from iterage.itr import Itr
+
+
+class FileTestCase(unittest.TestCase):
+    def write(self, data: bytes) -> str:
+        fd, path = tempfile.mkstemp()
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        self.addCleanup(os.remove, path)
+        return path
+
+
+class ReadLinesTests(FileTestCase):
+    def test_lines(self):
+        path = self.write(b"a\n\nbb\nc\xc3\xa4")
+        self.assertEqual(list(read_lines(path)), ["a", "", "bb", "cä"])
+        self.assertEqual(list(read_lines(path, encoding="latin-1"))[-1], "cÃ¤")
+        self.assertEqual(
+            [bytes(line) for line in read_lines(path, encoding=None)],
+            [b"a", b"", b"bb", b"c\xc3\xa4"],
+        )
+        self.assertEqual(list(read_lines(self.write(b"a\r\nb\r\n"), b"\r\n")), ["a", "b"])
+        self.assertEqual(list(read_lines(self.write(b""))), [])
+
+    def test_windows(self):
+        data = b"".join(b"%d\n" % i for i in range(1000))
+        path = self.write(data)
+        expected = data.decode().splitlines()
+        with mock.patch.object(files, "_WINDOW", 7):
+            self.assertEqual(list(read_lines(path)), expected)
+
+    def test_ranges(self):
+        data = b"".join(b"x" * (i % 13) + b"\n" for i in range(300))
+        path = self.write(data)
+        expected = data.decode().splitlines()
+        for parts in (1, 3, 7, 1000):
+            for encoding in ("ascii", None):
+                lines = [
+                    str(line, "ascii") if encoding is None else line
+                    for start, stop in split_file(path, parts)
+                    for line in read_lines(path, encoding=encoding, start=start, stop=stop)
+                ]
+                self.assertEqual(lines, expected)
+
+
+class ReadRecordsTests(FileTestCase):
+    def test_records(self):
+        path = self.write(bytes(range(10)))
+        records = list(read_records(path, 4))
+        self.assertEqual([r.tolist() for r in records], [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]])
+        self.assertEqual(
+            [r.tolist() for a, b in split_file(path, 2, 4) for r in read_records(path, 4, a, b)],
+            [r.tolist() for r in records],
+        )
+        self.assertEqual(split_file(path, 2, 4), [(0, 4), (4, 12)])
+        self.assertRaises(ValueError, read_records, path, 0)
+
+    def test_itr(self):
+        path = self.write(b"3\n1\n2\n")
+        self.assertEqual(Itr.from_file(path).map(int).sum(), 6)
+        self.assertEqual(Itr.from_file(path, "records", record_size=2).map(bytes).to_list(), [b"3\n", b"1\n", b"2\n"])
+        self.assertRaises(ValueError, Itr.from_file, path, "records")
+        self.assertRaises(ValueError, Itr.from_file, path, "words")
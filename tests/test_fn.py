@@ -0,0 +1,52 @@
+# -*- coding=utf-8 -*-
+
+import operator
+import unittest
+
+from iterage.fn import ExprFn, _, _1, _2, isin, is_expr_function, λ
+
+
+class Point:
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+
+class ExprFnTests(unittest.TestCase):
+    def test_compile(self):
+        p = Point(3, 4)
+        self.assertEqual(λ(_.x * _.y + 1)(p), 13)
+        self.assertEqual(λ(10 - _ // 3 % 2)(7), 10)
+        self.assertEqual(λ(_[1] ^ 1)((0, 2)), 3)
+        self.assertEqual(λ(_1 * 2 + _2)(3, 4), 10)
+        self.assertTrue(λ(isin(_, "abc"))("b"))
+        self.assertTrue(λ(_ >= 2)(2))
+        self.assertFalse(λ(_ != 2)(2))
+        self.assertEqual(λ(ExprFn(abs)(_) + 1)(-2), 3)
+        self.assertEqual(λ((_ * 2)(_ + 1))(3), 8)
+        self.assertEqual(λ(_1.real(_2))(None, 3), 3)
+
+    def test_lowering(self):
+        self.assertEqual(repr(λ(_.x.y)), repr(operator.attrgetter("x.y")))
+        self.assertIsInstance(λ(_["key"]), operator.itemgetter)
+        self.assertIs(λ(_1 + _2), operator.add)
+        self.assertIs(λ(ExprFn(abs)), abs)
+
+    def test_cached(self):
+        expr = _ * 2
+        self.assertIs(λ(expr), λ(expr))
+        self.assertTrue(is_expr_function(λ(expr)))
+        self.assertFalse(is_expr_function(lambda x: x * 2))
+
+    def test_user_function_not_tagged(self):
+        def double(x):
+            return x * 2
+
+        self.assertIs(λ(ExprFn(double)), double)
+        self.assertFalse(is_expr_function(double))
+        self.assertFalse(is_expr_function(λ(ExprFn(double)(_) + 1)))
+
+    def test_constants(self):
+        key = object()
+        self.assertIs(λ(_[key])({key: key}), key)
+        self.assertEqual(λ(_ + [1])([0]), [0, 1])
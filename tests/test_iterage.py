@@ -22,6 +22,10 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
+import array
+import os
+import subprocess
+import sys
 import unittest
 from typing import Iterable, List, Tuple
 
@@ -113,3 +117,95 @@ class IterageChunkTests(unittest.TestCase):
         self.assertEqual(
             _to_2d_list(iterage.chunk(range(1), 3)),
             [[0]])
+
+    def test_zeroCopy(self):
+        data = bytearray(b"abcdefg")
+        chunks = list(iterage.chunk(data, 3))
+        self.assertTrue(all(isinstance(c, memoryview) for c in chunks))
+        data[0] = ord("x")
+        self.assertEqual([bytes(c) for c in chunks], [b"xbc", b"def", b"g"])
+
+        numbers = array.array("i", range(5))
+        self.assertEqual(_to_2d_list(iterage.chunk(numbers, 2)), [[0, 1], [2, 3], [4]])
+
+        items = [0, 1, 2, 3, 4]
+        chunks = list(iterage.chunk(items, 2))
+        items[4] = 5
+        self.assertEqual(chunks, [[0, 1], [2, 3], [5]])
+        self.assertEqual(list(iterage.chunk("abc", 2)), ["ab", "c"])
+
+
+class IterageDedupTests(unittest.TestCase):
+    def test_sort(self):
+        self.assertEqual(list(iterage.dedup([3, 1, 3, 2])), [1, 2, 3])
+
+    def test_hash(self):
+        self.assertEqual(list(iterage.dedup([3, 1, 3, 2], mode="hash")), [3, 1, 2])
+        self.assertEqual(
+            list(iterage.dedup(["a", "B", "b", "A"], str.lower, mode="hash")),
+            ["a", "B"],
+        )
+        self.assertEqual(list(iterage.dedup([{1}, 1], type, mode="hash")), [{1}, 1])
+
+    def test_bloom(self):
+        data = list(range(1000)) * 2
+        result = list(iterage.dedup(data, mode="bloom", capacity=1000, error_rate=0.01))
+        self.assertGreater(len(result), 950)
+        self.assertEqual(len(set(result)), len(result))
+        self.assertEqual(
+            list(iterage.dedup("aAbB", str.lower, mode="bloom", capacity=10)), ["a", "b"])
+
+        with self.assertRaises(ValueError):
+            iterage.dedup([], mode="bloom", error_rate=2)
+
+    def test_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            iterage.dedup([], mode="fast")
+
+    def test_max_in_memory(self):
+        self.assertEqual(list(iterage.dedup([3, 1, 3], max_in_memory=1)), [1, 3])
+        for mode in ("hash", "bloom"):
+            with self.assertRaises(ValueError):
+                iterage.dedup([], mode=mode, max_in_memory=10)
+
+
+class IterageImportTests(unittest.TestCase):
+    def run_python(self, code: str) -> str:
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.pathsep.join(sys.path)
+        return subprocess.run(
+            [sys.executable, "-c", code], env=env, check=True,
+            stdout=subprocess.PIPE, universal_newlines=True).stdout.strip()
+
+    def test_lazy(self):
+        loaded = self.run_python(
+            "import sys, iterage; print(sorted(m for m in ("
+            "'iterage.aitr', 'iterage.parallel', 'iterage.external', "
+            "'iterage.join', 'iterage.reducers', 'iterage._numpy', 'asyncio', "
+            "'concurrent.futures', 'importlib.metadata') if m in sys.modules))")
+        self.assertEqual(loaded, "[]")
+
+    def test_lazy_names(self):
+        self.assertTrue(callable(iterage.itr))
+        self.assertTrue(callable(iterage.par_map))
+        self.assertTrue(callable(iterage.iterate))
+        self.assertIsInstance(iterage.__version__, str)
+        self.assertIn("itr", dir(iterage))
+        with self.assertRaises(AttributeError):
+            iterage.does_not_exist
+
+    def test_submodule_does_not_shadow(self):
+        self.assertEqual(
+            self.run_python(
+                "import iterage.itr, iterage; print(callable(iterage.itr))"),
+            "True")
+
+    def test_star_import(self):
+        loaded = self.run_python(
+            "import sys; from iterage import *; print(sorted(m for m in ("
+            "'iterage.aitr', 'iterage.parallel', 'asyncio', 'concurrent.futures'"
+            ") if m in sys.modules))")
+        self.assertEqual(loaded, "[]")
+        for name in iterage.__all__:
+            self.assertTrue(callable(getattr(iterage, name)), name)
+        self.assertNotIn("deque", iterage.__all__)
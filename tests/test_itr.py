@@ -1,6 +1,12 @@
 # -*- coding=utf-8 -*-
 
+import operator
+import random
+import threading
+import time
 import unittest
+from collections import deque
+from collections.abc import Sequence
 
 from iterage.itr import itr
 
@@ -34,3 +40,309 @@ class ItrTests(unittest.TestCase):
             itr([1, 2]).take(-1)
         with self.assertRaises(ValueError):
             itr([1, 2]).take("1")
+
+    def test_slice(self):
+        self.assertEqual(list(itr(range(10)).slice(1, None, 2).take(3)), [1, 3, 5])
+        self.assertEqual(list(itr(range(10)).drop(2).drop(3)), [5, 6, 7, 8, 9])
+        self.assertEqual(list(itr(range(10)).take(5).drop(3)), [3, 4])
+        self.assertEqual(list(itr(range(10)).drop(3).take(2)), [3, 4])
+        self.assertEqual(list(itr(range(10)).take(2).take(5)), [0, 1])
+
+        with self.assertRaises(ValueError):
+            itr([1, 2]).slice(0, 2, 0)
+
+    def test_map_where(self):
+        self.assertEqual(
+            itr(range(10))
+            .map(lambda x: x * 3)
+            .where(lambda x: x % 2)
+            .where_not(lambda x: x == 9)
+            .to_list(),
+            [3, 15, 21, 27],
+        )
+        self.assertEqual(
+            itr(range(10))
+            .map(lambda x: (x, x * 3))
+            .star_map(lambda x, y: x + y)
+            .where(lambda x: x % 3)
+            .where(None)
+            .to_list(),
+            [4, 8, 16, 20, 28, 32],
+        )
+        self.assertEqual(
+            itr([0, 1, None, 2]).where_not(None).to_list(), [0, None])
+
+    def test_take_before_map(self):
+        calls = []
+
+        def fn(x):
+            calls.append(x)
+            return x * 2
+
+        self.assertEqual(itr(range(100)).map(fn).drop(10).take(2).to_list(), [20, 22])
+        self.assertEqual(calls, [10, 11])
+
+    def test_len(self):
+        def fail(x):
+            raise AssertionError("must not be called")
+
+        self.assertEqual(itr(range(10 ** 9)).map(fail).take(5).len(), 5)
+        self.assertEqual(itr(range(10)).enumerate().zip("abc").len(), 3)
+        self.assertEqual(itr(range(10)).zip_longest("abc").len(), 10)
+        self.assertEqual(itr(range(10)).chunk(3).len(), 4)
+        self.assertEqual(itr(range(10)).chunk_filled(3).len(), 4)
+        self.assertEqual(itr(range(10)).chunk_trunc(3).len(), 3)
+        self.assertEqual(itr(range(10)).slice(1, 8, 3).len(), 3)
+        self.assertEqual(itr(range(10)).where(lambda x: x > 6).len(), 3)
+        self.assertEqual(itr(iter(range(10))).take(3).len(), 3)
+
+    def test_chunk_size(self):
+        for adaptor in ("chunk", "chunk_filled", "chunk_trunc"):
+            with self.assertRaises(ValueError):
+                getattr(itr([1, 2, 3]), adaptor)(0).len()
+            with self.assertRaises(ValueError):
+                getattr(itr(iter([1, 2, 3])), adaptor)(0).to_list()
+
+    def test_length_hint(self):
+        self.assertEqual(operator.length_hint(itr([1, 2, 3]).map(str)), 3)
+        self.assertEqual(operator.length_hint(itr(iter(range(9))).drop(2)), 7)
+        self.assertEqual(operator.length_hint(itr(range(9)).where(bool)), 0)
+        self.assertEqual(itr(range(4)).map(str).to_tuple(), ("0", "1", "2", "3"))
+
+    def test_random_access(self):
+        class Seq(Sequence):
+            def __init__(self, n):
+                self.n = n
+
+            def __len__(self):
+                return self.n
+
+            def __getitem__(self, i):
+                if not 0 <= i < self.n:
+                    raise IndexError(i)
+                return i
+
+        # other sequences are not known to index in O(1) and are iterated
+        seq = Seq(10)
+        self.assertEqual(itr(seq).take_last(2).to_list(), [8, 9])
+        self.assertEqual(itr(seq).nth(5), 4)
+        self.assertEqual(itr(seq).map(str).drop(7).take(2).to_list(), ["7", "8"])
+        self.assertEqual(itr(seq).reverse().take(2).to_list(), [9, 8])
+
+        big = range(10 ** 9)
+        self.assertEqual(itr(big).take_last(2).to_list(), [10 ** 9 - 2, 10 ** 9 - 1])
+        self.assertEqual(itr(big).reverse().take(2).to_list(), [10 ** 9 - 1, 10 ** 9 - 2])
+
+        for src in ([1, 2, 3], (1, 2, 3), range(1, 4), memoryview(bytes([1, 2, 3]))):
+            self.assertEqual(itr(src).take_last(2).to_list(), [2, 3])
+            self.assertEqual(itr(src).reverse().to_list(), [3, 2, 1])
+            self.assertEqual(itr(src).drop(1).to_list(), [2, 3])
+            self.assertEqual(itr(src).slice(0, None, 2).reverse().to_list(), [3, 1])
+            self.assertEqual(itr(src).cycle().take(5).to_list(), [1, 2, 3, 1, 2])
+            self.assertEqual(itr(src).nth(3), 3)
+            self.assertEqual(itr(src).nth(4, -1), -1)
+
+        self.assertEqual(itr([]).cycle().to_list(), [])
+        self.assertEqual(itr(iter([1, 2])).cycle().take(3).to_list(), [1, 2, 1])
+
+    def test_deque_source(self):
+        # deque indexing is O(n), so it must not be sliced by index
+        source = deque(range(10 ** 5))
+        start = time.perf_counter()
+        self.assertEqual(itr(source).reverse().to_list(), list(range(10 ** 5 - 1, -1, -1)))
+        self.assertEqual(itr(source).drop(5).slice(0, None, 3).len(), 33332)
+        self.assertEqual(itr(source).take_last(3).to_list(), [99997, 99998, 99999])
+        self.assertEqual(
+            itr(iter(range(10 ** 5))).take_last(10 ** 4).drop(1).reverse().first(), 10 ** 5 - 1)
+        self.assertLess(time.perf_counter() - start, 5)
+
+    def test_par_map(self):
+        for backend in ("thread", "process"):
+            self.assertEqual(
+                itr(range(20)).par_map(abs, workers=2, backend=backend).to_list(),
+                list(range(20)),
+            )
+        self.assertEqual(
+            sorted(itr(range(20)).par_map(abs, chunksize=3, ordered=False)),
+            list(range(20)),
+        )
+        self.assertEqual(
+            itr(range(100)).par_map(str, chunksize=7, max_in_flight=2).drop(95).len(), 5
+        )
+        with self.assertRaises(ValueError):
+            itr([]).par_map(abs, backend="gpu")
+
+        def fail(x):
+            raise KeyError(x)
+
+        with self.assertRaises(KeyError):
+            itr(range(3)).par_map(fail).to_list()
+
+    def test_par_map_bounded(self):
+        pulled = []
+
+        def source():
+            for i in range(1000):
+                pulled.append(i)
+                yield i
+
+        it = iter(itr(source()).par_map(abs, workers=2, max_in_flight=4))
+        self.assertEqual(next(it), 0)
+        it.close()
+        self.assertLessEqual(len(pulled), 6)
+
+    def test_prefetch(self):
+        for backend in ("thread", "process"):
+            self.assertEqual(
+                itr(range(100)).map(abs).prefetch(3, backend).map(str).to_list(),
+                list(map(str, range(100))),
+            )
+            self.assertEqual(itr([]).prefetch(1, backend).to_list(), [])
+
+            def fail():
+                yield 1
+                raise KeyError(2)
+
+            it = iter(itr(fail()).prefetch(4, backend))
+            self.assertEqual(next(it), 1)
+            with self.assertRaises(KeyError):
+                next(it)
+
+        self.assertEqual(itr(range(10)).prefetch(2).len(), 10)
+        self.assertRaises(ValueError, itr([]).prefetch, 0)
+        self.assertRaises(ValueError, itr([]).prefetch, 1, "gpu")
+
+    def test_prefetch_runs_ahead(self):
+        pulled = []
+        ahead = threading.Event()
+        closed = threading.Event()
+
+        def source():
+            try:
+                for i in range(1000):
+                    pulled.append(i)
+                    if len(pulled) == 6:
+                        ahead.set()
+                    yield i
+            finally:
+                closed.set()
+
+        it = iter(itr(source()).prefetch(4))
+        self.assertEqual(next(it), 0)
+        # the worker reads ahead while the consumer waits, but not further
+        # than the queue allows
+        self.assertTrue(ahead.wait(5))
+        self.assertLessEqual(len(pulled), 6)
+        it.close()
+        self.assertTrue(closed.wait(5))
+        self.assertLessEqual(len(pulled), 7)
+
+    def test_batch(self):
+        for delay in (None, 1.0):
+            self.assertEqual(
+                itr(range(7)).batch(3, delay).to_list(),
+                [[0, 1, 2], [3, 4, 5], [6]],
+            )
+            self.assertEqual(itr([]).batch(3, delay).to_list(), [])
+        self.assertEqual(itr(range(7)).batch(3).len(), 3)
+        self.assertRaises(ValueError, itr([]).batch, 0)
+        self.assertRaises(ValueError, itr([]).batch, 1, 0)
+
+        def fail():
+            yield 1
+            raise KeyError(2)
+
+        it = iter(itr(fail()).batch(5, 1.0))
+        self.assertEqual(next(it), [1])
+        with self.assertRaises(KeyError):
+            next(it)
+
+    def test_batch_delay(self):
+        release = threading.Event()
+
+        def source():
+            yield 1
+            yield 2
+            release.wait(5)  # blocks the reader
+            yield 3
+
+        it = iter(itr(source()).batch(10, max_delay=0.05))
+        start = time.monotonic()
+        self.assertEqual(next(it), [1, 2])
+        self.assertLess(time.monotonic() - start, 2)
+        release.set()
+        self.assertEqual(list(it), [[3]])
+
+    def test_top_k(self):
+        data = [(x * 7919) % 101 for x in range(500)]
+        self.assertEqual(itr(data).top_k(5).to_list(), sorted(data, reverse=True)[:5])
+        self.assertEqual(itr(data).bottom_k(5).to_list(), sorted(data)[:5])
+        self.assertEqual(itr(iter(data)).top_k(3, key=lambda x: -x).to_list(), [0, 0, 0])
+        self.assertEqual(itr(data).top_k(0).to_list(), [])
+        self.assertEqual(itr([1, 2]).top_k(5).to_list(), [2, 1])
+        self.assertEqual(itr(data).min(key=lambda x: -x), 100)
+
+    def test_sort_take(self):
+        data = [(i % 3, i) for i in range(100)]
+
+        def key(x):
+            return x[0]
+
+        self.assertEqual(itr(data).sort(key).take(4).to_list(), sorted(data, key=key)[:4])
+        self.assertEqual(itr(data).sort(key).first(), (0, 0))
+        self.assertEqual(itr(data).sort(key).slice(2, 5).to_list(), sorted(data, key=key)[2:5])
+        self.assertEqual(itr([]).sort().first(-1), -1)
+        self.assertEqual(itr(data).sort(key).map(key).take(2).len(), 2)
+
+    def test_batched(self):
+        data = list(range(100))
+
+        def pipeline(it):
+            return it.map(lambda x: x * 3).where(lambda x: x % 2).take_while(lambda x: x < 250).map(str)
+
+        expected = pipeline(itr(data)).to_list()
+        for size in (1, 7, 1000):
+            for source in (data, iter(data), range(100)):
+                self.assertEqual(pipeline(itr(source).batched(size)).to_list(), expected)
+
+        self.assertEqual(itr(iter(data)).batched(8).where_not(lambda x: x % 3).sum(), sum(data[::3]))
+        self.assertEqual(itr(data).batched(8).map(lambda x: -x).min(), -99)
+        self.assertEqual(itr(data).batched(8).where(lambda x: x > 90).max(), 99)
+        self.assertEqual(itr(data).batched(8).where(lambda x: x > 90).len(), 9)
+        self.assertEqual(itr(data).batched(8).drop(5).where(None).len(), 95)
+        self.assertTrue(itr(data).batched(8).any())
+        self.assertFalse(itr(data).batched(8).all())
+        self.assertEqual(itr([(1, 2), (3, 4)]).batched(1).star_map(operator.add).to_list(), [3, 7])
+        self.assertRaises(ValueError, itr(data).batched(8).where(lambda x: x > 100).max)
+        self.assertRaises(ValueError, itr(data).batched, 0)
+
+    def test_sliding_step(self):
+        data = list(range(10))
+        for length in (1, 3, 4):
+            for step in (1, 2, 3, 5):
+                windows = itr(data).sliding(length, step).to_list()
+                expected = [tuple(data[i : i + length]) for i in range(0, len(data) - length + 1, step)]
+                self.assertEqual(windows, expected)
+        self.assertEqual(itr(range(2)).sliding(3, 2).to_list(), [(0, 1)])
+        self.assertRaises(ValueError, itr(data).sliding, 2, 0)
+
+    def test_rolling(self):
+        random.seed(17)
+        data = [random.randrange(100) for _ in range(200)]
+        for length in (1, 2, 7, 300):
+            for step in (1, 3, 10):
+                windows = itr(data).sliding(length, step).to_list()
+                self.assertEqual(itr(data).rolling_sum(length, step).to_list(), list(map(sum, windows)))
+                self.assertEqual(itr(iter(data)).rolling_min(length, step).to_list(), list(map(min, windows)))
+                self.assertEqual(itr(data).rolling_max(length, step).to_list(), list(map(max, windows)))
+                self.assertEqual(
+                    itr(data).rolling_mean(length, step).to_list(),
+                    [sum(w) / len(w) for w in windows],
+                )
+        # unlike sliding, which gives one empty window, an empty input has none
+        self.assertEqual(itr([]).sliding(3).to_list(), [()])
+        self.assertEqual(itr([]).rolling_sum(3).to_list(), [])
+        self.assertEqual(itr([]).rolling_mean(3).to_list(), [])
+        self.assertEqual(itr([]).rolling_min(3).to_list(), [])
+        self.assertEqual(itr([]).rolling_max(3, step=2).to_list(), [])
+        self.assertRaises(ValueError, itr(data).rolling_max, 0)
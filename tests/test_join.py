@@ -0,0 +1,110 @@
+# -*- coding=utf-8 -*-
+
+import random
+import unittest
+from operator import itemgetter
+
+from iterage.itr import itr
+from iterage.join import hash_join, merge_join
+
+first = itemgetter(0)
+
+
+def nested_loop_join(left, right, how):
+    # reference implementation
+    result = []
+    matched = set()
+    for e in left:
+        partners = [(j, r) for j, r in enumerate(right) if e[0] == r[0]]
+        matched.update(j for j, _ in partners)
+        result.extend((e, r) for _, r in partners)
+        if not partners and how in ("left", "outer"):
+            result.append((e, None))
+    if how == "outer":
+        result.extend((None, r) for j, r in enumerate(right) if j not in matched)
+    return result
+
+
+class JoinTests(unittest.TestCase):
+    def setUp(self):
+        rnd = random.Random(3)
+        self.left = [(rnd.randrange(20), i) for i in range(60)]
+        self.right = [(rnd.randrange(25), -i) for i in range(40)]
+
+    def test_hash_join(self):
+        for how in ("inner", "left", "outer"):
+            expected = sorted(nested_loop_join(self.left, self.right, how), key=repr)
+            for build in ("left", "right", None):
+                result = hash_join(self.left, self.right, first, first, how, build=build)
+                self.assertEqual(sorted(result, key=repr), expected, (how, build))
+
+    def test_hash_join_order(self):
+        # pairs come in the order of the streamed side
+        result = list(hash_join(iter(self.left), self.right, first, first))
+        expected = nested_loop_join(self.left, self.right, "inner")
+        self.assertEqual([e for e, _ in result], [e for e, _ in expected])
+
+    def test_merge_join(self):
+        left, right = sorted(self.left), sorted(self.right)
+        for how in ("inner", "left", "outer"):
+            self.assertEqual(
+                sorted(merge_join(iter(left), iter(right), first, first, how), key=repr),
+                sorted(nested_loop_join(left, right, how), key=repr),
+                how,
+            )
+        self.assertEqual(list(merge_join([], [1, 2], how="outer")), [(None, 1), (None, 2)])
+        self.assertEqual(list(merge_join([1, 2], [], how="left")), [(1, None), (2, None)])
+
+    def test_merge_join_unsorted(self):
+        with self.assertRaises(ValueError):
+            list(merge_join([1, 3, 2], [1, 2, 3]))
+        with self.assertRaises(ValueError):
+            list(merge_join([1, 2, 3], [3, 1]))
+
+    def test_asof(self):
+        trades = [1, 2, 2, 6, 10]
+        quotes = [0, 2, 2.5, 5, 5, 7]
+        self.assertEqual(
+            list(merge_join(trades, quotes, asof=True)),
+            [(1, 0), (2, 2), (2, 2), (6, 5), (10, 7)],
+        )
+        self.assertEqual(
+            list(merge_join(trades, quotes, how="left", asof=True, tolerance=1)),
+            [(1, 0), (2, 2), (2, 2), (6, 5), (10, None)],
+        )
+        self.assertEqual(list(merge_join([1, 2], [5], asof=True)), [])
+        with self.assertRaises(ValueError):
+            merge_join([], [], how="outer", asof=True)
+        with self.assertRaises(ValueError):
+            list(merge_join([3], [2, 1], asof=True))
+
+    def test_itr_join(self):
+        for how in ("inner", "left", "outer"):
+            for strategy in ("hash", "merge"):
+                left, right = sorted(self.left), sorted(self.right)
+                self.assertEqual(
+                    sorted(itr(left).join(itr(right), first, how=how, strategy=strategy), key=repr),
+                    sorted(nested_loop_join(left, right, how), key=repr),
+                )
+        self.assertEqual(itr([1, 5]).join([4], strategy="merge", asof=True).to_list(), [(5, 4)])
+        self.assertRaises(ValueError, itr([]).join, [], how="cross")
+        self.assertRaises(ValueError, itr([]).join, [], strategy="nested")
+        self.assertRaises(ValueError, itr([]).join, [], asof=True)
+
+    def test_itr_join_builds_smaller_side(self):
+        built = []
+
+        def key(side):
+            def key(e):
+                built.append(side)
+                return e
+            return key
+
+        # the table side has all its keys computed before the first pair
+        it = iter(itr(range(3)).join(range(100), key("left"), key("right")))
+        self.assertEqual(next(it), (0, 0))
+        self.assertEqual(built.count("left"), 3)
+        built.clear()
+        it = iter(itr(range(100)).join([1, 2], key("left"), key("right")))
+        self.assertEqual(next(it), (1, 1))
+        self.assertEqual(built.count("right"), 2)
@@ -0,0 +1,80 @@
+# -*- coding=utf-8 -*-
+
+import array
+import unittest
+
+from iterage import _numpy
+from iterage.fn import _, isin, λ
+from iterage.itr import itr
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+@unittest.skipUnless(numpy, "needs numpy")
+class VectorizedTests(unittest.TestCase):
+    def assertVectorized(self, it, expected):
+        self.assertIsNotNone(_numpy.evaluate(it._src, it._stages))
+        self.assertEqual(it.to_list(), expected)
+
+    def test_pipeline(self):
+        arr = numpy.arange(20)
+        pipeline = itr(arr).map(λ(_ * 2 + 1)).where(λ(_ > 10)).drop(1)
+        self.assertVectorized(pipeline, list(range(13, 40, 2)))
+        self.assertEqual(
+            itr(arr).map(λ(_ * 2 + 1)).where(λ(_ > 10)).sum(), sum(range(11, 40, 2))
+        )
+        self.assertEqual(itr(arr).where_not(λ(_ % 3)).len(), 7)
+        self.assertEqual(itr(arr).map(numpy.negative).min(), -19)
+        self.assertEqual(itr(arr).map(λ(_ - 5)).where(None).count(0), 0)
+        self.assertTrue(itr(arr).where(λ(_ > 18)).all())
+        self.assertFalse(itr(arr).where(λ(_ > 19)).any())
+
+    def test_array(self):
+        src = array.array("d", [1.5, 2.5, 3.5])
+        self.assertIsInstance(itr(src).map(λ(_ * 2)).sum(), float)
+        self.assertEqual(itr(src).map(λ(_ * 2)).max(), 7.0)
+
+    def test_fallback(self):
+        arr = numpy.arange(5)
+        self.assertIsNone(_numpy.evaluate(arr, [itr(arr).map(str)._stages[0]]))
+        self.assertEqual(itr(arr).map(lambda x: x * 2).sum(), 20)
+        self.assertEqual(itr(arr).map(λ(_ * 2)).enumerate().len(), 5)
+        self.assertIsNone(_numpy.evaluate([1, 2], []))
+        with self.assertRaises(ValueError):
+            itr(arr).where(λ(_ > 10)).max()
+
+    def test_overflow(self):
+        src = array.array("b", [100, 100])
+        self.assertEqual(itr(src).map(λ(_ * 2)).sum(), 400)
+        self.assertEqual(itr(src).map(λ(_ * 2)).max(), 200)
+        self.assertEqual(itr(array.array("q", [2 ** 62, 2 ** 62])).sum(), 2 ** 63)
+        big = array.array("q", [2 ** 40, 3])
+        self.assertEqual(itr(big).map(λ(_ * _)).max(), 2 ** 80)
+
+    def test_sum_like_iterating(self):
+        src = array.array("d", [0.1] * 1000)
+        self.assertEqual(itr(src).sum(), sum(src))
+        self.assertEqual(itr(src).map(λ(_ * 3)).sum(), sum(x * 3 for x in src))
+        arr = numpy.full(300, 1, dtype=numpy.uint8)
+        with numpy.errstate(over="ignore"):
+            # wraps around like iterating, not widened by NumPy
+            expected = sum(arr)
+            result = itr(arr).sum()
+        self.assertEqual(result, expected)
+        self.assertEqual(result.dtype, expected.dtype)
+        self.assertEqual(itr(array.array("B", [200] * 3)).sum(), 600)
+
+    def test_zero_division(self):
+        src = array.array("i", [1, 2])
+        with self.assertRaises(ZeroDivisionError):
+            itr(src).map(λ(_ // 0)).sum()
+        with self.assertRaises(ZeroDivisionError):
+            itr(array.array("d", [1.0])).map(λ(_ / 0)).max()
+
+    def test_unhashable(self):
+        src = array.array("i", [1, 2, 1])
+        self.assertEqual(itr(src).where(λ(isin(_, {1}))).len(), 2)
+        self.assertEqual(itr(src).count("1"), 0)
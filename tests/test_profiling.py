@@ -0,0 +1,53 @@
+# -*- coding=utf-8 -*-
+
+import time
+import unittest
+
+from iterage.itr import itr
+
+
+class ProfileTests(unittest.TestCase):
+    def test_counts(self):
+        it = (
+            itr(range(100), instrument=True)
+            .map(lambda x: x * 2)
+            .where(lambda x: x % 3 == 0)
+            .take_while(lambda x: x < 150)
+            .where(None)
+            .take(10)
+        )
+        self.assertEqual(it.to_list(), list(range(6, 66, 6)))
+
+        stages = [(s.name.split("(")[0], s.elements_in, s.elements_out) for s in it.profile().stages]
+        self.assertEqual(stages, [("map", 31, 31), ("where", 31, 11), ("where", 11, 10), ("slice", 10, 10)])
+        report = it.profile().report()
+        self.assertAlmostEqual(report[1]["selectivity"], 11 / 31)
+        self.assertIn("where", str(it.profile()))
+
+    def test_repr(self):
+        it = itr(range(10), instrument=True).map(abs).where(None)
+        repr(it)
+        str(it)
+        self.assertEqual(list(it), list(range(1, 10)))
+        stages = [(s.name, s.elements_in, s.elements_out) for s in it.profile().stages]
+        self.assertEqual(stages, [("map(abs)", 10, 10), ("where", 10, 9)])
+
+    def test_times(self):
+        def slow(x):
+            time.sleep(0.01)
+            return x
+
+        it = itr(range(5), instrument=True).map(slow).sort(key=abs)
+        self.assertEqual(it.sum(), 10)
+        mapped, sort = it.profile().stages
+        self.assertGreaterEqual(mapped.wall_time, 0.05)
+        self.assertLess(mapped.cpu_time, mapped.wall_time)
+        self.assertEqual(sort.name, "sort(abs)")
+        self.assertGreater(mapped.throughput, 0)
+
+    def test_modes(self):
+        it = itr(range(10), instrument=True).batched(4).where(lambda x: x % 2)
+        self.assertEqual(it.len(), 5)
+        self.assertEqual(it.profile().stages[0].elements_out, 5)
+        self.assertEqual(itr(range(10), instrument=True).par_map(abs, workers=2).to_list(), list(range(10)))
+        self.assertRaises(ValueError, itr(range(3)).profile)
@@ -0,0 +1,81 @@
+# -*- coding=utf-8 -*-
+
+import unittest
+
+from iterage.itr import itr
+from iterage.reducers import (All, AllEqual, Any, Count, CountIf, First, Fold,
+                              Max, Mean, Min, Sum, aggregate, fan_out, sink)
+
+
+class ReducerTests(unittest.TestCase):
+    def test_single(self):
+        data = [3, 1, 4, 1, 5]
+        self.assertEqual(Count()(data), 5)
+        self.assertEqual(CountIf(lambda x: x > 2)(data), 3)
+        self.assertEqual(Sum()(data), 14)
+        self.assertEqual(Mean()(data), 2.8)
+        self.assertEqual(Min()(data), 1)
+        self.assertEqual(Max(key=lambda x: -x)(data), 1)
+        self.assertEqual(Max(default=None)([]), None)
+        self.assertTrue(Any()(data))
+        self.assertFalse(Any()([]))
+        self.assertTrue(All()(data))
+        self.assertFalse(All()([1, 0]))
+        self.assertFalse(AllEqual()(data))
+        self.assertTrue(AllEqual()([2, 2]))
+        self.assertTrue(AllEqual()([]))
+        self.assertEqual(First()(data), 3)
+        self.assertEqual(Fold(lambda a, x: a + [x], [])(data), data)
+
+        with self.assertRaises(ValueError):
+            Min()([])
+        with self.assertRaises(ValueError):
+            Mean()([])
+
+    def test_aggregate(self):
+        def source():
+            yield from range(10)
+
+        result = itr(source()).aggregate(
+            count=Count(),
+            total=Sum(),
+            lo=Min(),
+            hi=Max(),
+            even=Count().where(lambda x: x % 2 == 0),
+            squares=Sum().map(lambda x: x * x),
+        )
+        self.assertEqual(
+            result,
+            {"count": 10, "total": 45, "lo": 0, "hi": 9, "even": 5, "squares": 285},
+        )
+
+    def test_reuse(self):
+        total = Sum()
+        self.assertEqual(aggregate([1, 2], a=total, b=total), {"a": 3, "b": 3})
+        self.assertEqual(total([3]), 3)
+
+
+class FanOutTests(unittest.TestCase):
+    def test_sinks(self):
+        def source():
+            yield from range(10)
+
+        result = itr(source()).fan_out(
+            sink.where(lambda x: x > 5).to_list(),
+            sink.where_not(lambda x: x > 5).map(str).take(2).to_list(),
+            sink.map(lambda x: x % 3).to_set(),
+            sink.len(),
+            sink.take(3).sum(),
+            sink.max(key=lambda x: -x),
+            sink.reduce(lambda acc, x: acc * 10 + x, 0),
+            Count(),
+        )
+        self.assertEqual(
+            result,
+            ([6, 7, 8, 9], ["0", "1"], {0, 1, 2}, 10, 3, 0, 123456789, 10),
+        )
+
+    def test_single_pass(self):
+        it = iter(range(4))
+        self.assertEqual(fan_out(it, sink.to_list(), sink.sum()), ([0, 1, 2, 3], 6))
+        self.assertEqual(fan_out([]), ())